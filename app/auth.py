@@ -0,0 +1,252 @@
+"""API token registry: named keys with scopes and expiry, looked up by digest.
+
+Tokens are read from the JSON list in the file named by ``API_TOKENS_FILE`` and
+from the same format in ``API_TOKENS``; the legacy single ``APP_API_TOKEN`` is
+kept as a token named ``default`` with every scope, marked ``shared``. Only SHA-256 digests are
+stored, so a lookup is one hash and one dict probe, and probe timing can only
+reveal a digest, never a token prefix. The file is re-read when its mtime
+changes, checked at most every ``API_TOKENS_RELOAD_SECONDS``.
+
+Entry format::
+
+    {"name": "ci", "sha256": "<hex digest>" | "token": "<raw token>",
+     "scopes": ["items:write"], "expires_at": "2027-01-01T00:00:00Z" | null,
+     "shared": false}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from pydantic import (
+    AwareDatetime,
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidationError,
+    field_validator,
+    model_validator,
+)
+
+from app.metrics import api_token_requests
+
+API_TOKENS_FILE_ENV = "API_TOKENS_FILE"
+API_TOKENS_ENV = "API_TOKENS"
+LEGACY_TOKEN_ENV = "APP_API_TOKEN"
+RELOAD_SECONDS_ENV = "API_TOKENS_RELOAD_SECONDS"
+
+DEFAULT_RELOAD_SECONDS = 1.0
+LEGACY_TOKEN_NAME = "default"
+
+ALL_SCOPES = "*"
+SCOPE_ITEMS_WRITE = "items:write"
+SCOPE_UPLOADS_WRITE = "uploads:write"
+SCOPE_INTERNAL_READ = "internal:read"
+KNOWN_SCOPES = frozenset(
+    {ALL_SCOPES, SCOPE_ITEMS_WRITE, SCOPE_UPLOADS_WRITE, SCOPE_INTERNAL_READ}
+)
+
+
+def token_digest(token: str | bytes) -> bytes:
+    raw = token.encode("utf-8") if isinstance(token, str) else token
+    return hashlib.sha256(raw).digest()
+
+
+@dataclass(frozen=True, slots=True)
+class ApiToken:
+    name: str
+    scopes: frozenset[str]
+    expires_at: float | None = None
+    # Used by several clients at once; per-client limits also key on the IP.
+    shared: bool = False
+
+    def allows(self, scope: str) -> bool:
+        return ALL_SCOPES in self.scopes or scope in self.scopes
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class TokenEntry(BaseModel):
+    """One configured token; exactly one of ``token`` and ``sha256`` is given."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(..., min_length=1, max_length=64)
+    token: str | None = Field(default=None, min_length=16)
+    sha256: str | None = Field(default=None, pattern=r"^[0-9a-fA-F]{64}$")
+    scopes: list[str] = Field(..., min_length=1)
+    expires_at: AwareDatetime | None = None
+    shared: bool = False
+
+    @field_validator("scopes")
+    @classmethod
+    def ensure_known_scopes(cls, value: list[str]) -> list[str]:
+        unknown = set(value) - KNOWN_SCOPES
+        if unknown:
+            raise ValueError(f"unknown scopes: {', '.join(sorted(unknown))}")
+        return value
+
+    @model_validator(mode="after")
+    def ensure_one_secret(self) -> "TokenEntry":
+        if (self.token is None) == (self.sha256 is None):
+            raise ValueError("give exactly one of token or sha256")
+        return self
+
+    def digest(self) -> bytes:
+        if self.sha256 is not None:
+            return bytes.fromhex(self.sha256)
+        return token_digest(self.token or "")
+
+    def to_token(self) -> ApiToken:
+        expires_at = self.expires_at.timestamp() if self.expires_at else None
+        return ApiToken(self.name, frozenset(self.scopes), expires_at, self.shared)
+
+
+def parse_tokens(raw: str | bytes) -> dict[bytes, ApiToken]:
+    """Parse a JSON list of entries; raise ``ValueError`` on any invalid entry."""
+    try:
+        entries = [TokenEntry.model_validate(item) for item in json.loads(raw)]
+    except (TypeError, ValidationError) as exc:
+        raise ValueError(f"invalid API token list: {exc}") from exc
+    return _index(entries)
+
+
+def _index(entries: Iterable[TokenEntry]) -> dict[bytes, ApiToken]:
+    tokens: dict[bytes, ApiToken] = {}
+    names: set[str] = set()
+    for entry in entries:
+        if entry.name in names:
+            raise ValueError(f"duplicate API token name: {entry.name!r}")
+        names.add(entry.name)
+        tokens[entry.digest()] = entry.to_token()
+    return tokens
+
+
+def _merge(fixed: dict[bytes, ApiToken], loaded: dict[bytes, ApiToken]) -> dict:
+    names = {token.name for token in fixed.values()}
+    if loaded.keys() & fixed.keys() or any(t.name in names for t in loaded.values()):
+        raise ValueError("API token file repeats a token from the environment")
+    return {**fixed, **loaded}
+
+
+class TokenRegistry:
+    """Digest -> token map, merged from fixed tokens and an optional file.
+
+    A file that fails to parse on reload leaves the previous tokens in place
+    and is reported through ``last_error`` until a good version appears.
+    """
+
+    def __init__(
+        self,
+        tokens: dict[bytes, ApiToken] | None = None,
+        path: str | Path | None = None,
+        reload_seconds: float = DEFAULT_RELOAD_SECONDS,
+    ) -> None:
+        self._fixed = dict(tokens or {})
+        self._tokens = self._fixed
+        self.path = Path(path) if path is not None else None
+        self.reload_seconds = reload_seconds
+        self.last_error: str | None = None
+        self._stamp: tuple[int, int] | None = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._reload(strict=True)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def lookup(self, token: str | bytes) -> ApiToken | None:
+        """Return the live token for a raw value, or ``None``."""
+        self.maybe_reload()
+        found = self._tokens.get(token_digest(token))
+        if found is None or found.expired(time.time()):
+            return None
+        return found
+
+    def record_use(self, token: ApiToken) -> None:
+        api_token_requests.inc(token.name)
+
+    def usage(self, name: str) -> int:
+        return api_token_requests.value(name)
+
+    def describe(self) -> list[dict[str, Any]]:
+        """Token metadata and usage for operators; never includes secrets."""
+        return [
+            {
+                "name": token.name,
+                "scopes": sorted(token.scopes),
+                "expires_at": token.expires_at,
+                "shared": token.shared,
+                "requests": self.usage(token.name),
+            }
+            for token in sorted(self._tokens.values(), key=lambda item: item.name)
+        ]
+
+    def maybe_reload(self) -> None:
+        if self.path is None or time.monotonic() < self._next_check:
+            return
+        # One caller stats the file; the rest keep serving the current map.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self.reload_seconds
+            self._reload(strict=False)
+        finally:
+            self._lock.release()
+
+    def _reload(self, strict: bool) -> None:
+        assert self.path is not None
+        try:
+            stat = self.path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return
+            merged = _merge(self._fixed, parse_tokens(self.path.read_bytes()))
+        except (OSError, ValueError) as exc:
+            if strict:
+                raise
+            self.last_error = str(exc)
+            return
+        # Swapped in one assignment, so concurrent lookups see old or new map.
+        self._tokens = merged
+        self._stamp = stamp
+        self.last_error = None
+
+
+_token_registry: TokenRegistry | None = None
+_configured = False
+
+
+def _build_token_registry() -> TokenRegistry:
+    tokens = parse_tokens(os.getenv(API_TOKENS_ENV, "[]"))
+    legacy = os.getenv(LEGACY_TOKEN_ENV)
+    if legacy:
+        legacy_token = ApiToken(LEGACY_TOKEN_NAME, frozenset({ALL_SCOPES}), shared=True)
+        tokens.setdefault(token_digest(legacy), legacy_token)
+    reload_seconds = float(os.getenv(RELOAD_SECONDS_ENV, DEFAULT_RELOAD_SECONDS))
+    return TokenRegistry(tokens, os.getenv(API_TOKENS_FILE_ENV), reload_seconds)
+
+
+def get_token_registry() -> TokenRegistry:
+    global _token_registry, _configured
+    if not _configured:
+        _token_registry = _build_token_registry()
+        _configured = True
+    assert _token_registry is not None
+    return _token_registry
+
+
+def set_token_registry(registry: TokenRegistry | None) -> None:
+    """Install ``registry``; ``None`` rebuilds from the environment on next use."""
+    global _token_registry, _configured
+    _token_registry = registry
+    _configured = registry is not None
@@ -0,0 +1,192 @@
+"""Read-through cache for item payloads and listings.
+
+Entries are keyed by a generation counter that writes bump after commit, so a
+reader that raced with a write stores its result under a key nobody reads again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+CACHE_BACKEND_ENV = "CACHE_BACKEND"
+CACHE_URL_ENV = "CACHE_URL"
+CACHE_TTL_ENV = "CACHE_TTL_SECONDS"
+CACHE_MAX_ENTRIES_ENV = "CACHE_MAX_ENTRIES"
+
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_MAX_ENTRIES = 10_000
+# Counters must outlive every entry built from them, otherwise a reset counter
+# could resurrect an old entry.
+COUNTER_TTL_FACTOR = 10
+
+_ALL_STATUSES = "*"
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: int) -> None: ...
+
+    async def counter(self, key: str) -> int: ...
+
+    async def incr(self, key: str, ttl: int) -> int: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryCache:
+    """In-process LRU with per-entry TTL; counters live outside the LRU."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def counter(self, key: str) -> int:
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return 0
+            return entry[1]
+
+    async def incr(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._counters.get(key)
+            value = entry[1] + 1 if entry is not None and entry[0] > now else 1
+            self._counters[key] = (now + ttl, value)
+            if len(self._counters) > self.max_entries:
+                self._counters = {
+                    name: item for name, item in self._counters.items() if item[0] > now
+                }
+            return value
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisCache:
+    """Backend for any client exposing the ``redis.asyncio`` command subset used here."""
+
+    def __init__(self, client: Any, prefix: str = "secdev:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    async def counter(self, key: str) -> int:
+        raw = await self.client.get(self.prefix + key)
+        return 0 if raw is None else int(raw)
+
+    async def incr(self, key: str, ttl: int) -> int:
+        value = await self.client.incr(self.prefix + key)
+        await self.client.expire(self.prefix + key, ttl)
+        return int(value)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+class ItemCache:
+    """Item and per-status listing cache with precise invalidation."""
+
+    def __init__(self, backend: CacheBackend, ttl: int = DEFAULT_TTL_SECONDS) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.counter_ttl = ttl * COUNTER_TTL_FACTOR
+
+    async def item_key(self, item_id: int) -> str:
+        generation = await self.backend.counter(f"gen:item:{item_id}")
+        return f"item:{item_id}:{generation}"
+
+    async def listing_key(
+        self, status: str | None, after_id: int | None, limit: int
+    ) -> str:
+        scope = status or _ALL_STATUSES
+        generation = await self.backend.counter(f"gen:items:{scope}")
+        return f"items:{scope}:{generation}:{after_id or 0}:{limit}"
+
+    async def get(self, key: str) -> Any | None:
+        return await self.backend.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, item_ids: Any = (), statuses: Any = ()) -> None:
+        """Call after a successful commit with every id and status it touched."""
+        for item_id in set(item_ids):
+            await self.backend.incr(f"gen:item:{item_id}", self.counter_ttl)
+        for scope in {*statuses, _ALL_STATUSES}:
+            await self.backend.incr(f"gen:items:{scope}", self.counter_ttl)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+
+_item_cache: ItemCache | None = None
+_configured = False
+
+
+def _build_item_cache() -> ItemCache | None:
+    backend_name = os.getenv(CACHE_BACKEND_ENV, "none").lower()
+    ttl = int(os.getenv(CACHE_TTL_ENV, DEFAULT_TTL_SECONDS))
+    if backend_name in ("", "none", "off"):
+        return None
+    if backend_name == "memory":
+        max_entries = int(os.getenv(CACHE_MAX_ENTRIES_ENV, DEFAULT_MAX_ENTRIES))
+        return ItemCache(MemoryCache(max_entries), ttl)
+    if backend_name == "redis":
+        from redis.asyncio import Redis  # optional dependency
+
+        url = os.getenv(CACHE_URL_ENV, "redis://localhost:6379/0")
+        return ItemCache(RedisCache(Redis.from_url(url)), ttl)
+    raise ValueError(f"unknown cache backend: {backend_name!r}")
+
+
+def get_item_cache() -> ItemCache | None:
+    """Return the configured cache, or ``None`` when caching is disabled."""
+    global _item_cache, _configured
+    if not _configured:
+        _item_cache = _build_item_cache()
+        _configured = True
+    return _item_cache
+
+
+def set_item_cache(cache: ItemCache | None) -> None:
+    global _item_cache, _configured
+    _item_cache = cache
+    _configured = True
@@ -0,0 +1,81 @@
+"""In-process fan-out of item change events to change-stream subscribers.
+
+Every subscriber gets a bounded queue. One that falls ``buffer_size`` events
+behind is dropped rather than buffered without limit; its stream then catches
+up from the ``item_changes`` log, which stays the source of truth.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any
+
+from app.metrics import change_stream_dropped, change_stream_subscribers
+
+CHANGE_STREAM_BUFFER_ENV = "CHANGE_STREAM_BUFFER"
+DEFAULT_BUFFER_SIZE = 256
+
+
+class Subscription:
+    def __init__(self, buffer_size: int) -> None:
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(buffer_size)
+        self.overflowed = False
+
+    def offer(self, event: dict[str, Any]) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            return False
+        return True
+
+    async def get(self) -> dict[str, Any] | None:
+        """Next event, or ``None`` once dropped for overflow and drained."""
+        if self.overflowed and self._queue.empty():
+            return None
+        return await self._queue.get()
+
+
+class ChangeBroadcaster:
+    """Publish each event to every subscriber without ever blocking the writer."""
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.buffer_size = buffer_size
+        self._subscribers: set[Subscription] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        change_stream_subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            change_stream_subscribers.dec()
+
+    def publish(self, event: dict[str, Any]) -> None:
+        for subscription in tuple(self._subscribers):
+            if not subscription.offer(event):
+                self.unsubscribe(subscription)
+                change_stream_dropped.inc()
+
+
+_broadcaster: ChangeBroadcaster | None = None
+
+
+def get_change_broadcaster() -> ChangeBroadcaster:
+    global _broadcaster
+    if _broadcaster is None:
+        buffer_size = int(os.getenv(CHANGE_STREAM_BUFFER_ENV, DEFAULT_BUFFER_SIZE))
+        _broadcaster = ChangeBroadcaster(max(buffer_size, 1))
+    return _broadcaster
+
+
+def set_change_broadcaster(broadcaster: ChangeBroadcaster | None) -> None:
+    global _broadcaster
+    _broadcaster = broadcaster
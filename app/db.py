@@ -2,35 +2,235 @@
 
 from __future__ import annotations
 
+import itertools
 import os
-from typing import Any, Generator
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+from sqlalchemy.schema import CreateColumn
+from starlette.concurrency import run_in_threadpool
+
+from app.metrics import record_query
+from app.search import ensure_search_index
 
 DATABASE_URL_ENV = "DATABASE_URL"
+DATABASE_ASYNC_ENV = "DATABASE_ASYNC"
 DEFAULT_DATABASE_URL = "sqlite:///./app.db"
 
+POOL_SIZE_ENV = "DATABASE_POOL_SIZE"
+MAX_OVERFLOW_ENV = "DATABASE_MAX_OVERFLOW"
+POOL_TIMEOUT_ENV = "DATABASE_POOL_TIMEOUT"
+POOL_RECYCLE_ENV = "DATABASE_POOL_RECYCLE"
+POOL_PRE_PING_ENV = "DATABASE_POOL_PRE_PING"
+
+READ_URLS_ENV = "DATABASE_READ_URLS"
+READ_SELECTION_ENV = "DATABASE_READ_SELECTION"
+READ_STICKY_SECONDS_ENV = "DATABASE_READ_STICKY_SECONDS"
+READ_SELECTIONS = ("round_robin", "least_loaded")
+DEFAULT_READ_STICKY_SECONDS = 5.0
+# Clients remembered for read-your-writes; the oldest marks go first past this.
+MAX_STICKY_CLIENTS = 10_000
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Pragma profile for SQLite connections; each value can be overridden with
+# SQLITE_<PRAGMA> (e.g. SQLITE_SYNCHRONOUS=FULL) or disabled with an empty value.
+SQLITE_PRAGMA_DEFAULTS: dict[str, str] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "cache_size": "-20000",
+    "mmap_size": "134217728",
+}
+_SQLITE_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+}
+
+T = TypeVar("T")
 
 Base = declarative_base()
 
 _engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
-def _build_engine() -> Engine:
-    """Initialise SQLAlchemy engine based on runtime configuration."""
-    database_url = os.getenv(DATABASE_URL_ENV, DEFAULT_DATABASE_URL)
+def _database_url() -> str:
+    return os.getenv(DATABASE_URL_ENV, DEFAULT_DATABASE_URL)
+
+
+class _WaitTimingMixin:
+    """Record how long callers block waiting for a pooled connection.
+
+    Only checkouts that find the pool exhausted are timed; the rest return an
+    idle connection or open a new one, which is connect cost, not contention.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.checkout_count = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _exhausted(self) -> bool:
+        # A snapshot without the pool's lock: a checkout racing a return may be
+        # misfiled, which is fine for a capacity-planning figure.
+        max_overflow = self._max_overflow
+        return max_overflow > -1 and self.checkedout() >= self.size() + max_overflow
+
+    def _do_get(self) -> Any:
+        with self._wait_lock:
+            self.checkout_count += 1
+        if not self._exhausted():
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with self._wait_lock:
+                self.wait_count += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class TimedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _env_int(name: str) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _pool_options() -> dict[str, Any]:
+    """Read queue pool tuning from the environment; unset values keep defaults."""
+    options: dict[str, Any] = {}
+    for env, option in (
+        (POOL_SIZE_ENV, "pool_size"),
+        (MAX_OVERFLOW_ENV, "max_overflow"),
+        (POOL_TIMEOUT_ENV, "pool_timeout"),
+        (POOL_RECYCLE_ENV, "pool_recycle"),
+    ):
+        value = _env_int(env)
+        if value is not None:
+            options[option] = value
+    pre_ping = os.getenv(POOL_PRE_PING_ENV)
+    if pre_ping is not None:
+        options["pool_pre_ping"] = pre_ping.lower() in {"1", "true", "yes", "on"}
+    return options
+
+
+def _engine_options(database_url: str, is_async: bool = False) -> dict[str, Any]:
     engine_kwargs: dict[str, Any] = {}
     connect_args: dict[str, Any] = {}
 
     if database_url.startswith("sqlite"):
         connect_args["check_same_thread"] = False
-        if database_url == "sqlite:///:memory:":
-            engine_kwargs["poolclass"] = StaticPool
 
-    return create_engine(database_url, connect_args=connect_args, **engine_kwargs)
+    if database_url.startswith("sqlite") and database_url.endswith(":///:memory:"):
+        engine_kwargs["poolclass"] = StaticPool
+    else:
+        engine_kwargs["poolclass"] = TimedAsyncQueuePool if is_async else TimedQueuePool
+        engine_kwargs.update(_pool_options())
+
+    engine_kwargs["connect_args"] = connect_args
+    return engine_kwargs
+
+
+def sqlite_pragmas() -> dict[str, str]:
+    """Resolve the pragma profile; values are validated before reaching SQL."""
+    pragmas: dict[str, str] = {}
+    for name, default in SQLITE_PRAGMA_DEFAULTS.items():
+        value = os.getenv(f"SQLITE_{name.upper()}", default).strip().upper()
+        if not value:
+            continue
+        choices = _SQLITE_PRAGMA_CHOICES.get(name)
+        valid = value in choices if choices else value.lstrip("-").isdigit()
+        if not valid:
+            raise ValueError(f"invalid value for SQLite pragma {name}: {value!r}")
+        pragmas[name] = value
+    return pragmas
+
+
+def _install_sqlite_pragmas(engine: Engine) -> None:
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _install_query_metrics(engine: Engine) -> None:
+    """Feed statement count and duration into the current request's metrics."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn: Any, *_args: Any) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn: Any, *_args: Any) -> None:
+        record_query(time.perf_counter() - conn.info["query_started"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(context: Any) -> None:
+        if context.connection is not None and context.connection.info.get(
+            "query_started"
+        ):
+            context.connection.info["query_started"].pop()
+
+
+def _build_engine() -> Engine:
+    """Initialise SQLAlchemy engine based on runtime configuration."""
+    database_url = _database_url()
+    engine = create_engine(database_url, **_engine_options(database_url))
+    if engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine)
+    _install_query_metrics(engine)
+    return engine
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a configured URL onto its async driver (aiosqlite/asyncpg)."""
+    scheme, separator, rest = database_url.partition("://")
+    dialect, _, driver = scheme.partition("+")
+    if driver in ("aiosqlite", "asyncpg"):
+        return database_url
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"no async driver configured for {scheme!r} URLs")
+    return f"{ASYNC_DRIVERS[dialect]}{separator}{rest}"
+
+
+def is_async_mode() -> bool:
+    return os.getenv(DATABASE_ASYNC_ENV, "").lower() in {"1", "true", "yes", "on"}
 
 
 def get_engine() -> Engine:
@@ -49,18 +249,376 @@ SessionLocal = sessionmaker(
 )
 
 
-def get_session() -> Generator[Session, None, None]:
-    """FastAPI dependency that yields a database session."""
+def get_async_engine() -> AsyncEngine:
+    """Return the singleton async engine; in-memory SQLite is not shared with it."""
+    global _async_engine
+    if _async_engine is None:
+        database_url = async_database_url(_database_url())
+        _async_engine = create_async_engine(
+            database_url, **_engine_options(database_url, is_async=True)
+        )
+        if _async_engine.dialect.name == "sqlite":
+            _install_sqlite_pragmas(_async_engine.sync_engine)
+        _install_query_metrics(_async_engine.sync_engine)
+    return _async_engine
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Snapshot of pool occupancy and checkout wait times for capacity planning."""
+    status: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _WaitTimingMixin):
+        status.update(
+            checkouts=pool.checkout_count,
+            waits=pool.wait_count,
+            wait_seconds_total=round(pool.wait_seconds_total, 6),
+            wait_seconds_max=round(pool.wait_seconds_max, 6),
+        )
+    return status
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    stats = {"primary": pool_status(get_engine().pool)}
+    if _async_engine is not None:
+        stats["async"] = pool_status(_async_engine.sync_engine.pool)
+    router = get_read_router()
+    if router is not None:
+        stats["read_router"] = router.stats()
+        for replica in router.replicas:
+            for name, pool in replica.pools().items():
+                stats[name] = pool_status(pool)
+    return stats
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+class SessionRunner:
+    """Run sync ORM callables from async handlers without blocking the event loop.
+
+    With an ``AsyncSession`` the callable goes through ``run_sync`` on the async
+    driver; with a plain ``Session`` it is offloaded to the threadpool.
+    """
+
+    def __init__(
+        self, session: Session | AsyncSession, replica: str | None = None
+    ) -> None:
+        self.session = session
+        # Name of the read replica behind ``session``; ``None`` for the primary.
+        self.replica = replica
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args)
+        return await run_in_threadpool(fn, self.session, *args)
+
+
+@asynccontextmanager
+async def _primary_session_runner() -> AsyncIterator[SessionRunner]:
+    if is_async_mode():
+        async with get_async_sessionmaker()() as session:
+            yield SessionRunner(session)
+        return
+
     session: Session = SessionLocal()
     try:
-        yield session
+        yield SessionRunner(session)
+    finally:
+        await run_in_threadpool(session.close)
+
+
+def _execute(dbapi_connection: Any, statement: str) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def _set_read_only(dbapi_connection: Any, dialect_name: str) -> None:
+    if dialect_name == "sqlite":
+        _execute(dbapi_connection, "PRAGMA query_only=ON")
+    elif dialect_name == "postgresql":
+        # Outside autocommit the SET runs in the driver's implicit transaction,
+        # and the pool's rollback on return would undo it after one checkout.
+        autocommit = dbapi_connection.autocommit
+        dbapi_connection.autocommit = True
+        try:
+            _execute(
+                dbapi_connection, "SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY"
+            )
+        finally:
+            dbapi_connection.autocommit = autocommit
+
+
+def _install_read_only(engine: Engine) -> None:
+    """Reject writes on replica connections even if a handler attempts one."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, _record: Any) -> None:
+        _set_read_only(dbapi_connection, engine.dialect.name)
+
+
+class Replica:
+    """One read replica; its engines are built on first use.
+
+    ``name`` stands in for the URL wherever the replica is reported, so
+    credentials in ``DATABASE_READ_URLS`` never reach stats or logs.
+    """
+
+    def __init__(self, name: str, url: str) -> None:
+        self.name = name
+        self.url = url
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._sessionmaker: sessionmaker[Session] | None = None
+        self._async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+    def sessionmaker(self) -> sessionmaker[Session]:
+        with self._lock:
+            if self._sessionmaker is None:
+                engine = create_engine(self.url, **_engine_options(self.url))
+                if engine.dialect.name == "sqlite":
+                    _install_sqlite_pragmas(engine)
+                _install_read_only(engine)
+                _install_query_metrics(engine)
+                self._sessionmaker = sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False
+                )
+            return self._sessionmaker
+
+    def async_sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        with self._lock:
+            if self._async_sessionmaker is None:
+                url = async_database_url(self.url)
+                engine = create_async_engine(url, **_engine_options(url, is_async=True))
+                if engine.dialect.name == "sqlite":
+                    _install_sqlite_pragmas(engine.sync_engine)
+                _install_read_only(engine.sync_engine)
+                _install_query_metrics(engine.sync_engine)
+                self._async_sessionmaker = async_sessionmaker(
+                    bind=engine, autoflush=False, expire_on_commit=False
+                )
+            return self._async_sessionmaker
+
+    def pools(self) -> dict[str, Pool]:
+        pools = {}
+        if self._sessionmaker is not None:
+            pools[self.name] = self._sessionmaker.kw["bind"].pool
+        if self._async_sessionmaker is not None:
+            pools[f"{self.name}_async"] = self._async_sessionmaker.kw[
+                "bind"
+            ].sync_engine.pool
+        return pools
+
+
+class ReadRouter:
+    """Spread reads over replicas, keeping recent writers on the primary.
+
+    ``round_robin`` rotates through the replicas; ``least_loaded`` picks the one
+    with the fewest reads in flight in this process. A client marked with
+    ``mark_write`` reads from the primary for ``sticky_seconds`` afterwards, so
+    it sees its own writes despite replication lag. The marks are per process.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        selection: str = "round_robin",
+        sticky_seconds: float = DEFAULT_READ_STICKY_SECONDS,
+        max_sticky_clients: int = MAX_STICKY_CLIENTS,
+    ) -> None:
+        if not replicas:
+            raise ValueError("a read router needs at least one replica")
+        if selection not in READ_SELECTIONS:
+            raise ValueError(f"unknown read selection: {selection!r}")
+        self.replicas = replicas
+        self.selection = selection
+        self.sticky_seconds = sticky_seconds
+        self.max_sticky_clients = max_sticky_clients
+        self._turn = itertools.count()
+        self._sticky: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def pick(self) -> Replica:
+        with self._lock:
+            turn = next(self._turn)
+            if self.selection == "round_robin":
+                return self.replicas[turn % len(self.replicas)]
+            # Start the scan at a rotating offset so ties do not all land on one replica.
+            count = len(self.replicas)
+            rotated = (self.replicas[(turn + i) % count] for i in range(count))
+            return min(rotated, key=lambda replica: replica.in_flight)
+
+    @contextmanager
+    def using(self, replica: Replica) -> Iterator[Replica]:
+        with self._lock:
+            replica.in_flight += 1
+        try:
+            yield replica
+        finally:
+            with self._lock:
+                replica.in_flight -= 1
+
+    def mark_write(self, *client_keys: str) -> None:
+        deadline = time.monotonic() + self.sticky_seconds
+        with self._lock:
+            for key in client_keys:
+                # Re-inserting keeps the dict ordered from oldest to newest mark.
+                self._sticky.pop(key, None)
+                self._sticky[key] = deadline
+            while len(self._sticky) > self.max_sticky_clients:
+                del self._sticky[next(iter(self._sticky))]
+
+    def is_sticky(self, client_key: str) -> bool:
+        with self._lock:
+            deadline = self._sticky.get(client_key)
+            if deadline is None:
+                return False
+            if deadline <= time.monotonic():
+                del self._sticky[client_key]
+                return False
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "selection": self.selection,
+                "sticky_seconds": self.sticky_seconds,
+                "sticky_clients": len(self._sticky),
+                "in_flight": {
+                    replica.name: replica.in_flight for replica in self.replicas
+                },
+            }
+
+
+_read_router: ReadRouter | None = None
+_read_router_configured = False
+
+
+def _build_read_router() -> ReadRouter | None:
+    urls = [
+        url.strip() for url in os.getenv(READ_URLS_ENV, "").split(",") if url.strip()
+    ]
+    if not urls:
+        return None
+    replicas = [Replica(f"replica{index}", url) for index, url in enumerate(urls)]
+    sticky = os.getenv(READ_STICKY_SECONDS_ENV)
+    return ReadRouter(
+        replicas,
+        selection=os.getenv(READ_SELECTION_ENV, "round_robin").strip().lower(),
+        sticky_seconds=float(sticky) if sticky else DEFAULT_READ_STICKY_SECONDS,
+    )
+
+
+def get_read_router() -> ReadRouter | None:
+    """Return the replica router, or ``None`` when ``DATABASE_READ_URLS`` is unset."""
+    global _read_router, _read_router_configured
+    if not _read_router_configured:
+        _read_router = _build_read_router()
+        _read_router_configured = True
+    return _read_router
+
+
+def set_read_router(router: ReadRouter | None) -> None:
+    global _read_router, _read_router_configured
+    _read_router = router
+    _read_router_configured = True
+
+
+@asynccontextmanager
+async def read_session_runner(
+    client_key: str | None = None,
+) -> AsyncIterator[SessionRunner]:
+    """Runner on a replica, or on the primary without replicas or after a write."""
+    router = get_read_router()
+    if router is None or (client_key is not None and router.is_sticky(client_key)):
+        async with _primary_session_runner() as runner:
+            yield runner
+        return
+
+    replica = router.pick()
+    with router.using(replica):
+        if is_async_mode():
+            async with replica.async_sessionmaker()() as session:
+                yield SessionRunner(session, replica=replica.name)
+            return
+
+        session: Session = replica.sessionmaker()()
+        try:
+            yield SessionRunner(session, replica=replica.name)
+        finally:
+            await run_in_threadpool(session.close)
+
+
+@asynccontextmanager
+async def write_session_runner(
+    client_keys: tuple[str, ...] = ()
+) -> AsyncIterator[SessionRunner]:
+    """Primary runner that keeps ``client_keys`` reading from the primary afterwards.
+
+    The clients are marked before the write as well, so a read sent as soon as
+    the response arrives is covered even if the mark after it lands later.
+    """
+    router = get_read_router()
+    if router is not None:
+        router.mark_write(*client_keys)
+    try:
+        async with _primary_session_runner() as runner:
+            yield runner
     finally:
-        session.close()
+        if router is not None:
+            router.mark_write(*client_keys)
+
+
+def _ensure_indexes(engine: Engine) -> None:
+    """Create indexes declared after a table already existed on disk."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def _ensure_columns(engine: Engine) -> None:
+    """Add columns declared after a table already existed on disk.
+
+    New columns must be nullable or carry a ``server_default``.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ADD COLUMN {ddl}"
+                    )
 
 
 def init_db() -> None:
-    """Create database tables if they do not exist."""
-    Base.metadata.create_all(get_engine())
+    """Create missing tables and apply column and index upgrades."""
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    _ensure_columns(engine)
+    _ensure_indexes(engine)
+    ensure_search_index(engine)
 
 
 def reset_database() -> None:
@@ -2,25 +2,66 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
-from uuid import uuid4
+import itertools
+import os
+from typing import Any, Dict, Iterable
 
 from fastapi import HTTPException, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
+from app.metrics import problem_responses
 
 PROBLEM_BASE_URI = "https://problems.secdev.local/"
+PROBLEM_MEDIA_TYPE = "application/problem+json"
+# Codes whose bodies never vary except for the correlation id; see _static_problem.
+STATIC_PROBLEM_CODES = frozenset({"not_found", "not_authorized"})
 
 
 class ApiError(Exception):
     def __init__(
-        self, code: str, detail: str, status: int = 400, title: str | None = None
+        self,
+        code: str,
+        detail: str,
+        status: int = 400,
+        title: str | None = None,
+        headers: Dict[str, str] | None = None,
     ):
         self.code = code
         self.detail = detail
         self.status = status
         self.title = title or code.replace("_", " ").title()
+        self.headers = headers
+
+
+_correlation_prefix = ""
+_correlation_counter = itertools.count()
+
+
+def _reseed_correlation_ids() -> None:
+    """Pick a random per-process UUID prefix; forked workers must not share one."""
+    global _correlation_prefix, _correlation_counter
+    high = int.from_bytes(os.urandom(8), "big")
+    # Set the version nibble to 4 so the ids still read as random UUIDs.
+    high = (high & ~(0xF << 12)) | (0x4 << 12)
+    hex_high = f"{high:016x}"
+    _correlation_prefix = f"{hex_high[:8]}-{hex_high[8:12]}-{hex_high[12:]}-"
+    _correlation_counter = itertools.count()
+
+
+_reseed_correlation_ids()
+os.register_at_fork(after_in_child=_reseed_correlation_ids)
+
+
+def new_correlation_id() -> str:
+    """Return a UUID-formatted id: random process prefix plus a 62-bit counter.
+
+    Unique per process without a ``urandom`` call per error; ids are for log
+    correlation only and are not meant to be unguessable.
+    """
+    n = next(_correlation_counter)
+    return f"{_correlation_prefix}{0x8000 | (n >> 48) & 0x3FFF:04x}-{n & 0xFFFFFFFFFFFF:012x}"
 
 
 def _scrub_sensitive_data(payload: Any) -> Any:
@@ -36,6 +77,40 @@ def _scrub_sensitive_data(payload: Any) -> Any:
     return payload
 
 
+def _scrub_validation_errors(errors: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Encode pydantic errors for clients in one pass, dropping raw ``input``.
+
+    Only ``ctx`` can hold arbitrary objects, so it alone goes through
+    ``jsonable_encoder``; the other members are already JSON-ready.
+    """
+    scrubbed = []
+    for error in errors:
+        encoded = {}
+        for key, value in error.items():
+            if key == "input":
+                continue
+            if key == "loc":
+                value = list(value)
+            elif not isinstance(value, (str, int)):
+                value = _scrub_sensitive_data(jsonable_encoder(value))
+            encoded[key] = value
+        scrubbed.append(encoded)
+    return scrubbed
+
+
+def problem_details(
+    status: int, title: str, detail: str, type_: str = "about:blank"
+) -> dict[str, Any]:
+    """Build the RFC 7807 body members shared by responses and batch results."""
+    return {"type": type_, "title": title, "status": status, "detail": detail}
+
+
+def api_error_details(exc: ApiError) -> dict[str, Any]:
+    return problem_details(
+        exc.status, exc.title, exc.detail, f"{PROBLEM_BASE_URI}{exc.code}"
+    )
+
+
 def problem(
     status: int,
     title: str,
@@ -44,33 +119,60 @@ def problem(
     extras: Dict[str, Any] | None = None,
 ) -> JSONResponse:
     """Emit RFC 7807 response with correlation id header/body."""
-    correlation_id = str(uuid4())
-    payload: dict[str, Any] = {
-        "type": type_,
-        "title": title,
-        "status": status,
-        "detail": detail,
-        "correlation_id": correlation_id,
-    }
+    correlation_id = new_correlation_id()
+    payload = problem_details(status, title, detail, type_)
+    payload["correlation_id"] = correlation_id
     if extras:
         payload.update(extras)
 
     response = JSONResponse(
         payload,
         status_code=status,
-        media_type="application/problem+json",
+        media_type=PROBLEM_MEDIA_TYPE,
     )
     response.headers.setdefault("X-Correlation-ID", correlation_id)
     return response
 
 
-async def api_error_handler(request: Request, exc: ApiError):
-    response = problem(
-        status=exc.status,
-        title=exc.title,
-        detail=exc.detail,
-        type_=f"{PROBLEM_BASE_URI}{exc.code}",
+_static_bodies: dict[tuple[str, int, str, str], tuple[bytes, bytes]] = {}
+
+
+def _static_problem(exc: ApiError) -> Response:
+    """Serve a fixed-code error from pre-encoded JSON around the correlation id.
+
+    The body is byte-for-byte what ``problem`` renders, without building and
+    serialising a dict per rejection.
+    """
+    key = (exc.code, exc.status, exc.title, exc.detail)
+    parts = _static_bodies.get(key)
+    if parts is None:
+        payload = api_error_details(exc)
+        payload["correlation_id"] = "\0"
+        rendered = JSONResponse(payload).render(payload)
+        head, _, tail = rendered.partition(b"\\u0000")
+        parts = _static_bodies[key] = (head, tail)
+    correlation_id = new_correlation_id()
+    return Response(
+        parts[0] + correlation_id.encode() + parts[1],
+        status_code=exc.status,
+        media_type=PROBLEM_MEDIA_TYPE,
+        headers={"X-Correlation-ID": correlation_id},
     )
+
+
+async def api_error_handler(request: Request, exc: ApiError):
+    problem_responses.inc(exc.code)
+    if exc.code in STATIC_PROBLEM_CODES:
+        response = _static_problem(exc)
+    else:
+        response = problem(
+            status=exc.status,
+            title=exc.title,
+            detail=exc.detail,
+            type_=f"{PROBLEM_BASE_URI}{exc.code}",
+        )
+    if exc.headers:
+        response.headers.update(exc.headers)
     request.state.correlation_id = response.headers["X-Correlation-ID"]
     return response
 
@@ -78,6 +180,7 @@ async def api_error_handler(request: Request, exc: ApiError):
 async def http_exception_handler(request: Request, exc: HTTPException):
     detail = exc.detail if isinstance(exc.detail, str) else "HTTP error"
     code = "http_error"
+    problem_responses.inc(code)
     title = exc.headers.get("X-Error-Title") if exc.headers else None
     response = problem(
         status=exc.status_code,
@@ -92,7 +195,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     errors = exc.errors()
     message = errors[0]["msg"] if errors else "Invalid payload"
-    encoded_errors = _scrub_sensitive_data(jsonable_encoder(errors)) if errors else None
+    encoded_errors = _scrub_validation_errors(errors) if errors else None
+    problem_responses.inc("validation_error")
     response = problem(
         status=422,
         title="Validation Error",
@@ -0,0 +1,44 @@
+"""Strong ETags for item payloads and listing pages."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Iterable
+
+_FIELD_SEPARATOR = "\x1f"
+
+
+def _digest(parts: Iterable[str]) -> str:
+    hasher = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\x1e")
+    return f'"{hasher.hexdigest()}"'
+
+
+def item_etag(item: dict[str, Any], version: int) -> str:
+    """Hash the version together with the fields, so a reused id never collides."""
+    fields = (item["id"], version, item["name"], item["description"], item["status"])
+    return _digest([_FIELD_SEPARATOR.join(str(field) for field in fields)])
+
+
+def listing_etag(item_etags: Iterable[str], next_cursor: str | None) -> str:
+    return _digest([*item_etags, next_cursor or ""])
+
+
+def etag_matches(header: str | None, etag: str, weak: bool = False) -> bool:
+    """Evaluate an If-Match/If-None-Match header against the current ETag.
+
+    If-None-Match uses weak comparison (``W/`` prefixes ignored), If-Match strong.
+    """
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -1,20 +1,83 @@
+import asyncio
 import os
-import secrets
+import time
+from collections import Counter
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterable, TypeVar
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Response
+import orjson
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy import select
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from sqlalchemy import Select, delete, func, insert, select, text, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from starlette.concurrency import run_in_threadpool
 
-from app.db import get_session, init_db, reset_database
+from app.auth import (
+    SCOPE_INTERNAL_READ,
+    SCOPE_ITEMS_WRITE,
+    SCOPE_UPLOADS_WRITE,
+    ApiToken,
+    get_token_registry,
+)
+from app.cache import get_item_cache
+from app.changes import get_change_broadcaster
+from app.db import (
+    SessionLocal,
+    SessionRunner,
+    get_read_router,
+    init_db,
+    pool_stats,
+    read_session_runner,
+    reset_database,
+    write_session_runner,
+)
 from app.errors import (
     ApiError,
+    api_error_details,
     api_error_handler,
     http_exception_handler,
     validation_exception_handler,
 )
+from app.etags import etag_matches, item_etag, listing_etag
+from app.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    REGISTRY,
+    HistogramVec,
+    MetricsMiddleware,
+)
 from app.models import Item as ItemModel
-from app.schemas import ALLOWED_STATUSES, Item, ItemCreate, ItemUpdate
+from app.models import ItemChange as ItemChangeModel
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_CURSOR_VALUE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from app.ratelimit import RateLimitMiddleware, client_ip_key
+from app.schemas import (
+    ALLOWED_STATUSES,
+    Item,
+    ItemBatchCreateRequest,
+    ItemBatchDeleteRequest,
+    ItemBatchResponse,
+    ItemBatchResult,
+    ItemBatchUpdateRequest,
+    ItemCreate,
+    ItemUpdate,
+)
+from app.search import max_candidates, search_query, search_statements
+from app.security_headers import SecurityHeadersMiddleware
+from app.stats import apply_status_deltas, read_status_counts, status_deltas
+from app.upload import MAX_BYTES, ContentStore, UploadStore
+from app.workers import BoundedExecutor, PoolSaturated
+from app.writequeue import get_write_queue
+
+T = TypeVar("T")
 
 app = FastAPI(title="SecDev Course App", version="0.1.0")
 
@@ -23,7 +86,43 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
 API_TOKEN_HEADER_ALIAS = "X-API-Key"
-API_TOKEN_ENV = "APP_API_TOKEN"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson"}
+EXPORT_CHUNK_SIZE = 1000
+SEARCH_MAX_QUERY_LENGTH = 200
+CHANGE_REPLAY_BATCH = 500
+# Quiet streams re-check the log this often, which also picks up other workers.
+CHANGE_STREAM_HEARTBEAT_SECONDS = 15.0
+# Item reads carry ETags, so clients may keep a copy as long as they revalidate.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+UPLOAD_DIR_ENV = "UPLOAD_DIR"
+DEFAULT_UPLOAD_DIR = "./uploads"
+# "uuid" keeps every upload as its own file, "cas" deduplicates by content hash.
+UPLOAD_STORAGE_ENV = "UPLOAD_STORAGE"
+UPLOAD_STORAGE_MODES = ("uuid", "cas")
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "4"))
+UPLOAD_QUEUE = int(os.getenv("UPLOAD_QUEUE", "16"))
+UPLOAD_RETRY_AFTER_SECONDS = "1"
+_UPLOAD_ERRORS = {
+    "too_big": ("payload_too_large", "image exceeds the 5 MB limit", 413),
+    "bad_type": (
+        "unsupported_media_type",
+        "only PNG and JPEG images are accepted",
+        415,
+    ),
+    "missing_base": ("upload_not_configured", "upload storage is not configured", 500),
+}
+_UPLOAD_FAILED = ("upload_failed", "upload could not be stored", 500)
+
+upload_executor = BoundedExecutor(UPLOAD_WORKERS, UPLOAD_QUEUE, name="upload")
+upload_save_seconds = REGISTRY.register(
+    HistogramVec(
+        "upload_save_duration_seconds", "Time to validate and store an upload."
+    )
+).labels()
+# Upload roots are resolved once and pinned by a directory fd, see UploadStore.
+_upload_stores: dict[tuple[str, str], UploadStore | ContentStore] = {}
 
 SECURITY_HEADERS = {
     "Strict-Transport-Security": "max-age=63072000; includeSubDomains; preload",
@@ -33,37 +132,102 @@ SECURITY_HEADERS = {
     "Referrer-Policy": "no-referrer",
     "Cache-Control": "no-store",
 }
+# Per-route replacements for SECURITY_HEADERS, keyed by (method, route template).
+ROUTE_SECURITY_HEADERS = {
+    ("GET", "/items"): {"Cache-Control": REVALIDATE_CACHE_CONTROL},
+    ("GET", "/items/{item_id}"): {"Cache-Control": REVALIDATE_CACHE_CONTROL},
+}
 
 
-def _get_expected_api_token() -> str:
-    token = os.getenv(API_TOKEN_ENV)
-    if token is None:
-        raise ApiError(
-            code="auth_not_configured",
-            detail="API token not configured",
-            status=500,
-        )
-    return token
+def require_scope(scope: str) -> Callable[..., Awaitable[ApiToken]]:
+    """Dependency factory: a live ``X-API-Key`` token that grants ``scope``."""
 
+    async def dependency(
+        x_api_key: str | None = Header(default=None, alias=API_TOKEN_HEADER_ALIAS),
+    ) -> ApiToken:
+        registry = get_token_registry()
+        token = registry.lookup(x_api_key) if x_api_key is not None else None
+        if token is None:
+            if not len(registry):
+                raise ApiError(
+                    code="auth_not_configured",
+                    detail="API token not configured",
+                    status=500,
+                )
+            raise ApiError(
+                code="not_authorized",
+                detail="missing or invalid API token",
+                status=401,
+            )
+        if not token.allows(scope):
+            raise ApiError(
+                code="forbidden",
+                detail=f"API token lacks the {scope} scope",
+                status=403,
+            )
+        registry.record_use(token)
+        return token
 
-def require_api_token(
-    x_api_key: str | None = Header(default=None, alias=API_TOKEN_HEADER_ALIAS),
-) -> None:
-    expected = _get_expected_api_token()
-    if x_api_key is None or not secrets.compare_digest(x_api_key, expected):
-        raise ApiError(
-            code="not_authorized",
-            detail="missing or invalid API token",
-            status=401,
+    return dependency
+
+
+require_items_write = require_scope(SCOPE_ITEMS_WRITE)
+require_uploads_write = require_scope(SCOPE_UPLOADS_WRITE)
+require_internal_read = require_scope(SCOPE_INTERNAL_READ)
+
+
+def _rate_limit_key(scope: dict) -> str:
+    """Bucket by API token name when a live token is sent, otherwise by client IP.
+
+    Invalid tokens fall back to the IP, so rotating garbage keys cannot mint
+    fresh buckets. A ``shared`` token (such as the legacy ``APP_API_TOKEN``) is
+    keyed by token and IP, so its clients do not exhaust one common bucket.
+    """
+    header = API_TOKEN_HEADER_ALIAS.lower().encode("latin-1")
+    for name, value in scope["headers"]:
+        if name == header:
+            token = get_token_registry().lookup(value)
+            if token is not None and token.shared:
+                return f"token:{token.name}@{client_ip_key(scope)}"
+            if token is not None:
+                return "token:" + token.name
+            break
+    return client_ip_key(scope)
+
+
+async def get_read_runner(request: Request) -> AsyncIterator[SessionRunner]:
+    """Session for read routes: a replica, unless this client wrote recently."""
+    client_key = _rate_limit_key(request.scope) if get_read_router() else None
+    async with read_session_runner(client_key) as runner:
+        yield runner
+
+
+async def get_write_runner(request: Request) -> AsyncIterator[SessionRunner]:
+    """Primary session that pins the client's next reads to the primary.
+
+    Both the token and the client IP are marked, so a follow-up read sent
+    without ``X-API-Key`` sees the write too.
+    """
+    client_keys: tuple[str, ...] = ()
+    if get_read_router() is not None:
+        client_keys = tuple(
+            {_rate_limit_key(request.scope), client_ip_key(request.scope)}
         )
+    async with write_session_runner(client_keys) as runner:
+        yield runner
+
+
+# Registered before the security headers middleware so 429s get those headers too.
+app.add_middleware(RateLimitMiddleware, identify=_rate_limit_key)
+app.add_middleware(
+    SecurityHeadersMiddleware,
+    headers=SECURITY_HEADERS,
+    route_overrides=ROUTE_SECURITY_HEADERS,
+)
 
 
-@app.middleware("http")
-async def enforce_security_headers(request, call_next):
-    response = await call_next(request)
-    for header, value in SECURITY_HEADERS.items():
-        response.headers.setdefault(header, value)
-    return response
+# Added last, so it wraps every other middleware and sees the final status.
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/health")
@@ -71,14 +235,59 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/internal/pool")
+def database_pool_stats(_auth: ApiToken = Depends(require_internal_read)):
+    return pool_stats()
+
+
+@app.get("/internal/tokens")
+def api_token_stats(_auth: ApiToken = Depends(require_internal_read)):
+    registry = get_token_registry()
+    return {"tokens": registry.describe(), "reload_error": registry.last_error}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics(_auth: ApiToken = Depends(require_internal_read)):
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.on_event("startup")
 def on_startup() -> None:
+    # Fail the deploy on a bad UPLOAD_STORAGE instead of every upload with a 500.
+    _upload_storage()
     init_db()
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    queue = get_write_queue()
+    if queue is not None:
+        await queue.close()
+
+
 def _reset_db() -> None:
     """Test helper: restore database to a clean state."""
     reset_database()
+    cache = get_item_cache()
+    if cache is not None:
+        asyncio.run(cache.clear())
+
+
+async def _invalidate_cache(
+    item_ids: Iterable[int] = (), statuses: Iterable[str] = ()
+) -> None:
+    cache = get_item_cache()
+    if cache is not None:
+        await cache.invalidate(item_ids, statuses)
+
+
+def _ensure_status_filter(status: str | None) -> None:
+    if status is not None and status not in ALLOWED_STATUSES:
+        raise ApiError(
+            code="validation_error",
+            detail=f"status must be one of: {', '.join(sorted(ALLOWED_STATUSES))}",
+            status=422,
+        )
 
 
 def _serialize_item(record: ItemModel) -> dict[str, object]:
@@ -90,61 +299,462 @@ def _serialize_item(record: ItemModel) -> dict[str, object]:
     }
 
 
+def _item_entry(item: dict[str, object], version: int) -> dict[str, object]:
+    """Public payload plus its ETag; the shape stored in the item cache."""
+    return {"item": item, "etag": item_etag(item, version)}
+
+
+def _item_response(entry: dict[str, object], status_code: int = 200) -> Response:
+    # Payloads are built from validated rows, so they skip response_model
+    # re-validation; the decorators keep response_model for the OpenAPI schema.
+    return ORJSONResponse(
+        entry["item"], status_code=status_code, headers={"ETag": entry["etag"]}
+    )
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag},
+    )
+
+
+def _precondition_failed() -> ApiError:
+    return ApiError(
+        code="precondition_failed",
+        detail="item has been modified; fetch it again before writing",
+        status=412,
+    )
+
+
+def _check_if_match(if_match: str | None, record: ItemModel) -> None:
+    if if_match is not None and not etag_matches(
+        if_match, item_etag(_serialize_item(record), record.version)
+    ):
+        raise _precondition_failed()
+
+
+def _flush_or_conflict(session: Session) -> None:
+    """Flush, turning a lost version check (concurrent writer) into a 412.
+
+    The session is left for its owner to roll back: under group commit it holds
+    other callers' writes too, which must be retried rather than dropped.
+    """
+    try:
+        session.flush()
+    except StaleDataError as exc:
+        raise _precondition_failed() from exc
+
+
+_ITEM_FIELDS = ("id", "name", "description", "status")
+_ITEM_COLUMNS = tuple(getattr(ItemModel, field) for field in _ITEM_FIELDS)
+_CHANGE_FIELDS = ("seq", "item_id", "action", "version")
+_CHANGE_COLUMNS = tuple(getattr(ItemChangeModel, field) for field in _CHANGE_FIELDS)
+Changes = list[dict[str, object]]
+
+
+def _change(item_id: object, action: str, version: object) -> dict[str, object]:
+    return {"item_id": item_id, "action": action, "version": version}
+
+
+def _lock_change_log(session: Session) -> None:
+    """Serialize change-log writers on PostgreSQL; call before any ``items`` write.
+
+    Readers page by ``seq > since``, so seqs must become visible in order. SQLite
+    has one writer at a time; on PostgreSQL a sequence value is taken at INSERT
+    but visible only at COMMIT, so a transaction holding a lower seq could
+    commit after a reader moved past it. The table lock makes writers take and
+    commit their seqs one transaction after another (plain reads are not
+    blocked). Taking it before any row lock gives every write transaction the
+    same lock order, so queued batches and direct writers cannot deadlock.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("LOCK TABLE item_changes IN EXCLUSIVE MODE"))
+
+
+def _record_changes(session: Session, changes: Changes) -> Changes:
+    """Append to the change log in the caller's transaction; return rows with seq."""
+    if not changes:
+        return []
+    stmt = insert(ItemChangeModel).returning(
+        *_CHANGE_COLUMNS, sort_by_parameter_order=True
+    )
+    return [row._asdict() for row in session.execute(stmt, changes)]
+
+
+def _committed(session: Session, fn: Callable[..., T], *args: object) -> T:
+    result = fn(session, *args)
+    session.commit()
+    return result
+
+
+async def _run_write(db: SessionRunner, fn: Callable[..., T], *args: object) -> T:
+    """Commit ``fn(session, *args)`` on ``db``, or group-commit it via the write queue."""
+    queue = get_write_queue()
+    if queue is not None:
+        return await queue.submit(fn, *args)
+    return await db.run(_committed, fn, *args)
+
+
+def _publish_changes(changes: Changes) -> None:
+    """Fan committed changes out to open change streams."""
+    broadcaster = get_change_broadcaster()
+    for change in changes:
+        broadcaster.publish(change)
+
+
+def _list_items_stmt(status: str | None, after_id: int | None, limit: int) -> Select:
+    stmt = select(*_ITEM_COLUMNS, ItemModel.version).order_by(ItemModel.id).limit(limit)
+    if status is not None:
+        stmt = stmt.where(ItemModel.status == status)
+    if after_id is not None:
+        stmt = stmt.where(ItemModel.id > after_id)
+    return stmt
+
+
+def _fetch_items_page(
+    session: Session, status: str | None, after_id: int | None, limit: int
+) -> list[dict[str, object]]:
+    """Fetch column tuples and zip them into cache entries without ORM objects."""
+    rows = session.execute(_list_items_stmt(status, after_id, limit))
+    return [_item_entry(dict(zip(_ITEM_FIELDS, row[:-1])), row[-1]) for row in rows]
+
+
 @app.get("/items", response_model=list[Item])
-def list_items(
+async def list_items(
     status: str | None = None,
-    session: Session = Depends(get_session),
+    after_id: int | None = Query(default=None, ge=0, le=MAX_CURSOR_VALUE),
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    db: SessionRunner = Depends(get_read_runner),
 ):
-    if status is not None and status not in ALLOWED_STATUSES:
+    _ensure_status_filter(status)
+    if cursor is not None:
+        if after_id is not None:
+            raise ApiError(
+                code="validation_error",
+                detail="use either cursor or after_id, not both",
+                status=422,
+            )
+        after_id = decode_cursor(cursor)
+
+    cache = get_item_cache()
+    cache_key = page = None
+    if cache is not None:
+        cache_key = await cache.listing_key(status, after_id, limit)
+        page = await cache.get(cache_key)
+
+    if page is None:
+        entries = await db.run(_fetch_items_page, status, after_id, limit + 1)
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(entries[-1]["item"]["id"])
+        page = {
+            "items": [entry["item"] for entry in entries],
+            "next_cursor": next_cursor,
+            "etag": listing_etag((entry["etag"] for entry in entries), next_cursor),
+        }
+        if cache_key is not None and db.replica is None:
+            await cache.set(cache_key, page)
+
+    if etag_matches(if_none_match, page["etag"], weak=True):
+        return _not_modified(page["etag"])
+    headers = {"ETag": page["etag"]}
+    if page["next_cursor"] is not None:
+        headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return ORJSONResponse(page["items"], headers=headers)
+
+
+def _export_chunk_tx(
+    session: Session, status: str | None, after_id: int
+) -> list[dict[str, object]]:
+    rows = session.execute(_list_items_stmt(status, after_id, EXPORT_CHUNK_SIZE))
+    return [dict(zip(_ITEM_FIELDS, row[:-1])) for row in rows]
+
+
+async def _export_ndjson(
+    status: str | None, client_key: str | None
+) -> AsyncIterator[bytes]:
+    """Stream rows in keyset chunks; the session lives as long as the body."""
+    async with read_session_runner(client_key) as db:
+        after_id = 0
+        while True:
+            rows = await db.run(_export_chunk_tx, status, after_id)
+            if rows:
+                yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+            if len(rows) < EXPORT_CHUNK_SIZE:
+                return
+            after_id = rows[-1]["id"]
+
+
+@app.get("/items/export")
+async def export_items(
+    request: Request,
+    status: str | None = None,
+    format: str = Query(default="ndjson"),
+):
+    if format not in EXPORT_FORMATS:
         raise ApiError(
             code="validation_error",
-            detail=f"status must be one of: {', '.join(sorted(ALLOWED_STATUSES))}",
+            detail=f"format must be one of: {', '.join(sorted(EXPORT_FORMATS))}",
             status=422,
         )
+    _ensure_status_filter(status)
+    # Dependencies are torn down before the body streams, so the generator opens
+    # its own runner from the same factory as get_read_runner.
+    client_key = _rate_limit_key(request.scope) if get_read_router() else None
+    return StreamingResponse(
+        _export_ndjson(status, client_key), media_type=EXPORT_FORMATS[format]
+    )
+
+
+def _search_items_tx(
+    session: Session, q: str, ceiling: int, offset: int, limit: int
+) -> tuple[list[dict[str, object]], tuple[int, int] | None]:
+    """One page of results and the ``(ceiling, offset)`` it ends at, if any."""
+    dialect = session.get_bind().dialect.name
+    statements = search_statements(dialect)
+    if statements is None:
+        raise ApiError(
+            code="search_unavailable",
+            detail=f"full-text search is not supported on {dialect}",
+            status=501,
+        )
+    query = search_query(dialect, q)
+    if not query:
+        return [], None
+    floor_stmt, page_stmt = statements
+    candidates = max_candidates()
+    items: list[dict[str, object]] = []
+    while True:
+        floor = session.scalar(
+            floor_stmt, {"query": query, "ceiling": ceiling, "candidates": candidates}
+        )
+        wanted = limit - len(items)
+        rows = session.execute(
+            page_stmt,
+            {
+                "query": query,
+                "floor": floor or 0,
+                "ceiling": ceiling,
+                "limit": wanted + 1,
+                "offset": offset,
+            },
+        )
+        page = [dict(zip(_ITEM_FIELDS, row)) for row in rows]
+        items += page[:wanted]
+        if len(page) > wanted:
+            return items, (ceiling, offset + wanted)
+        # A window with fewer than ``candidates`` matches is the oldest one.
+        if floor is None:
+            return items, None
+        ceiling, offset = floor - 1, 0
+        if len(items) == limit:
+            return items, (ceiling, offset)
+
+
+@app.get("/items/search", response_model=list[Item])
+async def search_items(
+    q: str = Query(min_length=1, max_length=SEARCH_MAX_QUERY_LENGTH),
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: SessionRunner = Depends(get_read_runner),
+):
+    """Items whose name or description contain every term of ``q``, best first.
+
+    Matches are ranked within windows of ``SEARCH_MAX_CANDIDATES`` by id, newest
+    window first, so "best first" holds per window; following ``X-Next-Cursor``
+    returns every match exactly once.
+    """
+    ceiling, offset = (
+        decode_search_cursor(cursor) if cursor is not None else (MAX_CURSOR_VALUE, 0)
+    )
+    items, position = await db.run(_search_items_tx, q, ceiling, offset, limit)
+    headers = {}
+    if position is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_search_cursor(*position)
+    return ORJSONResponse(items, headers=headers)
 
-    stmt = select(ItemModel).order_by(ItemModel.id)
-    if status is not None:
-        stmt = stmt.where(ItemModel.status == status)
-    records = session.execute(stmt).scalars().all()
-    return [_serialize_item(record) for record in records]
+
+def _status_counts_tx(session: Session) -> dict[str, object]:
+    stored = read_status_counts(session)
+    counts = {status: stored.get(status, 0) for status in sorted(ALLOWED_STATUSES)}
+    return {"counts": counts, "total": sum(counts.values())}
+
+
+@app.get("/items/stats")
+async def item_stats(db: SessionRunner = Depends(get_read_runner)):
+    """Items per status, read from the maintained summary table."""
+    return ORJSONResponse(await db.run(_status_counts_tx))
+
+
+def _changes_since_tx(session: Session, since: int, limit: int) -> Changes:
+    stmt = (
+        select(*_CHANGE_COLUMNS)
+        .where(ItemChangeModel.seq > since)
+        .order_by(ItemChangeModel.seq)
+        .limit(limit)
+    )
+    return [row._asdict() for row in session.execute(stmt)]
+
+
+def _read_changes(since: int, limit: int) -> Changes:
+    # A short session per read: an open stream must not pin a pooled connection.
+    with SessionLocal() as session:
+        return _changes_since_tx(session, since, limit)
+
+
+def _latest_change_seq() -> int:
+    with SessionLocal() as session:
+        return session.scalar(select(func.max(ItemChangeModel.seq))) or 0
+
+
+@app.get("/items/changes")
+async def list_item_changes(
+    since: int = Query(default=0, ge=0, le=MAX_CURSOR_VALUE),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: SessionRunner = Depends(get_read_runner),
+):
+    """Changes with ``seq > since`` in order; poll again with the last ``seq``."""
+    return ORJSONResponse(await db.run(_changes_since_tx, since, limit))
+
+
+def _sse_frame(change: dict[str, object]) -> str:
+    data = orjson.dumps(change).decode()
+    return f"id: {change['seq']}\nevent: {change['action']}\ndata: {data}\n\n"
+
+
+async def _change_stream(since: int) -> AsyncIterator[str]:
+    """Replay the log after ``since``, then follow live events.
+
+    Live events only cover this process's writes, so a gap in ``seq`` (another
+    worker, publishers finishing out of order, a dropped subscription) or a
+    quiet heartbeat interval sends the stream back to the log to catch up.
+    """
+    broadcaster = get_change_broadcaster()
+    last = since
+    while True:
+        # Subscribe before reading the log so nothing committed in between is lost.
+        subscription = broadcaster.subscribe()
+        try:
+            while True:
+                backlog = await run_in_threadpool(
+                    _read_changes, last, CHANGE_REPLAY_BATCH
+                )
+                for change in backlog:
+                    yield _sse_frame(change)
+                    last = change["seq"]
+                if len(backlog) < CHANGE_REPLAY_BATCH:
+                    break
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        subscription.get(), CHANGE_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    break
+                if change is None or change["seq"] > last + 1:
+                    break
+                if change["seq"] == last + 1:
+                    yield _sse_frame(change)
+                    last = change["seq"]
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+
+@app.get("/items/changes/stream")
+async def stream_item_changes(
+    since: int | None = Query(default=None, ge=0, le=MAX_CURSOR_VALUE),
+    last_event_id: str | None = Header(default=None),
+):
+    """Server-Sent Events, one ``create``/``update``/``delete`` event per change.
+
+    Without ``since`` the stream starts at the current end of the log; a
+    reconnecting client's ``Last-Event-ID`` resumes right after that event.
+    """
+    if last_event_id is not None:
+        if not last_event_id.isdigit() or int(last_event_id) > MAX_CURSOR_VALUE:
+            raise ApiError(
+                code="validation_error",
+                detail="Last-Event-ID must be a change seq",
+                status=422,
+            )
+        since = int(last_event_id)
+    if since is None:
+        since = await run_in_threadpool(_latest_change_seq)
+    return StreamingResponse(
+        _change_stream(since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _create_item_tx(
+    session: Session, data: dict[str, object]
+) -> tuple[dict[str, object], Changes]:
+    """Insert one item and return its cache entry (payload and ETag).
+
+    RETURNING hands back the stored row, so no SELECT follows the INSERT.
+    """
+    _lock_change_log(session)
+    stmt = insert(ItemModel).values(**data).returning(*_ITEM_COLUMNS, ItemModel.version)
+    row = session.execute(stmt).one()
+    changes = _record_changes(session, [_change(row.id, "create", row.version)])
+    apply_status_deltas(session, {row.status: 1})
+    item = dict(zip(_ITEM_FIELDS, row[:-1]))
+    return _item_entry(item, row.version), changes
 
 
 @app.post("/items", response_model=Item, status_code=201)
-def create_item(
+async def create_item(
     payload: ItemCreate,
-    session: Session = Depends(get_session),
-    _auth: None = Depends(require_api_token),
+    db: SessionRunner = Depends(get_write_runner),
+    _auth: ApiToken = Depends(require_items_write),
 ):
-    record = ItemModel(**payload.model_dump())
-    session.add(record)
-    session.commit()
-    session.refresh(record)
-    return _serialize_item(record)
+    entry, changes = await _run_write(db, _create_item_tx, payload.model_dump())
+    await _invalidate_cache(statuses=[entry["item"]["status"]])
+    _publish_changes(changes)
+    return _item_response(entry, status_code=201)
 
 
-@app.get("/items/{item_id}", response_model=Item)
-def get_item(
-    item_id: int,
-    session: Session = Depends(get_session),
-):
+def _get_item_tx(session: Session, item_id: int) -> dict[str, object]:
     record = session.get(ItemModel, item_id)
     if record is not None:
-        return _serialize_item(record)
+        return _item_entry(_serialize_item(record), record.version)
     raise ApiError(code="not_found", detail="item not found", status=404)
 
 
-@app.put("/items/{item_id}", response_model=Item)
-def update_item(
+@app.get("/items/{item_id}", response_model=Item)
+async def get_item(
     item_id: int,
-    payload: ItemUpdate,
-    session: Session = Depends(get_session),
-    _auth: None = Depends(require_api_token),
+    if_none_match: str | None = Header(default=None),
+    db: SessionRunner = Depends(get_read_runner),
 ):
-    record = session.get(ItemModel, item_id)
-    if record is None:
-        raise ApiError(code="not_found", detail="item not found", status=404)
+    cache = get_item_cache()
+    if cache is None:
+        entry = await db.run(_get_item_tx, item_id)
+    else:
+        cache_key = await cache.item_key(item_id)
+        entry = await cache.get(cache_key)
+        if entry is None:
+            entry = await db.run(_get_item_tx, item_id)
+            # A lagging replica could otherwise pin a stale entry for the whole TTL,
+            # hiding the write even from the sticky client that made it.
+            if db.replica is None:
+                await cache.set(cache_key, entry)
 
-    update_data = payload.model_dump(exclude_unset=True)
+    if etag_matches(if_none_match, entry["etag"], weak=True):
+        return _not_modified(entry["etag"])
+    return _item_response(entry)
+
+
+def _validated_update_data(
+    payload: ItemUpdate, exclude: set[str] | None = None
+) -> dict[str, object]:
+    update_data = payload.model_dump(exclude_unset=True, exclude=exclude)
     if not update_data:
         raise ApiError(
             code="validation_error",
@@ -166,23 +776,358 @@ def update_item(
             status=422,
         )
 
+    return update_data
+
+
+def _update_item_tx(
+    session: Session, item_id: int, payload: ItemUpdate, if_match: str | None
+) -> tuple[str, dict[str, object], Changes]:
+    """Apply the update and return the previous status with the new entry."""
+    _lock_change_log(session)
+    record = session.get(ItemModel, item_id)
+    if record is None:
+        raise ApiError(code="not_found", detail="item not found", status=404)
+
+    update_data = _validated_update_data(payload)
+    _check_if_match(if_match, record)
+    previous_status = record.status
     for field, value in update_data.items():
         setattr(record, field, value)
 
-    session.commit()
-    session.refresh(record)
-    return _serialize_item(record)
+    _flush_or_conflict(session)
+    changes = _record_changes(session, [_change(item_id, "update", record.version)])
+    apply_status_deltas(
+        session, status_deltas({record.status: 1}, {previous_status: 1})
+    )
+    entry = _item_entry(_serialize_item(record), record.version)
+    return previous_status, entry, changes
 
 
-@app.delete("/items/{item_id}", status_code=204)
-def delete_item(
+@app.put("/items/{item_id}", response_model=Item)
+async def update_item(
     item_id: int,
-    session: Session = Depends(get_session),
-    _auth: None = Depends(require_api_token),
+    payload: ItemUpdate,
+    if_match: str | None = Header(default=None),
+    db: SessionRunner = Depends(get_write_runner),
+    _auth: ApiToken = Depends(require_items_write),
 ):
+    previous_status, entry, changes = await _run_write(
+        db, _update_item_tx, item_id, payload, if_match
+    )
+    await _invalidate_cache([item_id], [previous_status, entry["item"]["status"]])
+    _publish_changes(changes)
+    return _item_response(entry)
+
+
+def _delete_item_tx(
+    session: Session, item_id: int, if_match: str | None
+) -> tuple[str, Changes]:
+    _lock_change_log(session)
     record = session.get(ItemModel, item_id)
     if record is None:
         raise ApiError(code="not_found", detail="item not found", status=404)
+    _check_if_match(if_match, record)
     session.delete(record)
-    session.commit()
+    _flush_or_conflict(session)
+    changes = _record_changes(session, [_change(item_id, "delete", record.version)])
+    apply_status_deltas(session, {record.status: -1})
+    return record.status, changes
+
+
+@app.delete("/items/{item_id}", status_code=204)
+async def delete_item(
+    item_id: int,
+    if_match: str | None = Header(default=None),
+    db: SessionRunner = Depends(get_write_runner),
+    _auth: ApiToken = Depends(require_items_write),
+):
+    deleted_status, changes = await db.run(
+        _committed, _delete_item_tx, item_id, if_match
+    )
+    await _invalidate_cache([item_id], [deleted_status])
+    _publish_changes(changes)
     return Response(status_code=204)
+
+
+def _batch_error(index: int, exc: ApiError) -> ItemBatchResult:
+    return ItemBatchResult(index=index, status=exc.status, error=api_error_details(exc))
+
+
+def _duplicate_id_error(item_id: int) -> ApiError:
+    return ApiError(
+        code="validation_error",
+        detail=f"item {item_id} appears more than once in the batch",
+        status=422,
+    )
+
+
+def _existing_versions(session: Session, ids: list[int]) -> dict[int, tuple[str, int]]:
+    """Map each existing id to its current ``(status, version)``."""
+    if not ids:
+        return {}
+    stmt = select(ItemModel.id, ItemModel.status, ItemModel.version).where(
+        ItemModel.id.in_(ids)
+    )
+    return {
+        item_id: (status, version) for item_id, status, version in session.execute(stmt)
+    }
+
+
+def _create_items_batch_tx(
+    session: Session, payload: ItemBatchCreateRequest
+) -> tuple[ItemBatchResponse, Changes]:
+    _lock_change_log(session)
+    stmt = insert(ItemModel).returning(
+        *_ITEM_COLUMNS, ItemModel.version, sort_by_parameter_order=True
+    )
+    rows = session.execute(stmt, [item.model_dump() for item in payload.items]).all()
+    changes = _record_changes(
+        session, [_change(row.id, "create", row.version) for row in rows]
+    )
+    apply_status_deltas(session, Counter(row.status for row in rows))
+    batch = ItemBatchResponse(
+        results=[
+            ItemBatchResult(
+                index=index, status=201, item=dict(zip(_ITEM_FIELDS, row[:-1]))
+            )
+            for index, row in enumerate(rows)
+        ]
+    )
+    return batch, changes
+
+
+@app.post("/items:batch", response_model=ItemBatchResponse, status_code=201)
+async def create_items_batch(
+    payload: ItemBatchCreateRequest,
+    db: SessionRunner = Depends(get_write_runner),
+    _auth: ApiToken = Depends(require_items_write),
+):
+    batch, changes = await db.run(_committed, _create_items_batch_tx, payload)
+    await _invalidate_cache(statuses={result.item.status for result in batch.results})
+    _publish_changes(changes)
+    return batch
+
+
+def _update_items_batch_tx(
+    session: Session, payload: ItemBatchUpdateRequest
+) -> tuple[ItemBatchResponse, dict[int, str], Changes]:
+    """Apply the batch and return it with the previous status of updated ids."""
+    _lock_change_log(session)
+    results: dict[int, ItemBatchResult] = {}
+    pending: dict[int, tuple[int, dict[str, object]]] = {}
+    seen: set[int] = set()
+    for index, entry in enumerate(payload.items):
+        try:
+            if entry.id in seen:
+                raise _duplicate_id_error(entry.id)
+            seen.add(entry.id)
+            pending[entry.id] = (index, _validated_update_data(entry, {"id"}))
+        except ApiError as exc:
+            results[index] = _batch_error(index, exc)
+
+    existing = _existing_versions(session, list(pending))
+    not_found = ApiError(code="not_found", detail="item not found", status=404)
+    for item_id, (index, _data) in list(pending.items()):
+        if item_id not in existing:
+            results[index] = _batch_error(index, not_found)
+            del pending[item_id]
+
+    changes: Changes = []
+    if pending:
+        # The version in each mapping makes the ORM check and bump it per row.
+        mappings = [
+            {"id": item_id, "version": existing[item_id][1], **data}
+            for item_id, (_index, data) in pending.items()
+        ]
+        try:
+            session.execute(update(ItemModel), mappings)
+        except StaleDataError as exc:
+            session.rollback()
+            raise _precondition_failed() from exc
+        stmt = select(*_ITEM_COLUMNS).where(ItemModel.id.in_(list(pending)))
+        added: Counter[str] = Counter()
+        for row in session.execute(stmt):
+            index = pending[row.id][0]
+            results[index] = ItemBatchResult(
+                index=index, status=200, item=row._asdict()
+            )
+            added[row.status] += 1
+        changes = _record_changes(
+            session,
+            [
+                _change(item_id, "update", existing[item_id][1] + 1)
+                for item_id in pending
+            ],
+        )
+        removed = Counter(existing[item_id][0] for item_id in pending)
+        apply_status_deltas(session, status_deltas(added, removed))
+
+    batch = ItemBatchResponse(results=[results[index] for index in sorted(results)])
+    return batch, {item_id: existing[item_id][0] for item_id in pending}, changes
+
+
+@app.patch("/items:batch", response_model=ItemBatchResponse)
+async def update_items_batch(
+    payload: ItemBatchUpdateRequest,
+    db: SessionRunner = Depends(get_write_runner),
+    _auth: ApiToken = Depends(require_items_write),
+):
+    batch, previous_statuses, changes = await db.run(
+        _committed, _update_items_batch_tx, payload
+    )
+    new_statuses = {result.item.status for result in batch.results if result.item}
+    await _invalidate_cache(
+        previous_statuses, {*previous_statuses.values(), *new_statuses}
+    )
+    _publish_changes(changes)
+    return batch
+
+
+def _delete_items_batch_tx(
+    session: Session, payload: ItemBatchDeleteRequest
+) -> tuple[ItemBatchResponse, dict[int, str], Changes]:
+    """Delete existing ids and return the batch with the removed items' statuses."""
+    _lock_change_log(session)
+    results: list[ItemBatchResult] = []
+    seen: set[int] = set()
+    existing = _existing_versions(session, list(set(payload.ids)))
+    not_found = ApiError(code="not_found", detail="item not found", status=404)
+    for index, item_id in enumerate(payload.ids):
+        if item_id in seen:
+            results.append(_batch_error(index, _duplicate_id_error(item_id)))
+        elif item_id not in existing:
+            results.append(_batch_error(index, not_found))
+        else:
+            results.append(ItemBatchResult(index=index, status=204))
+        seen.add(item_id)
+
+    changes: Changes = []
+    if existing:
+        session.execute(delete(ItemModel).where(ItemModel.id.in_(list(existing))))
+        changes = _record_changes(
+            session,
+            [
+                _change(item_id, "delete", version)
+                for item_id, (_status, version) in existing.items()
+            ],
+        )
+        removed = Counter(status for status, _version in existing.values())
+        apply_status_deltas(session, status_deltas(removed=removed))
+    deleted = {item_id: status for item_id, (status, _version) in existing.items()}
+    return ItemBatchResponse(results=results), deleted, changes
+
+
+@app.delete("/items:batch", response_model=ItemBatchResponse)
+async def delete_items_batch(
+    payload: ItemBatchDeleteRequest,
+    db: SessionRunner = Depends(get_write_runner),
+    _auth: ApiToken = Depends(require_items_write),
+):
+    batch, deleted_statuses, changes = await db.run(
+        _committed, _delete_items_batch_tx, payload
+    )
+    await _invalidate_cache(deleted_statuses, deleted_statuses.values())
+    _publish_changes(changes)
+    return batch
+
+
+def _upload_error(reason: str) -> ApiError:
+    code, detail, status = _UPLOAD_ERRORS.get(reason, _UPLOAD_FAILED)
+    return ApiError(code=code, detail=detail, status=status)
+
+
+def _upload_busy() -> ApiError:
+    return ApiError(
+        code="upload_busy",
+        detail="upload workers are saturated, retry later",
+        status=503,
+        headers={"Retry-After": UPLOAD_RETRY_AFTER_SECONDS},
+    )
+
+
+def _upload_store(upload_dir: str, storage: str) -> UploadStore | ContentStore:
+    key = (storage, upload_dir)
+    store = _upload_stores.get(key)
+    if store is None:
+        store = (
+            ContentStore(upload_dir) if storage == "cas" else UploadStore(upload_dir)
+        )
+        if store.dir_fd is None:
+            return store
+        kept = _upload_stores.setdefault(key, store)
+        if kept is not store:
+            store.close()
+        return kept
+    return store
+
+
+def _upload_storage() -> str:
+    mode = os.getenv(UPLOAD_STORAGE_ENV, "uuid").lower()
+    if mode not in UPLOAD_STORAGE_MODES:
+        raise ValueError(f"unknown upload storage: {mode!r}")
+    return mode
+
+
+@app.post("/uploads", status_code=201)
+async def create_upload(
+    request: Request,
+    content_length: int | None = Header(default=None),
+    _auth: ApiToken = Depends(require_uploads_write),
+):
+    if content_length is not None and content_length > MAX_BYTES:
+        raise _upload_error("too_big")
+
+    upload_dir = os.getenv(UPLOAD_DIR_ENV, DEFAULT_UPLOAD_DIR)
+    try:
+        started = time.perf_counter()
+        storage = _upload_storage()
+        store = await upload_executor.run(_upload_store, upload_dir, storage)
+        if isinstance(store, ContentStore):
+            ok, result = await store.save_stream(
+                request.stream(), upload_executor.run, owner=_auth.name
+            )
+        else:
+            ok, result = await store.save_stream(request.stream(), upload_executor.run)
+        upload_save_seconds.observe(time.perf_counter() - started)
+    except PoolSaturated:
+        raise _upload_busy() from None
+
+    if not ok:
+        raise _upload_error(result)
+    stored = Path(result)
+    media_type = "image/png" if stored.suffix == ".png" else "image/jpeg"
+    return {"id": stored.name, "media_type": media_type}
+
+
+@app.delete("/uploads/{upload_id}", status_code=204)
+async def delete_upload(
+    upload_id: str, _auth: ApiToken = Depends(require_uploads_write)
+):
+    """Drop one of the caller's references to a content-addressed upload.
+
+    Only ``UPLOAD_STORAGE=cas``. References belong to the token that created
+    them; an id the caller holds no reference to is a 404 whether or not
+    the blob exists.
+    """
+    deleted = False
+    if _upload_storage() == "cas":
+        upload_dir = os.getenv(UPLOAD_DIR_ENV, DEFAULT_UPLOAD_DIR)
+        try:
+            store = await upload_executor.run(_upload_store, upload_dir, "cas")
+            deleted = await upload_executor.run(store.delete, upload_id, _auth.name)
+        except PoolSaturated:
+            raise _upload_busy() from None
+    if not deleted:
+        raise ApiError(code="not_found", detail="upload not found", status=404)
+    return Response(status_code=204)
+
+
+@app.get("/internal/writes")
+def write_queue_stats(_auth: ApiToken = Depends(require_internal_read)):
+    queue = get_write_queue()
+    return {"enabled": queue is not None, **(queue.stats() if queue else {})}
+
+
+@app.get("/internal/uploads")
+def upload_pool_stats(_auth: ApiToken = Depends(require_internal_read)):
+    return {**upload_executor.stats(), "save_seconds": upload_save_seconds.snapshot()}
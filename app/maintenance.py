@@ -0,0 +1,38 @@
+"""Operator commands for derived data kept next to the items table.
+
+``check`` compares the per-status summary table with a recount of ``items``
+and exits with status 1 when they differ; ``rebuild`` recounts and stores the
+result in one transaction, safe to run while the app is serving writes.
+
+Usage: python -m app.maintenance {check,rebuild}
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from app.db import SessionLocal, init_db
+from app.stats import check_status_counts, rebuild_status_counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.maintenance")
+    parser.add_argument("command", choices=("check", "rebuild"))
+    args = parser.parse_args(argv)
+
+    init_db()
+    with SessionLocal() as session:
+        if args.command == "check":
+            mismatches = check_status_counts(session)
+            print(json.dumps({"consistent": not mismatches, "mismatches": mismatches}))
+            return 1 if mismatches else 0
+        counts = rebuild_status_counts(session)
+        session.commit()
+    print(json.dumps({"rebuilt": dict(sorted(counts.items()))}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""Lightweight in-process metric primitives and Prometheus text exposition."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Requests that matched no route share one label, so scanners cannot blow up cardinality.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect plus two additions."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Cumulative bucket counts keyed by upper bound, plus sum and count."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {"buckets": cumulative, "sum": round(total, 6), "count": running}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Family:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        super().__init__(name, help_text)
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def collect(self) -> Iterator[str]:
+        yield from self.header()
+        yield f"{self.name} {self.value}"
+
+
+class CounterVec(_Family):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...]) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], int] = {}
+
+    def inc(self, *labelvalues: str, amount: int = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> int:
+        return self._values.get(labelvalues, 0)
+
+    def collect(self) -> Iterator[str]:
+        yield from self.header()
+        with self._lock:
+            values = sorted(self._values.items())
+        for labelvalues, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {value}"
+
+
+class HistogramVec(_Family):
+    """One ``Histogram`` per label combination, created on first use."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], Histogram] = {}
+
+    def labels(self, *labelvalues: str) -> Histogram:
+        child = self._children.get(labelvalues)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labelvalues, Histogram(self.buckets))
+        return child
+
+    def collect(self) -> Iterator[str]:
+        yield from self.header()
+        with self._lock:
+            children = sorted(self._children.items())
+        for labelvalues, child in children:
+            snapshot = child.snapshot()
+            for bound, count in snapshot["buckets"].items():
+                labels = _labels(self.labelnames, labelvalues, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {count}"
+            labels = _labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {snapshot['sum']}"
+            yield f"{self.name}_count{labels} {snapshot['count']}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._families: list[Any] = []
+
+    def register(self, family: Any) -> Any:
+        self._families.append(family)
+        return family
+
+    def render(self) -> str:
+        lines = [line for family in self._families for line in family.collect()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_seconds = REGISTRY.register(
+    HistogramVec(
+        "http_request_duration_seconds",
+        "Request latency by route template, method and status.",
+        ("route", "method", "status"),
+    )
+)
+http_requests_in_flight = REGISTRY.register(
+    Gauge("http_requests_in_flight", "Requests currently being served.")
+)
+db_queries_per_request = REGISTRY.register(
+    HistogramVec(
+        "db_queries_per_request",
+        "SQL statements executed per request.",
+        ("route",),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+db_query_seconds_per_request = REGISTRY.register(
+    HistogramVec(
+        "db_query_duration_seconds_per_request",
+        "Total time spent in SQL statements per request.",
+        ("route",),
+    )
+)
+problem_responses = REGISTRY.register(
+    CounterVec(
+        "problem_responses_total", "RFC 7807 problem responses by code.", ("code",)
+    )
+)
+change_stream_subscribers = REGISTRY.register(
+    Gauge("change_stream_subscribers", "Open item change streams.")
+)
+change_stream_dropped = REGISTRY.register(
+    CounterVec(
+        "change_stream_dropped_total",
+        "Change stream subscribers dropped for falling behind.",
+        (),
+    )
+)
+api_token_requests = REGISTRY.register(
+    CounterVec(
+        "api_token_requests_total", "Authorized requests by API token name.", ("token",)
+    )
+)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+
+# The middleware installs a fresh QueryStats per request; threadpool and
+# greenlet-run DB work sees the same object through the copied context.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def record_query(seconds: float) -> None:
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request.
+
+    The route label is the matched template (``/items/{item_id}``), read from
+    ``scope["route"]`` after routing, never the raw path.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            current_query_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            http_request_seconds.labels(route, scope["method"], str(status)).observe(
+                elapsed
+            )
+            db_queries_per_request.labels(route).observe(stats.count)
+            db_query_seconds_per_request.labels(route).observe(stats.seconds)
@@ -1,8 +1,9 @@
 """SQLAlchemy models."""
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String, event
 
 from app.db import Base
+from app.search import install_search_ddl
 
 
 class Item(Base):
@@ -12,3 +13,45 @@ class Item(Base):
     name = Column(String(100), nullable=False)
     description = Column(String(300), nullable=True)
     status = Column(String(20), nullable=False, default="draft")
+    # Bumped by the ORM on every UPDATE; backs ETags and optimistic concurrency.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Matches the filtered listing: WHERE status = ? AND id > ? ORDER BY id.
+    __table_args__ = (Index("ix_items_status_id", "status", "id"),)
+    __mapper_args__ = {"version_id_col": version}
+
+
+class ItemChange(Base):
+    """Append-only log of item writes; ``seq`` orders the change feed."""
+
+    __tablename__ = "item_changes"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(Integer, nullable=False)
+    action = Column(String(10), nullable=False)
+    version = Column(Integer, nullable=False)
+
+    # AUTOINCREMENT: a sequence number is never handed out twice, even after pruning.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class ItemStatusCount(Base):
+    """Number of items per status, maintained by the write handlers."""
+
+    __tablename__ = "item_status_counts"
+
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _fill_status_counts(target, connection, tables=(), **kwargs) -> None:
+    # Also runs when the table is added to a database that already holds items.
+    if ItemStatusCount.__table__ in tables:
+        from app.stats import rebuild_status_counts
+
+        rebuild_status_counts(connection)
+
+
+# Full-text index over name and description, kept in sync by the database.
+install_search_ddl(Item.__table__)
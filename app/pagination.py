@@ -0,0 +1,57 @@
+"""Opaque cursors for paginated listings: keyset for ``/items``, windows for search."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+
+from app.errors import ApiError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+_CURSOR_PREFIX = "id:"
+_SEARCH_PREFIX = "win:"
+# Larger values overflow SQLite's INTEGER and a bound parameter raises OverflowError.
+MAX_CURSOR_VALUE = 2**63 - 1
+
+
+def _encode(prefix: str, *values: int) -> str:
+    raw = (prefix + ":".join(str(value) for value in values)).encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(prefix: str, cursor: str, count: int = 1) -> tuple[int, ...]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+    except (UnicodeError, binascii.Error, ValueError):
+        raw = ""
+    parts = raw[len(prefix) :].split(":") if raw.startswith(prefix) else []
+    if len(parts) == count and all(
+        part.isdigit() and int(part) <= MAX_CURSOR_VALUE for part in parts
+    ):
+        return tuple(int(part) for part in parts)
+    raise ApiError(code="validation_error", detail="invalid cursor", status=422)
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen primary key into an opaque, URL-safe cursor."""
+    return _encode(_CURSOR_PREFIX, last_id)
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the primary key stored in a cursor produced by ``encode_cursor``."""
+    return _decode(_CURSOR_PREFIX, cursor)[0]
+
+
+def encode_search_cursor(ceiling: int, offset: int) -> str:
+    """Encode a search position: the highest id of the ranked window and the
+    offset of the next result within it."""
+    return _encode(_SEARCH_PREFIX, ceiling, offset)
+
+
+def decode_search_cursor(cursor: str) -> tuple[int, int]:
+    """Return ``(ceiling, offset)`` from a cursor made by ``encode_search_cursor``."""
+    ceiling, offset = _decode(_SEARCH_PREFIX, cursor, 2)
+    return ceiling, offset
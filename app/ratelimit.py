@@ -0,0 +1,187 @@
+"""Per-client rate limiting (NFR-S05: 60 requests/min per client, 429 beyond).
+
+Clients are identified by IP, or by their API token when they present a valid
+one. The memory backend is a token bucket per key kept in an LRU, so a hit is
+O(1) and idle keys are evicted once ``max_keys`` is reached. The Redis backend
+shares a sliding-window counter between workers.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Protocol
+
+from app.errors import PROBLEM_BASE_URI, problem
+from app.metrics import problem_responses
+
+RATE_LIMIT_ENV = "RATE_LIMIT_PER_MINUTE"
+RATE_LIMIT_BURST_ENV = "RATE_LIMIT_BURST"
+RATE_LIMIT_BACKEND_ENV = "RATE_LIMIT_BACKEND"
+RATE_LIMIT_URL_ENV = "RATE_LIMIT_URL"
+RATE_LIMIT_MAX_KEYS_ENV = "RATE_LIMIT_MAX_KEYS"
+
+DEFAULT_PER_MINUTE = 60
+DEFAULT_MAX_KEYS = 100_000
+WINDOW_SECONDS = 60
+# Liveness probes must not eat into, or be refused by, a client's budget.
+EXEMPT_PATHS = frozenset({"/health"})
+
+
+class RateLimiter(Protocol):
+    async def hit(self, key: str) -> float:
+        """Consume one request; return 0 if allowed, else seconds to wait."""
+        ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryRateLimiter:
+    """Token bucket per key: ``burst`` capacity refilled at ``per_minute / 60``/s."""
+
+    def __init__(
+        self,
+        per_minute: int = DEFAULT_PER_MINUTE,
+        burst: int | None = None,
+        max_keys: int = DEFAULT_MAX_KEYS,
+    ) -> None:
+        self.capacity = float(burst or per_minute)
+        self.rate = per_minute / WINDOW_SECONDS
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                tokens = self.capacity
+            else:
+                tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            # Re-inserting marks the key most recently used; the oldest is idle.
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimiter:
+    """Sliding-window counter shared by every worker through Redis.
+
+    The previous window's count is weighted by how much of it still overlaps
+    the last 60 seconds; only ``get``, ``incr`` and ``expire`` are required.
+    """
+
+    def __init__(
+        self, client: Any, per_minute: int = DEFAULT_PER_MINUTE, prefix: str = "rl:"
+    ) -> None:
+        self.client = client
+        self.limit = per_minute
+        self.prefix = prefix
+
+    async def hit(self, key: str) -> float:
+        now = time.time()
+        window, elapsed = divmod(now, WINDOW_SECONDS)
+        current_key = f"{self.prefix}{key}:{int(window)}"
+        count = int(await self.client.incr(current_key))
+        if count == 1:
+            await self.client.expire(current_key, 2 * WINDOW_SECONDS)
+        previous = await self.client.get(f"{self.prefix}{key}:{int(window) - 1}")
+        weight = (WINDOW_SECONDS - elapsed) / WINDOW_SECONDS
+        if int(previous or 0) * weight + count <= self.limit:
+            return 0.0
+        return WINDOW_SECONDS - elapsed
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+def client_ip_key(scope: dict) -> str:
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware answering 429 problem responses over the limit.
+
+    ``identify`` maps the ASGI scope to the bucket key; it runs before routing
+    and must stay cheap.
+    """
+
+    def __init__(
+        self, app: Any, identify: Callable[[dict], str] = client_ip_key
+    ) -> None:
+        self.app = app
+        self.identify = identify
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        limiter = get_rate_limiter()
+        if limiter is None or scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        wait = await limiter.hit(self.identify(scope))
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        problem_responses.inc("rate_limited")
+        response = problem(
+            status=429,
+            title="Too Many Requests",
+            detail="request rate limit exceeded, retry later",
+            type_=f"{PROBLEM_BASE_URI}rate_limited",
+        )
+        response.headers["Retry-After"] = str(max(1, math.ceil(wait)))
+        await response(scope, receive, send)
+
+
+_rate_limiter: RateLimiter | None = None
+_configured = False
+
+
+def _build_rate_limiter() -> RateLimiter | None:
+    per_minute = int(os.getenv(RATE_LIMIT_ENV, DEFAULT_PER_MINUTE))
+    if per_minute <= 0:
+        return None
+    backend_name = os.getenv(RATE_LIMIT_BACKEND_ENV, "memory").lower()
+    if backend_name == "memory":
+        burst = int(os.getenv(RATE_LIMIT_BURST_ENV, per_minute))
+        max_keys = int(os.getenv(RATE_LIMIT_MAX_KEYS_ENV, DEFAULT_MAX_KEYS))
+        return MemoryRateLimiter(per_minute, burst, max_keys)
+    if backend_name == "redis":
+        from redis.asyncio import Redis  # optional dependency
+
+        url = os.getenv(RATE_LIMIT_URL_ENV, "redis://localhost:6379/0")
+        return RedisRateLimiter(Redis.from_url(url), per_minute)
+    raise ValueError(f"unknown rate limit backend: {backend_name!r}")
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Return the configured limiter, or ``None`` when limiting is disabled."""
+    global _rate_limiter, _configured
+    if not _configured:
+        _rate_limiter = _build_rate_limiter()
+        _configured = True
+    return _rate_limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None) -> None:
+    global _rate_limiter, _configured
+    _rate_limiter = limiter
+    _configured = True
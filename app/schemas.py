@@ -1,10 +1,17 @@
 """Pydantic схемы и константы для работы с сущностями бэклога."""
 
 import re
+from typing import Annotated, Any
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.pagination import MAX_CURSOR_VALUE
+
 ALLOWED_STATUSES = {"draft", "in_progress", "done"}
+MAX_BATCH_SIZE = 500
+
+# Идентификатор из тела запроса: больше 64 бит БД не примет.
+ItemId = Annotated[int, Field(le=MAX_CURSOR_VALUE)]
 
 SAFE_TEXT_PATTERN = re.compile(r"[<>]|[\x00-\x08\x0B\x0C\x0E-\x1F]")
 
@@ -69,3 +76,32 @@ class ItemUpdate(BaseModel):
 
 class Item(ItemBase):
     id: int
+
+
+class ItemBatchUpdate(ItemUpdate):
+    id: ItemId
+
+
+class ItemBatchCreateRequest(BaseModel):
+    items: list[ItemCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchUpdateRequest(BaseModel):
+    items: list[ItemBatchUpdate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchDeleteRequest(BaseModel):
+    ids: list[ItemId] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchResult(BaseModel):
+    """Outcome of one batch entry: the item on success or a problem body."""
+
+    index: int
+    status: int
+    item: Item | None = None
+    error: dict[str, Any] | None = None
+
+
+class ItemBatchResponse(BaseModel):
+    results: list[ItemBatchResult]
@@ -0,0 +1,139 @@
+"""Full-text search over item names and descriptions.
+
+SQLite gets an FTS5 external-content table kept in sync by triggers; PostgreSQL
+gets a generated ``tsvector`` column with a GIN index. Both are created with
+the ``items`` table and added to existing databases by ``ensure_search_index``.
+Results are ranked within windows of ``SEARCH_MAX_CANDIDATES`` matches, newest
+window first; paging walks on into older windows until every match was returned.
+"""
+
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import DDL, Table, TextClause, event, inspect, text
+from sqlalchemy.engine import Engine
+
+FTS_TABLE = "items_fts"
+
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, description, content='items', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON items BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON items BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+SQLITE_DROP = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+POSTGRES_DDL = (
+    "ALTER TABLE items ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', "
+    "coalesce(name, '') || ' ' || coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_items_search_vector ON items "
+    "USING GIN (search_vector)",
+)
+
+SEARCH_CANDIDATES_ENV = "SEARCH_MAX_CANDIDATES"
+DEFAULT_MAX_CANDIDATES = 500
+
+# Ranking scores every candidate, so a term found in most rows would cost time
+# proportional to the table. Matches are ranked in windows instead: the
+# ``:candidates`` newest matches at or below ``:ceiling``, found by seeking the
+# id index (on SQLite the FTS5 rowid), then the next window below that one.
+_WINDOW_FLOOR_SQL = {
+    "sqlite": f"""
+        SELECT rowid FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH :query AND rowid <= :ceiling
+        ORDER BY rowid DESC LIMIT 1 OFFSET :candidates - 1
+    """,
+    "postgresql": """
+        SELECT id FROM items
+        WHERE search_vector @@ plainto_tsquery('simple', :query) AND id <= :ceiling
+        ORDER BY id DESC LIMIT 1 OFFSET :candidates - 1
+    """,
+}
+_SEARCH_SQL = {
+    "sqlite": f"""
+        SELECT items.id, items.name, items.description, items.status
+        FROM {FTS_TABLE} JOIN items ON items.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :query
+          AND {FTS_TABLE}.rowid BETWEEN :floor AND :ceiling
+        ORDER BY bm25({FTS_TABLE}), items.id
+        LIMIT :limit OFFSET :offset
+    """,
+    "postgresql": """
+        SELECT id, name, description, status
+        FROM items
+        WHERE search_vector @@ plainto_tsquery('simple', :query)
+          AND id BETWEEN :floor AND :ceiling
+        ORDER BY ts_rank(search_vector, plainto_tsquery('simple', :query)) DESC, id
+        LIMIT :limit OFFSET :offset
+    """,
+}
+
+
+def max_candidates() -> int:
+    value = os.getenv(SEARCH_CANDIDATES_ENV, "").strip()
+    return int(value) if value.isdigit() and int(value) > 0 else DEFAULT_MAX_CANDIDATES
+
+
+def install_search_ddl(table: Table) -> None:
+    """Create and drop the search structures together with ``table``."""
+    for statement in SQLITE_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(SQLITE_DROP).execute_if(dialect="sqlite"))
+    for statement in POSTGRES_DDL:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Add the search index to a database whose ``items`` table predates it."""
+    dialect = engine.dialect.name
+    if dialect == "sqlite" and not inspect(engine).has_table(FTS_TABLE):
+        with engine.begin() as connection:
+            for statement in SQLITE_DDL:
+                connection.exec_driver_sql(statement)
+            # External-content tables are filled from the items table on demand.
+            connection.exec_driver_sql(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+    elif dialect == "postgresql":
+        with engine.begin() as connection:
+            for statement in POSTGRES_DDL:
+                connection.exec_driver_sql(statement)
+
+
+def fts_query(raw: str) -> str:
+    """Turn user input into an FTS5 query matching every term literally.
+
+    Each whitespace-separated term is quoted, so operators, column filters and
+    stray quotes in the input are searched for rather than interpreted.
+    """
+    terms = [term.replace('"', '""') for term in raw.split()]
+    return " ".join(f'"{term}"' for term in terms if term.strip('"'))
+
+
+def search_statements(dialect: str) -> tuple[TextClause, TextClause] | None:
+    """Return the window-floor and ranked-page statements for ``dialect``."""
+    if dialect not in _SEARCH_SQL:
+        return None
+    return text(_WINDOW_FLOOR_SQL[dialect]), text(_SEARCH_SQL[dialect])
+
+
+def search_query(dialect: str, raw: str) -> str:
+    return fts_query(raw) if dialect == "sqlite" else " ".join(raw.split())
@@ -0,0 +1,56 @@
+"""Security response headers injected by a pure ASGI middleware."""
+
+from __future__ import annotations
+
+from typing import Any
+
+RawHeaders = list[tuple[bytes, bytes]]
+
+
+def encode_headers(headers: dict[str, str]) -> RawHeaders:
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in headers.items()
+    ]
+
+
+class SecurityHeadersMiddleware:
+    """Add pre-encoded headers on ``http.response.start`` unless already set.
+
+    ``route_overrides`` maps ``(method, route template)`` to header values that
+    replace the defaults for that route, e.g. a revalidating ``Cache-Control``
+    for cacheable GETs. Unlike ``BaseHTTPMiddleware`` the response body is
+    passed through untouched, so streaming responses keep streaming.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        headers: dict[str, str],
+        route_overrides: dict[tuple[str, str], dict[str, str]] | None = None,
+    ) -> None:
+        self.app = app
+        self.default_headers = encode_headers(headers)
+        self.route_headers = {
+            route: encode_headers({**headers, **override})
+            for route, override in (route_overrides or {}).items()
+        }
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                extra = self.default_headers
+                if route is not None and self.route_headers:
+                    extra = self.route_headers.get((scope["method"], route.path), extra)
+                headers = list(message.get("headers", ()))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(item for item in extra if item[0] not in present)
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
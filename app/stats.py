@@ -0,0 +1,86 @@
+"""Per-status item counts kept in the ``item_status_counts`` summary table.
+
+Write handlers add their deltas in the same transaction as the item change, so
+``GET /items/stats`` reads a handful of rows instead of scanning ``items``.
+``check_status_counts`` and ``rebuild_status_counts`` back ``app.maintenance``.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+from sqlalchemy import Connection, bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Item, ItemStatusCount
+from app.schemas import ALLOWED_STATUSES
+
+_COUNTS = ItemStatusCount.__table__
+
+Executor = Connection | Session
+
+
+def status_deltas(
+    added: Mapping[str, int] | None = None, removed: Mapping[str, int] | None = None
+) -> dict[str, int]:
+    deltas = dict(added or {})
+    for status, count in (removed or {}).items():
+        deltas[status] = deltas.get(status, 0) - count
+    return deltas
+
+
+def apply_status_deltas(db: Executor, deltas: Mapping[str, int]) -> None:
+    """Add ``deltas`` to the stored counts; zero deltas cost nothing."""
+    params = [
+        {"target": status, "delta": delta} for status, delta in deltas.items() if delta
+    ]
+    if params:
+        stmt = (
+            update(_COUNTS)
+            .where(_COUNTS.c.status == bindparam("target"))
+            .values(count=_COUNTS.c.count + bindparam("delta"))
+        )
+        db.execute(stmt, params)
+
+
+def read_status_counts(db: Executor) -> dict[str, int]:
+    return dict(db.execute(select(_COUNTS.c.status, _COUNTS.c.count)).all())
+
+
+def count_items_by_status(db: Executor) -> dict[str, int]:
+    stmt = select(Item.status, func.count()).group_by(Item.status)
+    return dict(db.execute(stmt).all())
+
+
+def check_status_counts(db: Executor) -> dict[str, dict[str, int]]:
+    """Return ``{status: {"stored", "actual"}}`` for every count that is off."""
+    stored = read_status_counts(db)
+    actual = count_items_by_status(db)
+    return {
+        status: {"stored": stored.get(status, 0), "actual": actual.get(status, 0)}
+        for status in sorted(ALLOWED_STATUSES | stored.keys() | actual.keys())
+        if stored.get(status) != actual.get(status, 0)
+    }
+
+
+def rebuild_status_counts(db: Executor) -> dict[str, int]:
+    """Recount ``items`` into the summary table and return the new counts."""
+    # Lock the counter rows (the whole database on SQLite) before counting: a
+    # writer that commits meanwhile then applies its delta on top of the result.
+    db.execute(update(_COUNTS).values(count=_COUNTS.c.count))
+    stored = read_status_counts(db)
+    actual = count_items_by_status(db)
+    statuses = ALLOWED_STATUSES | stored.keys() | actual.keys()
+    counts = {status: actual.get(status, 0) for status in statuses}
+    existing = [{"target": s, "value": n} for s, n in counts.items() if s in stored]
+    missing = [{"status": s, "count": n} for s, n in counts.items() if s not in stored]
+    if existing:
+        stmt = (
+            update(_COUNTS)
+            .where(_COUNTS.c.status == bindparam("target"))
+            .values(count=bindparam("value"))
+        )
+        db.execute(stmt, existing)
+    if missing:
+        db.execute(insert(_COUNTS), missing)
+    return counts
@@ -2,16 +2,44 @@
 
 from __future__ import annotations
 
+import fcntl
+import hashlib
+import json
+import os
+import re
+import tempfile
 import uuid
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Iterator,
+    TextIO,
+    TypeVar,
+)
 
 MAX_BYTES = 5_000_000
 ALLOWED_TYPES = {"image/png", "image/jpeg"}
+CHUNK_SIZE = 64 * 1024
 
 PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
 JPEG_SOI = b"\xff\xd8"
 JPEG_EOI = b"\xff\xd9"
 
+_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg"}
+
+T = TypeVar("T")
+
+# Create exactly the named entry: never reuse a file, never follow a planted symlink.
+_CREATE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | os.O_NOFOLLOW | os.O_CLOEXEC
+
+CONTENT_ID_PATTERN = re.compile(r"^(?P<digest>[0-9a-f]{64})(?P<ext>\.png|\.jpg)$")
+
 
 def sniff_image_type(data: bytes) -> str | None:
     """Return the media type if the bytes match a supported image signature."""
@@ -22,37 +50,50 @@ def sniff_image_type(data: bytes) -> str | None:
     return None
 
 
-def secure_save(
-    base_dir: str | Path, filename_hint: str, data: bytes
-) -> tuple[bool, str]:
-    """Persist validated image payloads with canonical path and UUID filenames."""
-    if len(data) > MAX_BYTES:
-        return False, "too_big"
-
-    media_type = sniff_image_type(data)
-    if media_type not in ALLOWED_TYPES:
-        return False, "bad_type"
-
+def _resolve_root(base_dir: str | Path) -> tuple[Path | None, str]:
+    """Canonicalise the upload directory, refusing symlinked or missing bases."""
     base_path = Path(base_dir)
     if base_path.is_symlink():
-        return False, "symlink_parent"
+        return None, "symlink_parent"
 
     try:
-        root = base_path.resolve(strict=True)
+        return base_path.resolve(strict=True), ""
     except FileNotFoundError:
-        return False, "missing_base"
+        return None, "missing_base"
 
-    extension = ".png" if media_type == "image/png" else ".jpg"
-    generated_name = f"{uuid.uuid4()}{extension}"
+
+def _safe_target(root: Path, media_type: str) -> tuple[Path | None, str]:
+    generated_name = f"{uuid.uuid4()}{_EXTENSIONS[media_type]}"
     target = root / generated_name
 
     if any(parent.is_symlink() for parent in target.parents if parent != root):
-        return False, "symlink_parent"
+        return None, "symlink_parent"
 
     resolved_target = target.resolve()
 
     if not resolved_target.is_relative_to(root):
-        return False, "path_traversal"
+        return None, "path_traversal"
+    return resolved_target, ""
+
+
+def secure_save(
+    base_dir: str | Path, filename_hint: str, data: bytes
+) -> tuple[bool, str]:
+    """Persist validated image payloads with canonical path and UUID filenames."""
+    if len(data) > MAX_BYTES:
+        return False, "too_big"
+
+    media_type = sniff_image_type(data)
+    if media_type not in ALLOWED_TYPES:
+        return False, "bad_type"
+
+    root, reason = _resolve_root(base_dir)
+    if root is None:
+        return False, reason
+
+    resolved_target, reason = _safe_target(root, media_type)
+    if resolved_target is None:
+        return False, reason
 
     try:
         with open(resolved_target, "xb") as destination:
@@ -61,3 +102,382 @@ def secure_save(
         return False, "collision"
 
     return True, str(resolved_target)
+
+
+class StreamingUpload:
+    """Validate an upload chunk by chunk while spooling it to a temp file in root.
+
+    Memory stays bounded by the chunk size: the signature is sniffed from the
+    first bytes, the size limit is enforced as data arrives and only the last
+    two bytes are kept for the JPEG end-of-image check. With ``dir_fd`` every
+    filesystem call is made relative to that pinned directory.
+    """
+
+    def __init__(self, root: Path, dir_fd: int | None = None) -> None:
+        self.root = root
+        self.dir_fd = dir_fd
+        if dir_fd is None:
+            fd, temp_name = tempfile.mkstemp(
+                dir=root, prefix=".upload-", suffix=".part"
+            )
+            self.temp_path = Path(temp_name)
+        else:
+            self.temp_path = root / f".upload-{uuid.uuid4().hex}.part"
+            fd = os.open(self.temp_path.name, _CREATE_FLAGS, 0o600, dir_fd=dir_fd)
+        self._file = os.fdopen(fd, "wb")
+        self.size = 0
+        self.media_type: str | None = None
+        self._head = b""
+        self._tail = b""
+        self._hasher = hashlib.sha256()
+
+    @property
+    def digest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def feed(self, chunk: bytes) -> str | None:
+        """Write one chunk; return a rejection reason as soon as one is known."""
+        self.size += len(chunk)
+        if self.size > MAX_BYTES:
+            return "too_big"
+
+        if self.media_type is None:
+            self._head += chunk
+            if len(self._head) >= len(PNG_MAGIC):
+                self.media_type = self._sniff_head()
+                if self.media_type is None:
+                    return "bad_type"
+                self._head = b""
+        self._tail = (self._tail + chunk)[-len(JPEG_EOI) :]
+        self._hasher.update(chunk)
+        self._file.write(chunk)
+        return None
+
+    def _sniff_head(self) -> str | None:
+        if self._head.startswith(PNG_MAGIC):
+            return "image/png"
+        if self._head.startswith(JPEG_SOI):
+            return "image/jpeg"
+        return None
+
+    def finish(self) -> str | None:
+        """Run the end-of-stream checks and close the temp file; return a reason."""
+        if self.media_type is None:
+            self.media_type = self._sniff_head()
+        if self.media_type == "image/jpeg" and self._tail != JPEG_EOI:
+            self.media_type = None
+        if self.media_type not in ALLOWED_TYPES:
+            self.abort()
+            return "bad_type"
+        self._file.close()
+        return None
+
+    def _fs_path(self, path: Path) -> str | Path:
+        return path if self.dir_fd is None else str(path.relative_to(self.root))
+
+    def link_to(self, target: Path) -> bool:
+        """Publish the temp file under ``target``; False if that name exists."""
+        try:
+            # link() refuses to replace an existing file, unlike rename().
+            os.link(
+                self._fs_path(self.temp_path),
+                self._fs_path(target),
+                src_dir_fd=self.dir_fd,
+                dst_dir_fd=self.dir_fd,
+                follow_symlinks=False,
+            )
+        except FileExistsError:
+            return False
+        finally:
+            self.abort()
+        return True
+
+    def commit(self) -> tuple[bool, str]:
+        """Finish validation and atomically move the temp file to a UUID name."""
+        reason = self.finish()
+        if reason is not None:
+            return False, reason
+
+        resolved_target, reason = _safe_target(self.root, self.media_type)
+        if resolved_target is None:
+            self.abort()
+            return False, reason
+
+        if not self.link_to(resolved_target):
+            return False, "collision"
+        return True, str(resolved_target)
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self._fs_path(self.temp_path), dir_fd=self.dir_fd)
+        except FileNotFoundError:
+            pass
+
+
+def secure_save_fileobj(
+    base_dir: str | Path,
+    filename_hint: str,
+    source: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[bool, str]:
+    """Streaming variant of ``secure_save`` for file-like sources."""
+    root, reason = _resolve_root(base_dir)
+    if root is None:
+        return False, reason
+
+    upload = StreamingUpload(root)
+    while chunk := source.read(chunk_size):
+        reason = upload.feed(chunk)
+        if reason is not None:
+            upload.abort()
+            return False, reason
+    return upload.commit()
+
+
+async def _run_inline(fn: Callable[..., T], *args: Any) -> T:
+    return fn(*args)
+
+
+def _open_upload(base_dir: str | Path) -> tuple[StreamingUpload | None, str]:
+    root, reason = _resolve_root(base_dir)
+    if root is None:
+        return None, reason
+    return StreamingUpload(root), ""
+
+
+async def _stream_into(
+    open_upload: Callable[[], tuple[StreamingUpload | None, str]],
+    chunks: AsyncIterable[bytes],
+    run_blocking: Callable[..., Awaitable[Any]],
+    commit: Callable[[StreamingUpload], tuple[bool, str]],
+) -> tuple[bool, str]:
+    upload, reason = await run_blocking(open_upload)
+    if upload is None:
+        return False, reason
+
+    try:
+        async for chunk in chunks:
+            reason = await run_blocking(upload.feed, chunk)
+            if reason is not None:
+                await run_blocking(upload.abort)
+                return False, reason
+    except BaseException:
+        upload.abort()
+        raise
+    return await run_blocking(commit, upload)
+
+
+async def secure_save_stream(
+    base_dir: str | Path,
+    filename_hint: str,
+    chunks: AsyncIterable[bytes],
+    run_blocking: Callable[..., Awaitable[Any]] = _run_inline,
+) -> tuple[bool, str]:
+    """Streaming variant of ``secure_save`` for async byte iterators.
+
+    ``run_blocking`` decides where filesystem calls execute, e.g. a worker pool,
+    so path resolution and disk writes never stall the event loop.
+    """
+    return await _stream_into(
+        partial(_open_upload, base_dir), chunks, run_blocking, StreamingUpload.commit
+    )
+
+
+class _PinnedRoot:
+    """Upload root resolved and validated once, then pinned by a directory fd."""
+
+    def __init__(self, base_dir: str | Path) -> None:
+        self.root, self.reason = _resolve_root(base_dir)
+        self.dir_fd: int | None = None
+        if self.root is not None:
+            self.dir_fd = os.open(
+                self.root, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC
+            )
+
+    def _open_upload(self) -> tuple[StreamingUpload | None, str]:
+        if self.dir_fd is None:
+            return None, self.reason
+        return StreamingUpload(self.root, self.dir_fd), ""
+
+    def close(self) -> None:
+        if self.dir_fd is not None:
+            os.close(self.dir_fd)
+            self.dir_fd = None
+
+
+class UploadStore(_PinnedRoot):
+    """Upload root resolved and validated once, then pinned by a directory fd.
+
+    ``secure_save`` re-resolves the base and re-checks every parent per file;
+    here new files are created with ``openat``-style calls relative to the fd
+    using ``O_EXCL | O_NOFOLLOW``, which gives the same guarantees for the
+    generated single-component names at a fraction of the syscalls. Swapping
+    the base directory for a symlink later has no effect on the pinned fd.
+    """
+
+    def save(self, filename_hint: str, data: bytes) -> tuple[bool, str]:
+        """Same contract as ``secure_save`` for the pinned root."""
+        if len(data) > MAX_BYTES:
+            return False, "too_big"
+
+        media_type = sniff_image_type(data)
+        if media_type not in ALLOWED_TYPES:
+            return False, "bad_type"
+        if self.dir_fd is None:
+            return False, self.reason
+
+        name = f"{uuid.uuid4()}{_EXTENSIONS[media_type]}"
+        try:
+            fd = os.open(name, _CREATE_FLAGS, 0o600, dir_fd=self.dir_fd)
+        except FileExistsError:
+            return False, "collision"
+        with os.fdopen(fd, "wb") as destination:
+            destination.write(data)
+        return True, str(self.root / name)
+
+    def commit(self, upload: StreamingUpload) -> tuple[bool, str]:
+        reason = upload.finish()
+        if reason is not None:
+            return False, reason
+
+        target = self.root / f"{uuid.uuid4()}{_EXTENSIONS[upload.media_type]}"
+        if not upload.link_to(target):
+            return False, "collision"
+        return True, str(target)
+
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        run_blocking: Callable[..., Awaitable[Any]] = _run_inline,
+    ) -> tuple[bool, str]:
+        """Streaming variant of ``save``, see ``secure_save_stream``."""
+        return await _stream_into(self._open_upload, chunks, run_blocking, self.commit)
+
+
+class ContentStore(_PinnedRoot):
+    """Deduplicating store: each distinct payload is kept once under its SHA-256.
+
+    Blobs live at ``<root>/<aa>/<bb>/<sha256><ext>`` next to a ``.refs`` file that
+    counts, per owner, how many uploads point at them. Content ids are plain
+    hashes anyone holding the bytes can compute, so ``delete`` only drops a
+    reference held by the caller's ``owner`` and removes the blob with the last
+    one. The refs file is ``flock``-ed, so concurrent workers and processes
+    agree on the counts. Like ``UploadStore`` the root is resolved once and
+    uploads are spooled relative to the pinned directory fd.
+    """
+
+    def _shard_dir(
+        self, root: Path, digest: str, create: bool
+    ) -> tuple[Path | None, str]:
+        shard = root
+        for part in (digest[:2], digest[2:4]):
+            shard = shard / part
+            if create:
+                shard.mkdir(exist_ok=True)
+            if shard.is_symlink():
+                return None, "symlink_parent"
+        if not shard.resolve().is_relative_to(root):
+            return None, "path_traversal"
+        return shard, ""
+
+    @contextmanager
+    def _locked_refs(self, refs_path: Path) -> Iterator[TextIO]:
+        """Hold an exclusive lock on the live refs file of one blob."""
+        while True:
+            fd = os.open(refs_path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+            refs = os.fdopen(fd, "r+")
+            fcntl.flock(refs, fcntl.LOCK_EX)
+            try:
+                current = os.stat(refs_path, follow_symlinks=False)
+            except FileNotFoundError:
+                current = None
+            # A concurrent delete may have unlinked the file we were waiting on.
+            if current is not None and os.path.samestat(current, os.fstat(fd)):
+                break
+            refs.close()
+        with refs:
+            yield refs
+
+    @staticmethod
+    def _read_refs(refs: TextIO) -> dict[str, int]:
+        owners = json.loads(refs.read() or "{}")
+        # Refs written before owners were tracked hold a bare count nobody owns.
+        return {"": owners} if isinstance(owners, int) else owners
+
+    @staticmethod
+    def _write_refs(refs: TextIO, owners: dict[str, int]) -> None:
+        refs.seek(0)
+        refs.truncate()
+        refs.write(json.dumps(owners))
+
+    def commit(self, upload: StreamingUpload, owner: str = "") -> tuple[bool, str]:
+        """Finish ``upload`` and return its content id, reusing an existing blob."""
+        reason = upload.finish()
+        if reason is not None:
+            return False, reason
+
+        digest = upload.digest
+        shard, reason = self._shard_dir(upload.root, digest, create=True)
+        if shard is None:
+            upload.abort()
+            return False, reason
+
+        content_id = f"{digest}{_EXTENSIONS[upload.media_type]}"
+        with self._locked_refs(shard / f"{digest}.refs") as refs:
+            # An existing blob already holds these exact bytes, so skip the link.
+            upload.link_to(shard / content_id)
+            owners = self._read_refs(refs)
+            owners[owner] = owners.get(owner, 0) + 1
+            self._write_refs(refs, owners)
+        return True, content_id
+
+    def delete(self, content_id: str, owner: str = "") -> bool:
+        """Drop one of ``owner``'s references to ``content_id``; False if it has none."""
+        match = CONTENT_ID_PATTERN.match(content_id)
+        if match is None or self.root is None:
+            return False
+        shard, _reason = self._shard_dir(self.root, match["digest"], create=False)
+        if shard is None or not shard.is_dir():
+            return False
+
+        blob = shard / content_id
+        refs_path = shard / f"{match['digest']}.refs"
+        if not refs_path.is_file():
+            return False
+        with self._locked_refs(refs_path) as refs:
+            owners = self._read_refs(refs)
+            if owners.get(owner, 0) < 1 or not blob.is_file():
+                if not owners:
+                    refs_path.unlink()
+                return False
+            owners[owner] -= 1
+            if owners[owner] == 0:
+                del owners[owner]
+            if owners:
+                self._write_refs(refs, owners)
+                return True
+            refs_path.unlink()
+            blob.unlink()
+        return True
+
+    def path_for(self, content_id: str) -> Path | None:
+        match = CONTENT_ID_PATTERN.match(content_id)
+        if match is None or self.root is None:
+            return None
+        digest = match["digest"]
+        return self.root / digest[:2] / digest[2:4] / content_id
+
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        run_blocking: Callable[..., Awaitable[Any]] = _run_inline,
+        owner: str = "",
+    ) -> tuple[bool, str]:
+        """Hash the payload while it streams in and store it once for ``owner``."""
+        return await _stream_into(
+            self._open_upload,
+            chunks,
+            run_blocking,
+            partial(self.commit, owner=owner),
+        )
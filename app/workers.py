@@ -0,0 +1,85 @@
+"""Bounded thread pool for blocking filesystem work."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class PoolSaturated(Exception):
+    """Raised when a job is offered to a pool that is already at capacity."""
+
+
+class BoundedExecutor:
+    """Thread pool that admits at most ``max_workers + max_queue`` jobs at once.
+
+    Every ``run`` call is admitted on its own, so saturation is detected up
+    front instead of letting the executor queue grow without bound, and a caller
+    that is idle between jobs (a slow upload body) holds no capacity meanwhile.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "worker") -> None:
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    @contextmanager
+    def admit(self) -> Iterator[BoundedExecutor]:
+        with self._lock:
+            if self.admitted >= self.capacity:
+                self.rejected += 1
+                raise PoolSaturated()
+            self.admitted += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.admitted -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn`` on the pool; raise ``PoolSaturated`` if it is at capacity."""
+        with self.admit():
+            return await self._submit(fn, *args)
+
+    async def _submit(self, fn: Callable[..., T], *args: Any) -> T:
+        state = {"started": False, "cancelled": False}
+
+        def job() -> T:
+            with self._lock:
+                if state["cancelled"]:
+                    raise asyncio.CancelledError()
+                state["started"] = True
+                self.queued -= 1
+            return fn(*args)
+
+        with self._lock:
+            self.queued += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            with self._lock:
+                if not state["started"]:
+                    state["cancelled"] = True
+                    self.queued -= 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "capacity": self.capacity,
+                "in_flight": self.admitted,
+                "queued": self.queued,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,234 @@
+"""Group commit for item writes: one writer task, one transaction per micro-batch.
+
+Handlers ``submit`` a sync ``fn(session, *args)`` that writes without committing.
+The writer runs a batch of them in one transaction and commits once, so many
+writes share one fsync; each caller gets its own result (or exception) only
+after that commit. A full queue makes ``submit`` wait, so writers are
+throttled by queue depth rather than by commit latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, Callable, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.db import SessionRunner, write_session_runner
+from app.errors import ApiError
+from app.metrics import QueryStats, current_query_stats
+
+WRITE_QUEUE_ENV = "ITEM_WRITE_QUEUE"
+WRITE_BATCH_SIZE_ENV = "ITEM_WRITE_BATCH_SIZE"
+WRITE_BATCH_WINDOW_ENV = "ITEM_WRITE_BATCH_WINDOW_MS"
+WRITE_QUEUE_DEPTH_ENV = "ITEM_WRITE_QUEUE_DEPTH"
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_BATCH_WINDOW_MS = 2.0
+DEFAULT_QUEUE_DEPTH = 1024
+
+T = TypeVar("T")
+RunnerFactory = Callable[[], AsyncContextManager[SessionRunner]]
+
+
+@dataclass(slots=True)
+class _Write:
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    future: asyncio.Future[Any]
+    # The submitting request's counters; SQL run for this write is charged there.
+    query_stats: QueryStats | None = None
+
+
+# (succeeded, result or exception) per write, in submission order.
+Outcome = tuple[bool, Any]
+
+
+def _call(session: Session, write: _Write) -> Any:
+    token = current_query_stats.set(write.query_stats)
+    try:
+        return write.fn(session, *write.args)
+    finally:
+        current_query_stats.reset(token)
+
+
+def _run_one(session: Session, write: _Write) -> Outcome:
+    try:
+        result = _call(session, write)
+        session.commit()
+        return True, result
+    except Exception as exc:
+        session.rollback()
+        return False, exc
+
+
+def _apply_batch(session: Session, writes: list[_Write]) -> list[Outcome]:
+    """Run ``writes`` in one transaction; fall back to one transaction each.
+
+    An ``ApiError`` that leaves the session usable was raised before the write
+    touched anything (404, If-Match, validation), so it only fails its caller.
+    Anything else may have left partial rows behind: the batch is rolled back
+    and every write is retried on its own, keeping the others unaffected.
+    """
+    outcomes: list[Outcome] = []
+    for write in writes:
+        try:
+            outcomes.append((True, _call(session, write)))
+        except ApiError as exc:
+            if not session.is_active:
+                break
+            outcomes.append((False, exc))
+        except Exception:
+            break
+    else:
+        try:
+            session.commit()
+            return outcomes
+        except Exception:
+            pass
+    session.rollback()
+    return [_run_one(session, write) for write in writes]
+
+
+class GroupCommitQueue:
+    """Bounded queue drained by a single writer task in micro-batches.
+
+    A batch closes when it holds ``batch_size`` writes or ``window_seconds``
+    after its first write arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        runner_factory: RunnerFactory = write_session_runner,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        window_seconds: float = DEFAULT_BATCH_WINDOW_MS / 1000,
+        max_depth: int = DEFAULT_QUEUE_DEPTH,
+    ) -> None:
+        if batch_size < 1 or max_depth < 1:
+            raise ValueError("batch size and queue depth must be positive")
+        self.runner_factory = runner_factory
+        self.batch_size = batch_size
+        self.window_seconds = window_seconds
+        self.max_depth = max_depth
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[_Write] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+        self.largest_batch = 0
+
+    async def submit(self, fn: Callable[..., T], *args: Any) -> T:
+        """Queue ``fn(session, *args)`` and return its result once committed."""
+        queue = self._ensure_writer()
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        await queue.put(_Write(fn, args, future, current_query_stats.get()))
+        return await future
+
+    def _ensure_writer(self) -> asyncio.Queue[_Write]:
+        loop = asyncio.get_running_loop()
+        # The queue and task belong to one event loop; a new loop (a fresh test
+        # client, a restarted server) gets a writer of its own.
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(self.max_depth)
+            # A clean context: the writer must not keep the first submitter's
+            # request-scoped variables (query counters) for every later batch.
+            self._task = loop.create_task(
+                self._run(self._queue), context=contextvars.Context()
+            )
+        assert self._queue is not None
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue[_Write]) -> None:
+        while True:
+            batch = [await queue.get()]
+            self._drain(queue, batch)
+            if len(batch) < self.batch_size and self.window_seconds > 0:
+                await asyncio.sleep(self.window_seconds)
+                self._drain(queue, batch)
+            await self._commit(batch)
+            for _ in batch:
+                queue.task_done()
+
+    def _drain(self, queue: asyncio.Queue[_Write], batch: list[_Write]) -> None:
+        while len(batch) < self.batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+
+    async def _commit(self, batch: list[_Write]) -> None:
+        try:
+            async with self.runner_factory() as runner:
+                outcomes = await runner.run(_apply_batch, batch)
+        except Exception as exc:
+            outcomes = [(False, exc)] * len(batch)
+        with self._lock:
+            self.batches += 1
+            self.writes += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+        for write, (succeeded, value) in zip(batch, outcomes):
+            # A caller that went away (client disconnect) no longer awaits it.
+            if write.future.done():
+                continue
+            if succeeded:
+                write.future.set_result(value)
+            else:
+                write.future.set_exception(value)
+
+    async def close(self) -> None:
+        """Wait until every queued write is committed, then stop the writer."""
+        task, queue, loop = self._task, self._queue, self._loop
+        self._task = self._queue = self._loop = None
+        if task is None or queue is None or loop is not asyncio.get_running_loop():
+            return
+        if not task.done():
+            await queue.join()
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "batch_size": self.batch_size,
+                "window_ms": self.window_seconds * 1000,
+                "max_depth": self.max_depth,
+                "depth": self._queue.qsize() if self._queue is not None else 0,
+                "batches": self.batches,
+                "writes": self.writes,
+                "largest_batch": self.largest_batch,
+            }
+
+
+_write_queue: GroupCommitQueue | None = None
+_configured = False
+
+
+def _build_write_queue() -> GroupCommitQueue | None:
+    if os.getenv(WRITE_QUEUE_ENV, "").lower() not in {"1", "true", "yes", "on"}:
+        return None
+    return GroupCommitQueue(
+        batch_size=int(os.getenv(WRITE_BATCH_SIZE_ENV, DEFAULT_BATCH_SIZE)),
+        window_seconds=float(os.getenv(WRITE_BATCH_WINDOW_ENV, DEFAULT_BATCH_WINDOW_MS))
+        / 1000,
+        max_depth=int(os.getenv(WRITE_QUEUE_DEPTH_ENV, DEFAULT_QUEUE_DEPTH)),
+    )
+
+
+def get_write_queue() -> GroupCommitQueue | None:
+    """Return the group-commit queue, or ``None`` when ``ITEM_WRITE_QUEUE`` is off."""
+    global _write_queue, _configured
+    if not _configured:
+        _write_queue = _build_write_queue()
+        _configured = True
+    return _write_queue
+
+
+def set_write_queue(queue: GroupCommitQueue | None) -> None:
+    global _write_queue, _configured
+    _write_queue = queue
+    _configured = True
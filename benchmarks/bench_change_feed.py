@@ -0,0 +1,108 @@
+"""Dashboard polling cost versus the change feed, plus broadcaster fan-out cost.
+
+Seeds ``--rows`` items, then times the poll a dashboard used to make
+(``GET /items?limit=200``) against an idle ``GET /items/changes?since=<head>``.
+The fan-out figure is ``ChangeBroadcaster.publish`` with ``--subscribers``
+readers, of which a tenth never read, so the bounded buffers are exercised.
+
+Usage: python -m benchmarks.bench_change_feed [--rows 100000] [--subscribers 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.bench_items_load import _percentile, _seed
+
+
+async def _poll_ms(path: str, requests: int) -> dict[str, float]:
+    from app.main import app
+    from app.ratelimit import set_rate_limiter
+
+    set_rate_limiter(None)
+    latencies = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+    latencies.sort()
+    return {
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+    }
+
+
+async def _fanout(subscribers: int, events: int) -> dict[str, Any]:
+    from app.changes import ChangeBroadcaster
+
+    broadcaster = ChangeBroadcaster()
+    readers = [broadcaster.subscribe() for _ in range(subscribers)]
+    stalled = set(readers[: subscribers // 10])
+
+    async def read(subscription: Any) -> None:
+        while await subscription.get() is not None:
+            pass
+
+    tasks = [asyncio.create_task(read(sub)) for sub in readers if sub not in stalled]
+    publishing = 0.0
+    started = time.perf_counter()
+    for seq in range(1, events + 1):
+        publish_started = time.perf_counter()
+        broadcaster.publish({"seq": seq, "item_id": seq, "action": "update"})
+        publishing += time.perf_counter() - publish_started
+        # Let every reader drain its queue before the next event.
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    return {
+        "publish_us_per_event": round(publishing / events * 1e6, 3),
+        "publish_and_deliver_us_per_event": round(elapsed / events * 1e6, 3),
+        "subscribers_left": len(broadcaster),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-changes-") as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        _seed(args.rows)
+        from app.db import SessionLocal
+        from app.models import ItemChange
+
+        with SessionLocal() as session:
+            change = ItemChange(item_id=1, action="update", version=2)
+            session.add(change)
+            session.commit()
+            head = change.seq
+        results = {
+            "poll_list_items": asyncio.run(_poll_ms("/items?limit=200", args.requests)),
+            "poll_changes_idle": asyncio.run(
+                _poll_ms(f"/items/changes?since={head}", args.requests)
+            ),
+            "fanout": asyncio.run(_fanout(args.subscribers, args.events)),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
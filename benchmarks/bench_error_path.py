@@ -0,0 +1,130 @@
+"""4xx throughput of the problem+json handlers: previous path versus fast path.
+
+``legacy`` reproduces the handlers as they were before the fast path: a fresh
+``uuid4()`` and ``JSONResponse`` per error and ``jsonable_encoder`` plus a
+recursive scrub over every validation error. ``end_to_end`` drives the app
+in-process for a feel of what the handler share is worth per request.
+
+Usage: python -m benchmarks.bench_error_path [--errors 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable
+from uuid import uuid4
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from starlette.requests import Request
+
+from app.errors import (
+    PROBLEM_BASE_URI,
+    ApiError,
+    _scrub_sensitive_data,
+    api_error_handler,
+    problem_details,
+    validation_exception_handler,
+)
+from app.schemas import ItemBatchCreateRequest
+
+
+def _legacy_problem(status: int, title: str, detail: str, type_: str, extras=None):
+    correlation_id = str(uuid4())
+    payload = problem_details(status, title, detail, type_)
+    payload["correlation_id"] = correlation_id
+    if extras:
+        payload.update(extras)
+    response = JSONResponse(
+        payload, status_code=status, media_type="application/problem+json"
+    )
+    response.headers.setdefault("X-Correlation-ID", correlation_id)
+    return response
+
+
+async def _legacy_api_error(request: Request, exc: ApiError):
+    return _legacy_problem(
+        exc.status, exc.title, exc.detail, f"{PROBLEM_BASE_URI}{exc.code}"
+    )
+
+
+async def _legacy_validation(request: Request, exc: RequestValidationError):
+    errors = exc.errors()
+    encoded = _scrub_sensitive_data(jsonable_encoder(errors))
+    return _legacy_problem(
+        422,
+        "Validation Error",
+        errors[0]["msg"],
+        f"{PROBLEM_BASE_URI}validation_error",
+        {"errors": encoded},
+    )
+
+
+def _validation_error() -> RequestValidationError:
+    payload = {"items": [{"name": "", "status": "bogus"}] * 5}
+    try:
+        ItemBatchCreateRequest.model_validate(payload)
+    except ValidationError as exc:
+        return RequestValidationError(exc.errors())
+    raise AssertionError("payload unexpectedly valid")
+
+
+async def _per_second(handler: Callable[..., Any], exc: Exception, count: int) -> float:
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    started = time.perf_counter()
+    for _ in range(count):
+        await handler(request, exc)
+    return round(count / (time.perf_counter() - started), 1)
+
+
+async def _end_to_end(count: int) -> dict[str, float]:
+    from app.main import app
+    from app.ratelimit import set_rate_limiter
+
+    set_rate_limiter(None)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        requests = {
+            "not_authorized": lambda: client.post("/items", json={"name": "x"}),
+            "validation_error": lambda: client.post(
+                "/items", json={"name": ""}, headers={"X-API-Key": "wrong"}
+            ),
+        }
+        for label, send in requests.items():
+            started = time.perf_counter()
+            for _ in range(count):
+                await send()
+            results[label] = round(count / (time.perf_counter() - started), 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--errors", type=int, default=20_000)
+    args = parser.parse_args()
+
+    not_found = ApiError(code="not_found", detail="item not found", status=404)
+    invalid = _validation_error()
+    results: dict[str, Any] = {"handler_errors_per_sec": {}}
+    for label, legacy, current, exc in (
+        ("not_found", _legacy_api_error, api_error_handler, not_found),
+        ("validation_error", _legacy_validation, validation_exception_handler, invalid),
+    ):
+        results["handler_errors_per_sec"][label] = {
+            "legacy": asyncio.run(_per_second(legacy, exc, args.errors)),
+            "fast": asyncio.run(_per_second(current, exc, args.errors)),
+        }
+    results["end_to_end_errors_per_sec"] = asyncio.run(_end_to_end(args.errors // 10))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
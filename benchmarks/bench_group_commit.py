@@ -0,0 +1,108 @@
+"""Item creation throughput: one commit per request versus group commit.
+
+Drives ``--requests`` ``POST /items`` calls with ``--concurrency`` clients in
+process, first with a commit per request and then through the write queue
+(``ITEM_WRITE_QUEUE``) for every ``--window-ms`` value. ``--synchronous`` sets
+the SQLite pragma for the run; with ``FULL`` every commit waits for an fsync,
+which is the cost group commit spreads over a batch.
+
+Usage: python -m benchmarks.bench_group_commit [--concurrency 64]
+    [--window-ms 0 2 5] [--synchronous FULL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.bench_items_load import API_TOKEN, _percentile
+
+
+async def _drive(requests: int, concurrency: int) -> dict[str, Any]:
+    from app.main import app
+
+    latencies: list[float] = []
+    remaining = requests
+    headers = {"X-API-Key": API_TOKEN}
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                response = await client.post(
+                    "/items", json={"name": "bench"}, headers=headers
+                )
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 201, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "creates_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+    }
+
+
+async def _grouped(requests: int, concurrency: int, window_ms: float) -> dict[str, Any]:
+    from app.writequeue import GroupCommitQueue, set_write_queue
+
+    queue = GroupCommitQueue(window_seconds=window_ms / 1000)
+    set_write_queue(queue)
+    try:
+        result = await _drive(requests, concurrency)
+        await queue.close()
+    finally:
+        set_write_queue(None)
+    stats = queue.stats()
+    return {**result, "avg_batch": round(stats["writes"] / stats["batches"], 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, nargs="+", default=[0, 2, 5])
+    parser.add_argument("--synchronous", default="FULL")
+    args = parser.parse_args()
+
+    os.environ["APP_API_TOKEN"] = API_TOKEN
+    os.environ["SQLITE_SYNCHRONOUS"] = args.synchronous
+    with tempfile.TemporaryDirectory(prefix="bench-group-commit-") as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        import app.main  # noqa: F401  registers the models on Base.metadata
+        from app.db import init_db, reset_database
+        from app.ratelimit import set_rate_limiter
+        from app.writequeue import set_write_queue
+
+        set_rate_limiter(None)
+        set_write_queue(None)
+        reset_database()
+        init_db()
+        results = {
+            "commit_per_request": asyncio.run(_drive(args.requests, args.concurrency))
+        }
+        for window in args.window_ms:
+            results[f"group_commit_{window:g}ms"] = asyncio.run(
+                _grouped(args.requests, args.concurrency, window)
+            )
+    print(json.dumps({"synchronous": args.synchronous, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
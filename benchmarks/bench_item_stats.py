@@ -0,0 +1,102 @@
+"""Per-status counts: summary table versus counting on every request.
+
+Seeds ``--rows`` items and times ``GET /items/stats`` against the two ways the
+counts could be had before: a ``GROUP BY status`` over ``items`` and walking
+every ``GET /items`` page as the UI did. The last is only run up to
+``--client-side-max-rows`` rows.
+
+Usage: python -m benchmarks.bench_item_stats [--rows 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from benchmarks.bench_items_load import _percentile, _seed
+
+
+async def _timed(call: Callable[[], Awaitable[Any]], repeats: int) -> dict[str, float]:
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+    }
+
+
+async def _measure(rows: int, repeats: int, client_side_max: int) -> dict[str, Any]:
+    from starlette.concurrency import run_in_threadpool
+
+    from app.db import SessionLocal
+    from app.main import app
+    from app.ratelimit import set_rate_limiter
+    from app.stats import count_items_by_status
+
+    set_rate_limiter(None)
+
+    def group_by() -> dict[str, int]:
+        with SessionLocal() as session:
+            return count_items_by_status(session)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def walk_pages() -> None:
+            params: dict[str, Any] = {"limit": 200}
+            while True:
+                response = await client.get("/items", params=params)
+                cursor = response.headers.get("X-Next-Cursor")
+                if cursor is None:
+                    return
+                params["cursor"] = cursor
+
+        results = {
+            "stats_endpoint": await _timed(lambda: client.get("/items/stats"), repeats),
+            "group_by_query": await _timed(
+                lambda: run_in_threadpool(group_by), repeats
+            ),
+        }
+        if rows <= client_side_max:
+            results["client_side_listing"] = await _timed(walk_pages, 3)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--client-side-max-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-stats-") as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        _seed(args.rows)
+        from app.db import SessionLocal
+        from app.stats import rebuild_status_counts
+
+        # The seed bulk-inserts past the write handlers, so fill the summary here.
+        with SessionLocal() as session:
+            rebuild_status_counts(session)
+            session.commit()
+        results = asyncio.run(
+            _measure(args.rows, args.repeats, args.client_side_max_rows)
+        )
+    print(json.dumps({"rows": args.rows, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Latency and throughput of the items API as the table grows.
+
+Seeds a throwaway SQLite database with each ``--rows`` size, then drives every
+scenario with ``--concurrency`` parallel clients, either in-process through
+``httpx.ASGITransport`` or over HTTP against a ``uvicorn`` subprocess. Prints
+p50/p95/p99 latency (ms) and requests/sec per scenario as JSON.
+
+With ``--baseline`` the run is compared to a stored result and the exit status
+is 1 when a scenario's p95 grows or its throughput drops beyond ``--tolerance``;
+``--update-baseline`` rewrites that file from the current run instead.
+
+Usage: python -m benchmarks.bench_items_load [--rows 1000 100000 1000000]
+    [--mode inproc uvicorn] [--requests 500] [--concurrency 16]
+    [--baseline benchmarks/baseline_items_load.json] [--tolerance 0.3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+API_TOKEN = "bench-token"
+SEED_BATCH = 10_000
+STATUSES = ("draft", "in_progress", "done")
+
+# name -> (method, path builder, expected status); paths get the seeded row count.
+SCENARIOS: dict[str, tuple[str, Callable[[int], str], int]] = {
+    "list_items": ("GET", lambda rows: "/items?limit=50", 200),
+    "list_items_by_status": ("GET", lambda rows: "/items?status=done&limit=50", 200),
+    "list_items_deep_page": (
+        "GET",
+        lambda rows: f"/items?after_id={max(rows - 100, 0)}&limit=50",
+        200,
+    ),
+    "get_item": ("GET", lambda rows: f"/items/{random.randint(1, rows)}", 200),
+    "auth_rejected": ("POST", lambda rows: "/items", 401),
+    "create_item": ("POST", lambda rows: "/items", 201),
+}
+
+
+def _seed(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db import get_engine, init_db, reset_database
+    from app.models import Item
+
+    reset_database()
+    init_db()
+    with get_engine().begin() as connection:
+        for start in range(0, rows, SEED_BATCH):
+            connection.execute(
+                insert(Item),
+                [
+                    {"name": f"item {n}", "status": STATUSES[n % len(STATUSES)]}
+                    for n in range(start, min(start + SEED_BATCH, rows))
+                ],
+            )
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return round(ordered[index] * 1000, 3)
+
+
+async def _drive(
+    client: httpx.AsyncClient, scenario: str, rows: int, requests: int, concurrency: int
+) -> dict[str, Any]:
+    method, build_path, expected = SCENARIOS[scenario]
+    headers = {"X-API-Key": "wrong" if scenario == "auth_rejected" else API_TOKEN}
+    body = {"name": "load test"} if method == "POST" else None
+    tickets = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while next(tickets) < requests:
+            started = time.perf_counter()
+            response = await client.request(
+                method, build_path(rows), json=body, headers=headers
+            )
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != expected:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "rps": round(len(latencies) / elapsed, 1),
+        "errors": errors,
+    }
+
+
+async def _run_scenarios(
+    client: httpx.AsyncClient, rows: int, requests: int, concurrency: int
+) -> dict[str, Any]:
+    # Reads first, so create_item does not change what they measure.
+    return {
+        scenario: await _drive(client, scenario, rows, requests, concurrency)
+        for scenario in SCENARIOS
+    }
+
+
+async def _run_inproc(rows: int, requests: int, concurrency: int) -> dict[str, Any]:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        return await _run_scenarios(client, rows, requests, concurrency)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _run_uvicorn(rows: int, requests: int, concurrency: int) -> dict[str, Any]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits
+        ) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    await client.get("/health")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or server.poll() is not None:
+                        raise RuntimeError("uvicorn did not start") from None
+                    await asyncio.sleep(0.1)
+            return await _run_scenarios(client, rows, requests, concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    regressions = []
+    for mode, sizes in results.items():
+        for rows, scenarios in sizes.items():
+            for scenario, current in scenarios.items():
+                reference = baseline.get(mode, {}).get(rows, {}).get(scenario)
+                if reference is None:
+                    continue
+                label = f"{mode}/{rows}/{scenario}"
+                if current["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+                    regressions.append(
+                        f"{label}: p95 {current['p95_ms']}ms > {reference['p95_ms']}ms"
+                    )
+                if current["rps"] < reference["rps"] * (1 - tolerance):
+                    regressions.append(
+                        f"{label}: {current['rps']} rps < {reference['rps']} rps"
+                    )
+                if current["errors"] > reference["errors"]:
+                    regressions.append(f"{label}: {current['errors']} errors")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000])
+    parser.add_argument(
+        "--mode", nargs="+", choices=("inproc", "uvicorn"), default=["inproc"]
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    runners = {"inproc": _run_inproc, "uvicorn": _run_uvicorn}
+    results: dict[str, Any] = {mode: {} for mode in args.mode}
+    with tempfile.TemporaryDirectory(prefix="bench-items-") as directory:
+        # The app reads its configuration at import time, so set it up first.
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        os.environ["APP_API_TOKEN"] = API_TOKEN
+        os.environ.setdefault("CACHE_BACKEND", "none")
+        # Every request comes from one client; the rate limiter would turn the
+        # run into a measurement of 429s.
+        os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+        for rows in args.rows:
+            for mode in args.mode:
+                _seed(rows)
+                results[mode][str(rows)] = asyncio.run(
+                    runners[mode](rows, args.requests, args.concurrency)
+                )
+
+    report: dict[str, Any] = {
+        "config": {"requests": args.requests, "concurrency": args.concurrency},
+        "results": results,
+    }
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+    elif args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        report["regressions"] = _compare(results, baseline, args.tolerance)
+    print(json.dumps(report, indent=2))
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
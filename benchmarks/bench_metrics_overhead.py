@@ -0,0 +1,98 @@
+"""Per-request cost of ``MetricsMiddleware`` and the per-query engine hooks.
+
+The middleware wraps a bare ASGI app that answers immediately, so the delta is
+the instrumentation alone. Exits with status 1 when the middleware costs more
+than ``--budget-us`` microseconds per request.
+
+Usage: python -m benchmarks.bench_metrics_overhead [--requests 100000] [--budget-us 25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.db import _install_query_metrics
+from app.metrics import MetricsMiddleware, QueryStats, current_query_stats
+
+
+class _Route:
+    path = "/bench/{item_id}"
+
+
+async def _endpoint(scope: dict, receive: Any, send: Any) -> None:
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    return None
+
+
+async def _per_request_us(app: Any, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/bench/1"}
+        await app(scope, _receive, _send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def _per_query_us(instrumented: bool, queries: int) -> float:
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    if instrumented:
+        _install_query_metrics(engine)
+    token = current_query_stats.set(QueryStats())
+    try:
+        with engine.connect() as connection:
+            for _ in range(1000):  # warm the compiled-statement cache
+                connection.execute(text("SELECT 1"))
+            started = time.perf_counter()
+            for _ in range(queries):
+                connection.execute(text("SELECT 1"))
+            return (time.perf_counter() - started) / queries * 1e6
+    finally:
+        current_query_stats.reset(token)
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50_000)
+    parser.add_argument("--budget-us", type=float, default=25.0)
+    args = parser.parse_args()
+
+    bare = asyncio.run(_per_request_us(_endpoint, args.requests))
+    metered = asyncio.run(_per_request_us(MetricsMiddleware(_endpoint), args.requests))
+    plain_query = _per_query_us(False, args.queries)
+    timed_query = _per_query_us(True, args.queries)
+
+    overhead = metered - bare
+    print(
+        json.dumps(
+            {
+                "middleware_overhead_us": round(overhead, 3),
+                "query_hook_overhead_us": round(timed_query - plain_query, 3),
+                "budget_us": args.budget_us,
+            },
+            indent=2,
+        )
+    )
+    if overhead > args.budget_us:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""NFR-S05 load test: 429s beyond 60 requests/min and the latency they add.
+
+One client hammers ``GET /items`` in-process, first with the limiter disabled
+and then with the default 60/min limit. The run fails (exit status 1) unless
+at least 95% of the requests beyond the limit are rejected, the p95 of those
+429s stays within ``--budget-ms`` and admitted requests get no more than that
+added to their p95. The per-hit cost of the memory backend with ``--keys``
+live clients is reported as well.
+
+Usage: python -m benchmarks.bench_rate_limit [--requests 2000] [--concurrency 16]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.bench_items_load import _percentile, _seed
+
+
+async def _hammer(requests: int, concurrency: int) -> dict[str, Any]:
+    from app.main import app
+
+    latencies: dict[int, list[float]] = {}
+    remaining = iter(range(requests))
+    transport = httpx.ASGITransport(app=app, client=("203.0.113.7", 40000))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker() -> None:
+            for _ in remaining:
+                started = time.perf_counter()
+                response = await client.get("/items?limit=50")
+                elapsed = time.perf_counter() - started
+                latencies.setdefault(response.status_code, []).append(elapsed)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return {
+        status: {"count": len(values), "p95_ms": _percentile(sorted(values), 0.95)}
+        for status, values in latencies.items()
+    }
+
+
+async def _hit_us(keys: int, hits: int) -> float:
+    from app.ratelimit import MemoryRateLimiter
+
+    limiter = MemoryRateLimiter(max_keys=keys)
+    for key in range(keys):
+        await limiter.hit(f"ip:{key}")
+    started = time.perf_counter()
+    for n in range(hits):
+        await limiter.hit(f"ip:{n % (keys * 2)}")
+    return (time.perf_counter() - started) / hits * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-rate-") as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        _seed(1000)
+
+        from app.ratelimit import (
+            DEFAULT_PER_MINUTE,
+            MemoryRateLimiter,
+            set_rate_limiter,
+        )
+
+        set_rate_limiter(None)
+        unlimited = asyncio.run(_hammer(args.requests, args.concurrency))
+        set_rate_limiter(MemoryRateLimiter(DEFAULT_PER_MINUTE))
+        limited = asyncio.run(_hammer(args.requests, args.concurrency))
+
+    rejected = limited.get(429, {"count": 0, "p95_ms": 0.0})
+    over_limit = max(args.requests - DEFAULT_PER_MINUTE, 1)
+    rejected_share = rejected["count"] / over_limit
+    added_ms = round(limited[200]["p95_ms"] - unlimited[200]["p95_ms"], 3)
+    report = {
+        "requests": args.requests,
+        "rejected_share_over_limit": round(rejected_share, 4),
+        "p95_ms_rejected": rejected["p95_ms"],
+        "p95_ms_admitted_unlimited": unlimited[200]["p95_ms"],
+        "p95_ms_admitted_limited": limited[200]["p95_ms"],
+        "p95_added_ms": added_ms,
+        "memory_hit_us": round(asyncio.run(_hit_us(args.keys, 200_000)), 3),
+    }
+    print(json.dumps(report, indent=2))
+    if (
+        rejected_share < 0.95
+        or rejected["p95_ms"] > args.budget_ms
+        or added_ms > args.budget_ms
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
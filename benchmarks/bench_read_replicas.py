@@ -0,0 +1,140 @@
+"""Read routing over SQLite file copies standing in for replicas.
+
+Seeds ``--rows`` items, copies the database once per replica and drives
+``GET /items/{id}`` with ``--concurrency`` clients while one client keeps
+creating items on the primary, for each ``--replicas`` count (0 = primary
+only). The copies share this machine's CPU and disk, so the figures show the
+routing overhead and how reads leave the primary, not a real cluster's
+scaling. ``route_us`` is one ``pick`` plus sticky check with ``--sticky-clients``
+writers remembered.
+
+Usage: python -m benchmarks.bench_read_replicas [--rows 100000] [--replicas 0 1 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.bench_items_load import API_TOKEN, _percentile, _seed
+
+
+async def _drive(rows: int, requests: int, concurrency: int) -> dict[str, Any]:
+    from app.main import app
+
+    latencies: list[float] = []
+    remaining = requests
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def reader() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                response = await client.get(f"/items/{random.randint(1, rows)}")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        async def writer() -> int:
+            # A separate transport gives the writer its own client IP, so its
+            # stickiness does not pull the readers onto the primary.
+            writes = 0
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app, client=("10.0.0.2", 1)),
+                base_url="http://bench",
+            ) as own:
+                while not done.is_set():
+                    response = await own.post(
+                        "/items",
+                        json={"name": "write"},
+                        headers={"X-API-Key": API_TOKEN},
+                    )
+                    assert response.status_code == 201, response.text
+                    writes += 1
+            return writes
+
+        writing = asyncio.create_task(writer())
+        started = time.perf_counter()
+        await asyncio.gather(*(reader() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        writes = await writing
+
+    latencies.sort()
+    return {
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+        "reads_per_s": round(len(latencies) / elapsed, 1),
+        "writes_per_s": round(writes / elapsed, 1),
+    }
+
+
+def _route_us(sticky_clients: int, lookups: int) -> float:
+    from app.db import ReadRouter, Replica
+
+    router = ReadRouter(
+        [Replica(f"replica{n}", "sqlite://") for n in range(2)],
+        max_sticky_clients=sticky_clients,
+    )
+    router.mark_write(*(f"ip:10.{n}" for n in range(sticky_clients)))
+    started = time.perf_counter()
+    for n in range(lookups):
+        if not router.is_sticky(f"ip:192.{n % 1000}"):
+            router.pick()
+    return round((time.perf_counter() - started) / lookups * 1e6, 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--replicas", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sticky-clients", type=int, default=10_000)
+    args = parser.parse_args()
+
+    os.environ["APP_API_TOKEN"] = API_TOKEN
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="bench-replicas-") as directory:
+        primary = Path(directory) / "primary.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{primary}"
+        _seed(args.rows)
+        from app.db import ReadRouter, Replica, set_read_router
+        from app.ratelimit import set_rate_limiter
+
+        set_rate_limiter(None)
+        with sqlite3.connect(primary) as connection:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        copies = []
+        for n in range(max(args.replicas)):
+            copy = Path(directory) / f"replica{n}.db"
+            shutil.copyfile(primary, copy)
+            copies.append(Replica(f"replica{n}", f"sqlite:///{copy}"))
+
+        for count in args.replicas:
+            set_read_router(ReadRouter(copies[:count]) if count else None)
+            results[f"replicas_{count}"] = asyncio.run(
+                _drive(args.rows, args.requests, args.concurrency)
+            )
+        set_read_router(None)
+    results["route_us"] = _route_us(args.sticky_clients, 200_000)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
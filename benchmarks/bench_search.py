@@ -0,0 +1,132 @@
+"""Latency of ``GET /items/search`` against a large items table.
+
+Seeds a throwaway SQLite database with ``--rows`` items whose words follow a
+Zipf distribution over a 50k-word vocabulary (``w1`` is the most frequent).
+Each query is sent ``--requests`` times in-process and p50/p95 latency (ms) is
+printed as JSON; the exit status is 1 when a p95 exceeds ``--budget-ms``.
+
+``stopword`` is reported but not gated: a term found in most rows costs time
+proportional to its row count, because bm25 counts the rows holding each term
+on every query. The candidate cap bounds everything else.
+
+Usage: python -m benchmarks.bench_search [--rows 1000000] [--requests 200]
+    [--budget-ms 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.bench_items_load import SEED_BATCH, _percentile
+
+VOCABULARY_SIZE = 50_000
+WORDS = [f"w{rank}" for rank in range(1, VOCABULARY_SIZE + 1)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+
+QUERIES = {
+    "rare_term": "w20000",
+    "typical_term": "w500",
+    "frequent_term": "w20",
+    "two_terms": "w50 w300",
+    "frequent_term_deep_page": "w20",
+    "stopword": "w1",
+}
+UNGATED = {"stopword"}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, cum_weights=CUM_WEIGHTS, k=words))
+
+
+def _seed(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.db import get_engine, init_db, reset_database
+    from app.models import Item
+
+    rng = random.Random(0)
+    reset_database()
+    init_db()
+    with get_engine().begin() as connection:
+        for start in range(0, rows, SEED_BATCH):
+            connection.execute(
+                insert(Item),
+                [
+                    {"name": _text(rng, 3), "description": _text(rng, 12)}
+                    for _ in range(start, min(start + SEED_BATCH, rows))
+                ],
+            )
+
+
+async def _measure(requests: int) -> dict[str, Any]:
+    from app.main import app
+    from app.ratelimit import set_rate_limiter
+
+    set_rate_limiter(None)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for label, query in QUERIES.items():
+            params: dict[str, Any] = {"q": query, "limit": 50}
+            page = 1
+            if label.endswith("deep_page"):
+                # Up to page 9; a small table may run out of matches earlier.
+                response = await client.get("/items/search", params=params)
+                while page < 9 and "X-Next-Cursor" in response.headers:
+                    params["cursor"] = response.headers["X-Next-Cursor"]
+                    response = await client.get("/items/search", params=params)
+                    page += 1
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get("/items/search", params=params)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+            latencies.sort()
+            results[label] = {
+                "p50_ms": _percentile(latencies, 0.50),
+                "p95_ms": _percentile(latencies, 0.95),
+            }
+            if label.endswith("deep_page"):
+                results[label]["page"] = page
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-search-") as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'bench.db'}"
+        started = time.perf_counter()
+        _seed(args.rows)
+        seed_seconds = round(time.perf_counter() - started, 1)
+        results = asyncio.run(_measure(args.requests))
+
+    print(json.dumps({"rows": args.rows, "seed_seconds": seed_seconds, **results}))
+    if any(
+        result["p95_ms"] > args.budget_ms
+        for label, result in results.items()
+        if label not in UNGATED
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
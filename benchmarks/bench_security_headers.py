@@ -0,0 +1,108 @@
+"""Per-request cost of the security headers: ``BaseHTTPMiddleware`` versus raw ASGI.
+
+Both variants wrap the same one-route Starlette app and are driven directly
+through the ASGI interface, so the difference is the middleware alone. The
+``@app.middleware("http")`` variant is the implementation the app used before.
+
+Usage: python -m benchmarks.bench_security_headers [--requests 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.main import ROUTE_SECURITY_HEADERS, SECURITY_HEADERS
+from app.security_headers import SecurityHeadersMiddleware
+
+
+async def _endpoint(request: Any) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+async def _set_headers(request: Any, call_next: Any) -> Any:
+    response = await call_next(request)
+    for header, value in SECURITY_HEADERS.items():
+        response.headers.setdefault(header, value)
+    return response
+
+
+def _build(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/items", _endpoint)], middleware=middleware)
+
+
+async def _per_request_us(app: Any, requests: int) -> float:
+    def receiver() -> Any:
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive() -> dict:
+            if messages:
+                return messages.pop()
+            # Like a client that stays connected until the response is sent.
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        return receive
+
+    async def send(message: dict) -> None:
+        return None
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items",
+        "raw_path": b"/items",
+        "query_string": b"",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 40000),
+    }
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receiver(), send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    variants = {
+        "none": _build([]),
+        "base_http_middleware": _build(
+            [Middleware(BaseHTTPMiddleware, dispatch=_set_headers)]
+        ),
+        "pure_asgi": _build(
+            [
+                Middleware(
+                    SecurityHeadersMiddleware,
+                    headers=SECURITY_HEADERS,
+                    route_overrides=ROUTE_SECURITY_HEADERS,
+                )
+            ]
+        ),
+    }
+    results = {
+        f"{label}_us_per_request": round(
+            asyncio.run(_per_request_us(app, args.requests)), 3
+        )
+        for label, app in variants.items()
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Per-item cost of the default response path versus the orjson fast path.
+
+The default path mirrors what FastAPI does for ``response_model=list[Item]``:
+ORM objects -> dicts -> Pydantic validation -> jsonable_encoder -> json.dumps.
+The fast path zips column tuples into dicts and encodes them with orjson.
+
+Usage: python -m benchmarks.bench_serialization [--items 1000] [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app.main import _ITEM_COLUMNS, _ITEM_FIELDS, _serialize_item
+from app.models import Item as ItemModel
+from app.schemas import Item
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(ItemModel),
+            [
+                {"name": f"Task {n}", "description": "x" * 40, "status": "draft"}
+                for n in range(args.items)
+            ],
+        )
+    session = Session(engine)
+    records = session.execute(select(ItemModel)).scalars().all()
+    rows = session.execute(select(*_ITEM_COLUMNS)).all()
+    adapter = TypeAdapter(list[Item])
+
+    def default_path() -> bytes:
+        payload = [_serialize_item(record) for record in records]
+        validated = adapter.validate_python(payload)
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    def fast_path() -> bytes:
+        return orjson.dumps([dict(zip(_ITEM_FIELDS, row)) for row in rows])
+
+    assert json.loads(default_path()) == json.loads(fast_path())
+    results = {}
+    for label, fn in (("default", default_path), ("orjson_fast_path", fast_path)):
+        seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3))
+        results[label] = {
+            "us_per_item": round(seconds / args.repeat / args.items * 1e6, 3)
+        }
+    results["speedup"] = round(
+        results["default"]["us_per_item"] / results["orjson_fast_path"]["us_per_item"],
+        1,
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Mixed read/write throughput with and without the SQLite pragma profile.
+
+Usage: python -m benchmarks.bench_sqlite_pragmas [--seconds 5] [--writers 2] [--readers 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app.db import Base, _engine_options, _install_sqlite_pragmas
+from app.models import Item
+
+
+def _build(path: Path, with_profile: bool) -> Engine:
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **_engine_options(url))
+    if with_profile:
+        _install_sqlite_pragmas(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Item),
+            [{"name": f"seed {n}", "status": "draft"} for n in range(1000)],
+        )
+    return engine
+
+
+def _run(
+    engine: Engine, seconds: float, writers: int, readers: int
+) -> dict[str, float]:
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def writer() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        insert(Item).values(name="bench", status="draft")
+                    )
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def reader() -> None:
+        stmt = select(Item).where(Item.status == "draft").order_by(Item.id).limit(50)
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as connection:
+                    connection.execute(stmt).all()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "reads_per_sec": round(counts["reads"] / seconds, 1),
+        "writes_per_sec": round(counts["writes"] / seconds, 1),
+        "errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=6)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for label, with_profile in (("default", False), ("pragma_profile", True)):
+            engine = _build(Path(directory) / f"{label}.db", with_profile)
+            results[label] = _run(engine, args.seconds, args.writers, args.readers)
+            engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Per-request cost of API token checks: env lookup versus the token registry.
+
+``legacy`` is the previous check, ``os.getenv`` plus ``secrets.compare_digest``
+against one shared key. ``registry`` is ``TokenRegistry.lookup`` holding
+``--tokens`` keys, with and without a token file to watch for changes.
+
+Usage: python -m benchmarks.bench_token_lookup [--tokens 1 1000 100000]
+    [--lookups 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.auth import TokenRegistry, parse_tokens
+
+
+def _per_lookup_us(check: Callable[[], object], lookups: int) -> float:
+    started = time.perf_counter()
+    for _ in range(lookups):
+        check()
+    return round((time.perf_counter() - started) / lookups * 1e6, 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1, 1000, 100_000])
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    os.environ["APP_API_TOKEN"] = "bench-token"
+    presented = "bench-token"
+    results = {
+        "legacy_us": _per_lookup_us(
+            lambda: secrets.compare_digest(presented, os.getenv("APP_API_TOKEN")),
+            args.lookups,
+        )
+    }
+    with tempfile.TemporaryDirectory(prefix="bench-tokens-") as directory:
+        for count in args.tokens:
+            entries = [
+                {"name": f"t{n}", "token": f"bench-token-{n:08d}", "scopes": ["*"]}
+                for n in range(count)
+            ]
+            raw = json.dumps(entries)
+            path = Path(directory) / f"tokens-{count}.json"
+            path.write_text(raw)
+            key = f"bench-token-{count - 1:08d}"
+            for label, registry in (
+                ("registry", TokenRegistry(parse_tokens(raw))),
+                ("registry_with_file", TokenRegistry(path=path)),
+            ):
+                results[f"{label}_{count}_tokens_us"] = _per_lookup_us(
+                    lambda: registry.lookup(key), args.lookups
+                )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Files/sec for per-call root resolution versus the pinned ``UploadStore``.
+
+Usage: python -m benchmarks.bench_upload_store [--files 5000] [--size 4096]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.upload import PNG_MAGIC, UploadStore, secure_save, secure_save_stream
+
+
+def _rate(files: int, save: Callable[[], tuple[bool, str]]) -> float:
+    started = time.perf_counter()
+    for _ in range(files):
+        ok, reason = save()
+        assert ok, reason
+    return round(files / (time.perf_counter() - started), 1)
+
+
+async def _one_chunk(payload: bytes):
+    yield payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=4096)
+    args = parser.parse_args()
+
+    payload = PNG_MAGIC + b"\x00" * max(args.size - len(PNG_MAGIC), 0)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        base = Path(directory)
+        for label in ("secure_save", "upload_store", "stream", "stream_pinned"):
+            (base / label).mkdir()
+
+        store = UploadStore(base / "upload_store")
+        pinned = UploadStore(base / "stream_pinned")
+        runs = {
+            "secure_save": lambda: secure_save(base / "secure_save", "", payload),
+            "upload_store": lambda: store.save("", payload),
+            "stream": lambda: asyncio.run(
+                secure_save_stream(base / "stream", "", _one_chunk(payload))
+            ),
+            "stream_pinned": lambda: asyncio.run(
+                pinned.save_stream(_one_chunk(payload))
+            ),
+        }
+        for label, save in runs.items():
+            results[f"{label}_files_per_sec"] = _rate(args.files, save)
+        store.close()
+        pinned.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
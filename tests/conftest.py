@@ -1,4 +1,5 @@
 # tests/conftest.py
+import asyncio
 import sys
 from pathlib import Path
 
@@ -18,6 +19,16 @@ def reset_in_memory_db():
     _reset_db()
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    from app.ratelimit import get_rate_limiter
+
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        asyncio.run(limiter.clear())
+    yield
+
+
 @pytest.fixture(autouse=True)
 def configure_api_token(monkeypatch):
     monkeypatch.setenv("APP_API_TOKEN", "test-token")
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import (
+    TokenRegistry,
+    _build_token_registry,
+    get_token_registry,
+    parse_tokens,
+    set_token_registry,
+)
+from app.main import _rate_limit_key, app
+
+client = TestClient(app)
+PROBLEM_BASE = "https://problems.secdev.local/"
+WRITER_TOKEN = "writer-token-0123456789"
+OPS_TOKEN = "ops-token-0123456789abc"
+
+
+def _write(path, entries) -> None:
+    stamp = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(json.dumps(entries))
+    # Coarse filesystem clocks could otherwise hide a rewrite.
+    os.utime(path, ns=(stamp + 1_000_000_000, stamp + 1_000_000_000))
+
+
+@pytest.fixture
+def token_file(tmp_path):
+    path = tmp_path / "tokens.json"
+    _write(
+        path,
+        [
+            {"name": "writer", "token": WRITER_TOKEN, "scopes": ["items:write"]},
+            {
+                "name": "ops",
+                "sha256": hashlib.sha256(OPS_TOKEN.encode()).hexdigest(),
+                "scopes": ["internal:read"],
+            },
+            {
+                "name": "retired",
+                "token": "retired-token-0123456789",
+                "scopes": ["*"],
+                "expires_at": "2020-01-01T00:00:00Z",
+            },
+        ],
+    )
+    previous = get_token_registry()
+    registry = TokenRegistry(path=path, reload_seconds=0)
+    set_token_registry(registry)
+    yield path
+    set_token_registry(previous)
+
+
+def test_tokens_are_checked_for_scope(token_file):
+    writer = {"X-API-Key": WRITER_TOKEN}
+    ops = {"X-API-Key": OPS_TOKEN}
+
+    assert client.post("/items", json={"name": "A"}, headers=writer).status_code == 201
+    assert client.get("/metrics", headers=ops).status_code == 200
+
+    forbidden = client.get("/metrics", headers=writer)
+    assert forbidden.status_code == 403
+    assert forbidden.json()["type"] == f"{PROBLEM_BASE}forbidden"
+    assert client.post("/items", json={"name": "B"}, headers=ops).status_code == 403
+
+
+def test_expired_and_unknown_tokens_are_rejected(token_file):
+    for key in ("retired-token-0123456789", "test-token"):
+        response = client.post("/items", json={"name": "A"}, headers={"X-API-Key": key})
+        assert response.status_code == 401
+
+
+def test_token_file_reloads_on_change(token_file):
+    _write(
+        token_file,
+        [{"name": "rotated", "token": "rotated-token-0123456789", "scopes": ["*"]}],
+    )
+
+    assert client.get("/metrics", headers={"X-API-Key": OPS_TOKEN}).status_code == 401
+    rotated = {"X-API-Key": "rotated-token-0123456789"}
+    assert client.get("/metrics", headers=rotated).status_code == 200
+
+
+def test_broken_token_file_keeps_previous_tokens(token_file):
+    _write(token_file, [{"name": "bad", "scopes": ["items:write"]}])
+
+    ops = {"X-API-Key": OPS_TOKEN}
+    assert client.get("/metrics", headers=ops).status_code == 200
+    body = client.get("/internal/tokens", headers=ops).json()
+    assert "exactly one of token or sha256" in body["reload_error"]
+
+
+def test_usage_is_counted_per_token_without_exposing_secrets(token_file):
+    ops = {"X-API-Key": OPS_TOKEN}
+    before = get_token_registry().usage("writer")
+    for name in ("A", "B"):
+        client.post("/items", json={"name": name}, headers={"X-API-Key": WRITER_TOKEN})
+
+    response = client.get("/internal/tokens", headers=ops)
+    tokens = {token["name"]: token for token in response.json()["tokens"]}
+    assert tokens["writer"]["requests"] == before + 2
+    assert tokens["writer"]["scopes"] == ["items:write"]
+    assert WRITER_TOKEN not in response.text and OPS_TOKEN not in response.text
+
+
+def test_rate_limit_buckets_by_token_name(token_file):
+    scope = {
+        "type": "http",
+        "headers": [(b"x-api-key", WRITER_TOKEN.encode())],
+        "client": ("203.0.113.9", 1234),
+    }
+    assert _rate_limit_key(scope) == "token:writer"
+    scope["headers"] = [(b"x-api-key", b"nope")]
+    assert not _rate_limit_key(scope).startswith("token:")
+
+
+def test_rate_limit_keys_shared_tokens_by_ip_too(monkeypatch):
+    monkeypatch.setenv("APP_API_TOKEN", "legacy-token-0123456789")
+    entries = [
+        {
+            "name": "kiosks",
+            "token": "kiosk-token-0123456789",
+            "scopes": ["items:write"],
+            "shared": True,
+        }
+    ]
+    monkeypatch.setenv("API_TOKENS", json.dumps(entries))
+    previous = get_token_registry()
+    set_token_registry(_build_token_registry())
+    try:
+        keys = set()
+        for raw in (b"legacy-token-0123456789", b"kiosk-token-0123456789"):
+            for ip in ("203.0.113.9", "198.51.100.7"):
+                scope = {
+                    "type": "http",
+                    "headers": [(b"x-api-key", raw)],
+                    "client": (ip, 1234),
+                }
+                keys.add(_rate_limit_key(scope))
+    finally:
+        set_token_registry(previous)
+
+    assert len(keys) == 4
+    assert "token:default@ip:203.0.113.9" in keys
+
+
+@pytest.mark.parametrize(
+    "entries",
+    [
+        [{"name": "a", "token": "x" * 16, "scopes": ["root"]}],
+        [{"name": "a", "token": "short", "scopes": ["*"]}],
+        [{"name": "a", "token": "x" * 16, "sha256": "0" * 64, "scopes": ["*"]}],
+        [
+            {"name": "a", "token": "x" * 16, "scopes": ["*"]},
+            {"name": "a", "token": "y" * 16, "scopes": ["*"]},
+        ],
+        [{"name": "a", "token": "x" * 16, "scopes": ["*"], "expires_at": "2030-01-01"}],
+    ],
+)
+def test_invalid_token_lists_are_rejected(entries):
+    with pytest.raises(ValueError):
+        parse_tokens(json.dumps(entries))
@@ -0,0 +1,91 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+PROBLEM_BASE = "https://problems.secdev.local/"
+
+
+def test_batch_create_returns_items_in_order():
+    payload = {"items": [{"name": "One"}, {"name": "Two", "status": "done"}]}
+    response = client.post("/items:batch", json=payload, headers=AUTH_HEADERS)
+
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [result["item"]["name"] for result in results] == ["One", "Two"]
+    assert [result["item"]["id"] for result in results] == [1, 2]
+    assert results[1]["item"]["status"] == "done"
+    assert client.get("/items").json()[1]["name"] == "Two"
+
+
+def test_batch_create_rejects_whole_batch_on_invalid_payload():
+    payload = {"items": [{"name": "Fine"}, {"name": "<b>"}]}
+    response = client.post("/items:batch", json=payload, headers=AUTH_HEADERS)
+
+    assert response.status_code == 422
+    assert response.json()["type"] == f"{PROBLEM_BASE}validation_error"
+    assert client.get("/items").json() == []
+
+
+def test_batch_update_reports_per_item_results():
+    client.post(
+        "/items:batch",
+        json={"items": [{"name": "A"}, {"name": "B"}]},
+        headers=AUTH_HEADERS,
+    )
+    payload = {
+        "items": [
+            {"id": 1, "status": "done"},
+            {"id": 99, "status": "done"},
+            {"id": 2},
+            {"id": 2, "description": "late"},
+        ]
+    }
+    response = client.patch("/items:batch", json=payload, headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 404, 422, 422]
+    assert results[0]["item"]["status"] == "done"
+    assert results[1]["error"]["type"] == f"{PROBLEM_BASE}not_found"
+    assert "at least one field" in results[2]["error"]["detail"]
+    assert client.get("/items/2").json()["description"] is None
+
+
+def test_batch_delete_removes_existing_and_flags_missing():
+    client.post(
+        "/items:batch",
+        json={"items": [{"name": "A"}, {"name": "B"}]},
+        headers=AUTH_HEADERS,
+    )
+    response = client.request(
+        "DELETE", "/items:batch", json={"ids": [1, 5, 1]}, headers=AUTH_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == [
+        204,
+        404,
+        422,
+    ]
+    assert [item["id"] for item in client.get("/items").json()] == [2]
+
+
+def test_batch_rejects_ids_beyond_64_bits():
+    huge = int("9" * 23)
+    update = client.patch(
+        "/items:batch",
+        json={"items": [{"id": huge, "name": "x"}]},
+        headers=AUTH_HEADERS,
+    )
+    delete = client.request(
+        "DELETE", "/items:batch", json={"ids": [huge]}, headers=AUTH_HEADERS
+    )
+
+    assert (update.status_code, delete.status_code) == (422, 422)
+
+
+def test_batch_requires_api_key():
+    response = client.post("/items:batch", json={"items": [{"name": "A"}]})
+    assert response.status_code == 401
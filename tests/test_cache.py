@@ -0,0 +1,124 @@
+import asyncio
+import fnmatch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.cache import ItemCache, MemoryCache, RedisCache, set_item_cache
+from app.db import SessionLocal
+from app.main import app
+from app.models import Item as ItemModel
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio commands RedisCache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+        return int(self.data[key])
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+@pytest.fixture(params=["memory", "redis"])
+def item_cache(request):
+    backend = MemoryCache() if request.param == "memory" else RedisCache(FakeRedis())
+    cache = ItemCache(backend)
+    set_item_cache(cache)
+    yield cache
+    set_item_cache(None)
+
+
+def _change_behind_api(item_id: int, **values) -> None:
+    with SessionLocal() as session:
+        session.execute(
+            update(ItemModel).where(ItemModel.id == item_id).values(**values)
+        )
+        session.commit()
+
+
+def test_memory_cache_evicts_lru_and_expires():
+    cache = MemoryCache(max_entries=2)
+
+    async def scenario():
+        await cache.set("a", 1, ttl=60)
+        await cache.set("b", 2, ttl=60)
+        assert await cache.get("a") == 1
+        await cache.set("c", 3, ttl=60)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        await cache.set("d", 4, ttl=0)
+        assert await cache.get("d") is None
+
+    asyncio.run(scenario())
+
+
+def test_get_item_is_served_from_cache_until_write(item_cache):
+    item = client.post("/items", json={"name": "Cached"}, headers=AUTH_HEADERS).json()
+    assert client.get(f"/items/{item['id']}").json()["name"] == "Cached"
+
+    _change_behind_api(item["id"], name="Changed directly")
+    assert client.get(f"/items/{item['id']}").json()["name"] == "Cached"
+
+    client.put(f"/items/{item['id']}", json={"status": "done"}, headers=AUTH_HEADERS)
+    body = client.get(f"/items/{item['id']}").json()
+    assert body["name"] == "Changed directly"
+    assert body["status"] == "done"
+
+
+def test_status_listing_invalidated_on_status_change(item_cache):
+    item = client.post("/items", json={"name": "Move me"}, headers=AUTH_HEADERS).json()
+    assert len(client.get("/items", params={"status": "draft"}).json()) == 1
+    assert client.get("/items", params={"status": "done"}).json() == []
+
+    client.put(f"/items/{item['id']}", json={"status": "done"}, headers=AUTH_HEADERS)
+    assert client.get("/items", params={"status": "draft"}).json() == []
+    assert len(client.get("/items", params={"status": "done"}).json()) == 1
+
+    client.delete(f"/items/{item['id']}", headers=AUTH_HEADERS)
+    assert client.get("/items", params={"status": "done"}).json() == []
+    assert client.get(f"/items/{item['id']}").status_code == 404
+
+
+def test_batch_writes_invalidate_listings(item_cache):
+    assert client.get("/items").json() == []
+    client.post("/items:batch", json={"items": [{"name": "A"}]}, headers=AUTH_HEADERS)
+    assert [item["name"] for item in client.get("/items").json()] == ["A"]
+
+    client.patch(
+        "/items:batch", json={"items": [{"id": 1, "name": "B"}]}, headers=AUTH_HEADERS
+    )
+    assert [item["name"] for item in client.get("/items").json()] == ["B"]
+
+
+def test_read_racing_a_write_does_not_repopulate_stale_entry(item_cache):
+    async def scenario():
+        stale_key = await item_cache.item_key(1)
+        await item_cache.invalidate([1], ["draft"])
+        await item_cache.set(stale_key, {"id": 1, "name": "stale"})
+        assert await item_cache.get(await item_cache.item_key(1)) is None
+
+    asyncio.run(scenario())
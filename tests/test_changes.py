@@ -0,0 +1,290 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app.main as main
+from app.changes import (
+    ChangeBroadcaster,
+    get_change_broadcaster,
+    set_change_broadcaster,
+)
+from app.db import SessionLocal, get_engine
+from app.main import app
+from app.models import ItemChange
+from app.schemas import (
+    ItemBatchCreateRequest,
+    ItemBatchDeleteRequest,
+    ItemBatchUpdateRequest,
+    ItemUpdate,
+)
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_broadcaster():
+    set_change_broadcaster(None)
+    yield
+    set_change_broadcaster(None)
+
+
+def _changes(since: int = 0) -> list[tuple[int, str, int]]:
+    response = client.get("/items/changes", params={"since": since})
+    assert response.status_code == 200
+    return [(c["item_id"], c["action"], c["version"]) for c in response.json()]
+
+
+def test_item_writes_append_to_change_log():
+    client.post("/items", json={"name": "A"}, headers=AUTH_HEADERS)
+    client.put("/items/1", json={"status": "done"}, headers=AUTH_HEADERS)
+    client.delete("/items/1", headers=AUTH_HEADERS)
+
+    assert _changes() == [(1, "create", 1), (1, "update", 2), (1, "delete", 2)]
+    seqs = [change["seq"] for change in client.get("/items/changes").json()]
+    assert seqs == sorted(seqs)
+    assert _changes(since=seqs[1]) == [(1, "delete", 2)]
+
+
+def test_batch_writes_append_to_change_log():
+    client.post(
+        "/items:batch",
+        json={"items": [{"name": "A"}, {"name": "B"}]},
+        headers=AUTH_HEADERS,
+    )
+    client.patch(
+        "/items:batch",
+        json={"items": [{"id": 2, "status": "done"}, {"id": 9, "status": "done"}]},
+        headers=AUTH_HEADERS,
+    )
+    client.request("DELETE", "/items:batch", json={"ids": [1]}, headers=AUTH_HEADERS)
+
+    assert _changes() == [
+        (1, "create", 1),
+        (2, "create", 1),
+        (2, "update", 2),
+        (1, "delete", 1),
+    ]
+
+
+class _PostgresRecordingSession:
+    """A real session that reports the PostgreSQL dialect and logs all SQL."""
+
+    def __init__(self, session, statements: list[str]) -> None:
+        self._session = session
+        self.statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def execute(self, stmt, *args, **kwargs):
+        if str(stmt).startswith("LOCK TABLE"):
+            self.statements.append(str(stmt))
+            return None
+        return self._session.execute(stmt, *args, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda s: main._create_item_tx(s, {"name": "new"}),
+        lambda s: main._update_item_tx(s, 1, ItemUpdate(name="x"), None),
+        lambda s: main._delete_item_tx(s, 1, None),
+        lambda s: main._create_items_batch_tx(
+            s, ItemBatchCreateRequest(items=[{"name": "new"}])
+        ),
+        lambda s: main._update_items_batch_tx(
+            s, ItemBatchUpdateRequest(items=[{"id": 1, "name": "x"}])
+        ),
+        lambda s: main._delete_items_batch_tx(s, ItemBatchDeleteRequest(ids=[1])),
+    ],
+)
+def test_postgres_writes_lock_the_change_log_before_any_item_write(write):
+    client.post("/items", json={"name": "old"}, headers=AUTH_HEADERS)
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with SessionLocal() as session:
+            write(_PostgresRecordingSession(session, statements))
+            session.rollback()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    writes = [
+        index
+        for index, statement in enumerate(statements)
+        if statement.split()[0] in {"INSERT", "UPDATE", "DELETE"}
+    ]
+    assert statements[0] == "LOCK TABLE item_changes IN EXCLUSIVE MODE"
+    assert writes and statements.count(statements[0]) == 1
+
+
+def test_rejected_writes_leave_no_change():
+    client.post("/items", json={"name": "A"}, headers=AUTH_HEADERS)
+    stale = {**AUTH_HEADERS, "If-Match": '"stale"'}
+
+    assert client.put("/items/1", json={"name": "B"}, headers=stale).status_code == 412
+    assert client.delete("/items/7", headers=AUTH_HEADERS).status_code == 404
+    assert _changes() == [(1, "create", 1)]
+
+
+def test_slow_subscriber_is_dropped_not_buffered():
+    async def scenario():
+        broadcaster = ChangeBroadcaster(buffer_size=2)
+        slow, fast = broadcaster.subscribe(), broadcaster.subscribe()
+        for seq in (1, 2, 3):
+            broadcaster.publish({"seq": seq})
+            assert (await fast.get())["seq"] == seq
+
+        assert len(broadcaster) == 1
+        assert [(await slow.get())["seq"] for _ in range(2)] == [1, 2]
+        assert await slow.get() is None
+
+    asyncio.run(scenario())
+
+
+async def _read_stream(query: str = "", headers=(), frames: int = 1) -> list[str]:
+    """Drive the SSE route over raw ASGI, disconnecting after ``frames`` events."""
+    body = b""
+    done = asyncio.Event()
+
+    async def receive() -> dict:
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal body
+        if message["type"] == "http.response.body":
+            body += message.get("body", b"")
+            if body.count(b"\nevent: ") >= frames:
+                done.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/changes/stream",
+        "raw_path": b"/items/changes/stream",
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "server": ("test", 80),
+        "client": ("127.0.0.1", 40000),
+    }
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return body.decode().split("\n\n")[:-1]
+
+
+def _events(frames: list[str]) -> list[tuple[int, str]]:
+    parsed = []
+    for frame in frames:
+        if frame.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        assert json.loads(fields["data"])["seq"] == int(fields["id"])
+        parsed.append((int(fields["id"]), fields["event"]))
+    return parsed
+
+
+async def _subscribed() -> None:
+    while not len(get_change_broadcaster()):
+        await asyncio.sleep(0.01)
+
+
+def test_stream_replays_backlog_then_follows_live_writes():
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as api:
+            await api.post("/items", json={"name": "A"}, headers=AUTH_HEADERS)
+            stream = asyncio.create_task(_read_stream("since=0", frames=3))
+            await _subscribed()
+            await api.put("/items/1", json={"name": "B"}, headers=AUTH_HEADERS)
+            await api.delete("/items/1", headers=AUTH_HEADERS)
+            return await stream
+
+    frames = asyncio.run(scenario())
+    assert _events(frames) == [(1, "create"), (2, "update"), (3, "delete")]
+
+
+def test_stream_resumes_after_last_event_id_or_starts_at_head():
+    for name in ("A", "B"):
+        client.post("/items", json={"name": name}, headers=AUTH_HEADERS)
+
+    resumed = asyncio.run(_read_stream(headers=[("last-event-id", "1")]))
+    assert _events(resumed) == [(2, "create")]
+
+    async def from_head():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as api:
+            stream = asyncio.create_task(_read_stream())
+            await _subscribed()
+            await api.post("/items", json={"name": "C"}, headers=AUTH_HEADERS)
+            return await stream
+
+    assert _events(asyncio.run(from_head())) == [(3, "create")]
+
+
+def test_dropped_stream_catches_up_from_log():
+    set_change_broadcaster(ChangeBroadcaster(buffer_size=1))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as api:
+            stream = asyncio.create_task(_read_stream("since=0", frames=5))
+            await _subscribed()
+            items = [{"name": f"Item {n}"} for n in range(5)]
+            await api.post("/items:batch", json={"items": items}, headers=AUTH_HEADERS)
+            return await stream
+
+    assert [seq for seq, _ in _events(asyncio.run(scenario()))] == [1, 2, 3, 4, 5]
+
+
+def test_quiet_stream_sends_keepalive_and_picks_up_other_writers(monkeypatch):
+    monkeypatch.setattr(main, "CHANGE_STREAM_HEARTBEAT_SECONDS", 0.05)
+
+    async def scenario():
+        stream = asyncio.create_task(_read_stream("since=0"))
+        await _subscribed()
+        await asyncio.sleep(0.1)
+        # Written outside this process's broadcaster, as another worker would.
+        with SessionLocal() as session:
+            session.add(ItemChange(item_id=42, action="create", version=1))
+            session.commit()
+        return await stream
+
+    frames = asyncio.run(scenario())
+    assert frames[0] == ": keepalive"
+    assert _events(frames) == [(1, "create")]
+
+
+def test_stream_rejects_bad_last_event_id():
+    response = client.get(
+        "/items/changes/stream", headers={"Last-Event-ID": "not-a-number"}
+    )
+    assert response.status_code == 422
+    huge = "9" * 25
+    response = client.get("/items/changes/stream", headers={"Last-Event-ID": huge})
+    assert response.status_code == 422
+
+
+def test_changes_reject_seq_beyond_64_bits():
+    huge = "9" * 25
+    assert client.get("/items/changes", params={"since": huge}).status_code == 422
+    stream = client.get("/items/changes/stream", params={"since": huge})
+    assert stream.status_code == 422
+    assert client.get("/items/changes", params={"since": 2**63 - 1}).json() == []
@@ -0,0 +1,177 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.db as db
+from app.db import DATABASE_ASYNC_ENV, Base, _ensure_indexes, async_database_url
+from app.main import _list_items_stmt, app
+
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+def _query_plan(stmt) -> str:
+    engine = db.get_engine()
+    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_status_listing_uses_composite_index():
+    plan = _query_plan(_list_items_stmt("done", None, 51))
+
+    assert "ix_items_status_id" in plan
+    assert "SCAN items" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_status_listing_page_uses_composite_index():
+    plan = _query_plan(_list_items_stmt("draft", 100, 51))
+
+    assert "ix_items_status_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_schema_upgrades_apply_to_existing_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL,"
+                " description VARCHAR(300), status VARCHAR(20) NOT NULL)"
+            )
+        )
+
+        connection.execute(text("INSERT INTO items VALUES (1, 'Old', NULL, 'draft')"))
+
+    db._ensure_columns(engine)
+    _ensure_indexes(engine)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("items")}
+    assert "ix_items_status_id" in index_names
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT version FROM items")).scalar() == 1
+
+
+def test_async_database_url_maps_drivers():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u@h/db") == "postgresql+asyncpg://u@h/db"
+    assert (
+        async_database_url("postgresql+psycopg://u@h/db")
+        == "postgresql+asyncpg://u@h/db"
+    )
+
+
+def test_item_routes_use_async_engine(tmp_path, monkeypatch):
+    database = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{database}")
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database}", poolclass=NullPool
+    )
+    monkeypatch.setenv(DATABASE_ASYNC_ENV, "1")
+    monkeypatch.setattr(
+        db,
+        "_async_session_factory",
+        async_sessionmaker(async_engine, expire_on_commit=False),
+    )
+
+    with TestClient(app) as client:
+        created = client.post("/items", json={"name": "Async"}, headers=AUTH_HEADERS)
+        assert created.status_code == 201
+        item_id = created.json()["id"]
+        assert client.get(f"/items/{item_id}").json()["name"] == "Async"
+        updated = client.put(
+            f"/items/{item_id}", json={"status": "done"}, headers=AUTH_HEADERS
+        )
+        assert updated.json()["status"] == "done"
+        exported = client.get("/items/export")
+        assert (
+            exported.text
+            == f'{{"id":{item_id},"name":"Async","description":null,"status":"done"}}\n'
+        )
+
+    with sync_engine.connect() as connection:
+        rows = connection.execute(text("SELECT name, status FROM items")).all()
+    assert rows == [("Async", "done")]
+
+
+def test_pool_options_read_from_environment(monkeypatch):
+    monkeypatch.setenv(db.POOL_SIZE_ENV, "7")
+    monkeypatch.setenv(db.MAX_OVERFLOW_ENV, "3")
+    monkeypatch.setenv(db.POOL_RECYCLE_ENV, "1800")
+    monkeypatch.setenv(db.POOL_PRE_PING_ENV, "true")
+
+    options = db._engine_options("postgresql://u@h/db")
+
+    assert options["poolclass"] is db.TimedQueuePool
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["pool_recycle"] == 1800
+    assert options["pool_pre_ping"] is True
+    assert "pool_size" not in db._engine_options("sqlite:///:memory:")
+
+
+def test_pool_stats_endpoint_reports_checkouts(tmp_path, monkeypatch):
+    monkeypatch.setenv(db.POOL_SIZE_ENV, "2")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", **db._engine_options("sqlite:///x.db")
+    )
+    with engine.connect():
+        status = db.pool_status(engine.pool)
+    assert status["size"] == 2
+    assert status["checked_out"] == 1
+    assert (status["checkouts"], status["waits"]) == (1, 0)
+
+    client = TestClient(app)
+    assert client.get("/internal/pool").status_code == 401
+    response = client.get("/internal/pool", headers=AUTH_HEADERS)
+    assert response.status_code == 200
+    assert response.json()["primary"]["pool"] == "TimedQueuePool"
+
+
+def test_pool_wait_counts_only_blocked_checkouts(tmp_path, monkeypatch):
+    monkeypatch.setenv(db.POOL_SIZE_ENV, "1")
+    monkeypatch.setenv(db.MAX_OVERFLOW_ENV, "0")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", **db._engine_options("sqlite:///x.db")
+    )
+    held = engine.connect()
+    waiter = threading.Thread(target=lambda: engine.connect().close())
+    waiter.start()
+    time.sleep(0.1)
+    held.close()
+    waiter.join()
+
+    status = db.pool_status(engine.pool)
+    assert (status["checkouts"], status["waits"]) == (2, 1)
+    assert status["wait_seconds_max"] >= 0.05
+
+
+def test_sqlite_pragma_profile_applied_on_connect(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "1234")
+    engine = create_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    db._install_sqlite_pragmas(engine)
+
+    with engine.connect() as connection:
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+        synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+        busy_timeout = connection.exec_driver_sql("PRAGMA busy_timeout").scalar()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 1234
+
+
+def test_sqlite_pragma_values_are_validated(monkeypatch):
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "NORMAL; DROP TABLE items")
+    with pytest.raises(ValueError):
+        db.sqlite_pragmas()
+
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "")
+    assert "synchronous" not in db.sqlite_pragmas()
@@ -35,3 +35,36 @@ def test_validation_error_does_not_echo_user_input():
     response = client.post("/items", json=payload, headers=AUTH_HEADERS)
     errors = response.json()["errors"]
     assert all("input" not in error for error in errors)
+
+
+def test_correlation_ids_are_unique_uuids_on_static_error_bodies():
+    responses = [client.get("/items/999") for _ in range(5)]
+    responses.append(client.post("/items", json={"name": "x"}))
+
+    ids = [response.json()["correlation_id"] for response in responses]
+    assert len(set(ids)) == len(ids)
+    assert all(UUID(value).version == 4 for value in ids)
+    unauthorized = responses[-1]
+    assert unauthorized.status_code == 401
+    assert unauthorized.headers["content-type"] == "application/problem+json"
+    assert unauthorized.json() == {
+        "type": f"{PROBLEM_BASE}not_authorized",
+        "title": "Not Authorized",
+        "status": 401,
+        "detail": "missing or invalid API token",
+        "correlation_id": unauthorized.headers["X-Correlation-ID"],
+    }
+
+
+def test_validation_errors_keep_members_except_input():
+    response = client.post(
+        "/items", json={"name": "", "status": "bogus"}, headers=AUTH_HEADERS
+    )
+    errors = response.json()["errors"]
+
+    assert {tuple(error["loc"]) for error in errors} == {
+        ("body", "name"),
+        ("body", "status"),
+    }
+    assert all({"type", "msg"} <= error.keys() for error in errors)
+    assert all("input" not in error for error in errors)
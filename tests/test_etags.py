@@ -0,0 +1,83 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+PROBLEM_BASE = "https://problems.secdev.local/"
+
+
+def _create(name: str = "Poll me") -> dict:
+    return client.post("/items", json={"name": name}, headers=AUTH_HEADERS).json()
+
+
+def test_get_item_honours_if_none_match():
+    item = _create()
+    first = client.get(f"/items/{item['id']}")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"')
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    cached = client.get(f"/items/{item['id']}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    client.put(f"/items/{item['id']}", json={"status": "done"}, headers=AUTH_HEADERS)
+    changed = client.get(f"/items/{item['id']}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_listing_etag_changes_with_membership():
+    _create("One")
+    listing = client.get("/items", params={"status": "draft"})
+    etag = listing.headers["ETag"]
+
+    unchanged = client.get(
+        "/items", params={"status": "draft"}, headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert unchanged.status_code == 304
+
+    _create("Two")
+    grown = client.get(
+        "/items", params={"status": "draft"}, headers={"If-None-Match": etag}
+    )
+    assert grown.status_code == 200
+    assert len(grown.json()) == 2
+
+
+def test_put_with_stale_if_match_is_rejected():
+    item = _create()
+    etag = client.get(f"/items/{item['id']}").headers["ETag"]
+
+    ok = client.put(
+        f"/items/{item['id']}",
+        json={"name": "Renamed"},
+        headers={**AUTH_HEADERS, "If-Match": etag},
+    )
+    assert ok.status_code == 200
+    assert ok.headers["ETag"] != etag
+
+    stale = client.put(
+        f"/items/{item['id']}",
+        json={"name": "Lost update"},
+        headers={**AUTH_HEADERS, "If-Match": etag},
+    )
+    assert stale.status_code == 412
+    assert stale.json()["type"] == f"{PROBLEM_BASE}precondition_failed"
+    assert client.get(f"/items/{item['id']}").json()["name"] == "Renamed"
+
+
+def test_delete_with_stale_if_match_is_rejected():
+    item = _create()
+    stale = client.delete(
+        f"/items/{item['id']}", headers={**AUTH_HEADERS, "If-Match": '"nope"'}
+    )
+    assert stale.status_code == 412
+
+    current = client.get(f"/items/{item['id']}").headers["ETag"]
+    deleted = client.delete(
+        f"/items/{item['id']}", headers={**AUTH_HEADERS, "If-Match": current}
+    )
+    assert deleted.status_code == 204
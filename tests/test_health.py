@@ -19,3 +19,19 @@ def test_health_includes_security_headers():
     assert r.headers["X-Content-Type-Options"] == "nosniff"
     assert r.headers["X-Frame-Options"] == "DENY"
     assert r.headers["Cache-Control"] == "no-store"
+
+
+def test_security_headers_are_per_route_and_reach_streaming_responses():
+    auth = {"X-API-Key": "test-token"}
+    item = client.post("/items", json={"name": "Headers"}, headers=auth).json()
+
+    assert client.get(f"/items/{item['id']}").headers["Cache-Control"] == "no-cache"
+    assert client.get("/items").headers["Cache-Control"] == "no-cache"
+    deleted = client.delete(f"/items/{item['id']}", headers=auth)
+    assert deleted.headers["Cache-Control"] == "no-store"
+
+    export = client.get("/items/export", headers=auth)
+    assert export.status_code == 200
+    assert export.headers["X-Frame-Options"] == "DENY"
+    assert export.headers["Cache-Control"] == "no-store"
+    assert export.headers.get_list("X-Content-Type-Options") == ["nosniff"]
@@ -1,7 +1,9 @@
+import json
 from uuid import UUID
 
 from fastapi.testclient import TestClient
 
+from app import main
 from app.main import app
 
 client = TestClient(app)
@@ -119,3 +121,47 @@ def test_description_max_length_boundary():
     assert response.status_code == 201
     body = response.json()
     assert body["description"] == description
+
+
+def test_export_streams_ndjson():
+    client.post("/items", json={"name": "First"}, headers=AUTH_HEADERS)
+    client.post(
+        "/items", json={"name": "Second", "status": "done"}, headers=AUTH_HEADERS
+    )
+
+    response = client.get("/items/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["name"] for line in lines] == ["First", "Second"]
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+    filtered = client.get("/items/export", params={"status": "done"})
+    assert [json.loads(line)["id"] for line in filtered.text.splitlines()] == [2]
+
+    unsupported = client.get("/items/export", params={"format": "csv"})
+    assert unsupported.status_code == 422
+    assert unsupported.json()["type"] == f"{PROBLEM_BASE}validation_error"
+
+
+def test_export_pages_through_chunks(monkeypatch):
+    monkeypatch.setattr(main, "EXPORT_CHUNK_SIZE", 2)
+    for name in ("A", "B", "C", "D", "E"):
+        client.post("/items", json={"name": name}, headers=AUTH_HEADERS)
+
+    response = client.get("/items/export")
+    names = [json.loads(line)["name"] for line in response.text.splitlines()]
+    assert names == ["A", "B", "C", "D", "E"]
+
+
+def test_openapi_documents_item_schemas():
+    paths = app.openapi()["paths"]
+    list_schema = paths["/items"]["get"]["responses"]["200"]["content"][
+        "application/json"
+    ]["schema"]
+    assert list_schema["items"]["$ref"] == "#/components/schemas/Item"
+    for path, method in (("/items", "post"), ("/items/{item_id}", "get")):
+        responses = paths[path][method]["responses"]
+        status = "201" if method == "post" else "200"
+        schema = responses[status]["content"]["application/json"]["schema"]
+        assert schema["$ref"] == "#/components/schemas/Item"
@@ -0,0 +1,79 @@
+import re
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import CounterVec, HistogramVec, Registry
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+def _sample(text: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name + labels)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def _scrape() -> str:
+    response = client.get("/metrics", headers=AUTH_HEADERS)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def test_metrics_label_requests_by_route_template_and_status():
+    before = _scrape()
+    item = client.post("/items", json={"name": "Metered"}, headers=AUTH_HEADERS).json()
+    client.get(f"/items/{item['id']}")
+    client.get("/items/424242")
+    after = _scrape()
+
+    labels = '{route="/items/{item_id}",method="GET",status="404"}'
+    name = "http_request_duration_seconds_count"
+    assert _sample(after, name, labels) == _sample(before, name, labels) + 1
+    assert f"/items/{item['id']}" not in after
+
+    code = '{code="not_found"}'
+    assert _sample(after, "problem_responses_total", code) == (
+        _sample(before, "problem_responses_total", code) + 1
+    )
+    # The scrape itself is the only request in flight.
+    assert "http_requests_in_flight 1" in after
+
+
+def test_metrics_count_sql_statements_per_request():
+    before = _scrape()
+    client.post("/items", json={"name": "Counted"}, headers=AUTH_HEADERS)
+    after = _scrape()
+
+    labels = '{route="/items"}'
+    queries = _sample(after, "db_queries_per_request_sum", labels) - _sample(
+        before, "db_queries_per_request_sum", labels
+    )
+    assert queries >= 1
+    assert _sample(after, "db_query_duration_seconds_per_request_sum", labels) > 0
+
+
+def test_metrics_require_token():
+    assert client.get("/metrics").status_code == 401
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = Registry()
+    counter = registry.register(CounterVec("jobs_total", "Jobs.", ("queue",)))
+    histogram = registry.register(HistogramVec("job_seconds", "Jobs.", (), (0.1, 1.0)))
+    counter.inc('a"b\\c')
+    histogram.labels().observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs.",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="a\\"b\\\\c"} 1',
+        "# HELP job_seconds Jobs.",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{le="0.1"} 0',
+        'job_seconds_bucket{le="1.0"} 1',
+        'job_seconds_bucket{le="+Inf"} 1',
+        "job_seconds_sum 0.5",
+        "job_seconds_count 1",
+    ]
@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.errors import ApiError
+from app.main import app
+from app.pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+PROBLEM_BASE = "https://problems.secdev.local/"
+
+
+def _seed(count: int, status: str = "draft") -> None:
+    for index in range(count):
+        client.post(
+            "/items",
+            json={"name": f"Task {index}", "status": status},
+            headers=AUTH_HEADERS,
+        )
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_search_cursor_is_not_an_id_cursor():
+    assert decode_search_cursor(encode_search_cursor(900, 100)) == (900, 100)
+    with pytest.raises(ApiError):
+        decode_cursor(encode_search_cursor(900, 100))
+    with pytest.raises(ApiError):
+        decode_search_cursor(encode_cursor(100))
+
+
+def test_list_items_walks_pages_with_cursor():
+    _seed(5)
+
+    first = client.get("/items", params={"limit": 2})
+    assert first.status_code == 200
+    assert [item["id"] for item in first.json()] == [1, 2]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/items", params={"limit": 2, "cursor": cursor})
+    assert [item["id"] for item in second.json()] == [3, 4]
+
+    last = client.get(
+        "/items", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]}
+    )
+    assert [item["id"] for item in last.json()] == [5]
+    assert "X-Next-Cursor" not in last.headers
+
+
+def test_list_items_after_id_with_status_filter():
+    _seed(3)
+    _seed(3, status="done")
+
+    response = client.get("/items", params={"status": "done", "after_id": 4})
+    assert [item["id"] for item in response.json()] == [5, 6]
+
+
+def test_list_items_rejects_bad_cursor_and_limit():
+    bad_cursor = client.get("/items", params={"cursor": "not-a-cursor"})
+    assert bad_cursor.status_code == 422
+    assert bad_cursor.json()["type"] == f"{PROBLEM_BASE}validation_error"
+
+    huge_after_id = client.get("/items", params={"after_id": "9" * 23})
+    assert huge_after_id.status_code == 422
+
+    huge = encode_cursor(int("9" * 25))
+    assert client.get("/items", params={"cursor": huge}).status_code == 422
+    huge_offset = encode_search_cursor(1, int("9" * 25))
+    assert (
+        client.get(
+            "/items/search", params={"q": "x", "cursor": huge_offset}
+        ).status_code
+        == 422
+    )
+
+    too_large = client.get("/items", params={"limit": 10_000})
+    assert too_large.status_code == 422
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.ratelimit import (
+    MemoryRateLimiter,
+    RedisRateLimiter,
+    get_rate_limiter,
+    set_rate_limiter,
+)
+from tests.test_cache import FakeRedis
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+PROBLEM_BASE = "https://problems.secdev.local/"
+
+
+@pytest.fixture
+def strict_limiter():
+    previous = get_rate_limiter()
+    limiter = MemoryRateLimiter(per_minute=3)
+    set_rate_limiter(limiter)
+    yield limiter
+    set_rate_limiter(previous)
+
+
+def test_default_limit_allows_sixty_requests_per_minute():
+    statuses = [client.get("/items").status_code for _ in range(61)]
+
+    assert statuses[:60] == [200] * 60
+    assert statuses[60] == 429
+
+
+def test_rejections_are_problem_details_with_retry_after(strict_limiter):
+    for _ in range(3):
+        assert client.get("/items").status_code == 200
+
+    response = client.get("/items")
+    assert response.status_code == 429
+    assert response.headers["content-type"] == "application/problem+json"
+    assert response.json()["type"] == f"{PROBLEM_BASE}rate_limited"
+    assert response.headers["Retry-After"] == "20"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert client.get("/health").status_code == 200
+
+
+def test_valid_token_gets_its_own_bucket(strict_limiter):
+    for _ in range(3):
+        client.get("/items")
+    assert client.get("/items").status_code == 429
+    assert client.get("/items", headers={"X-API-Key": "forged"}).status_code == 429
+
+    for _ in range(3):
+        assert client.get("/items", headers=AUTH_HEADERS).status_code == 200
+    assert client.get("/items", headers=AUTH_HEADERS).status_code == 429
+
+
+def test_memory_limiter_refills_and_evicts_idle_keys(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.ratelimit.time.monotonic", lambda: now[0])
+    limiter = MemoryRateLimiter(per_minute=60, burst=2, max_keys=2)
+
+    async def scenario():
+        assert await limiter.hit("a") == 0
+        assert await limiter.hit("a") == 0
+        assert await limiter.hit("a") == pytest.approx(1.0)
+        now[0] += 1.0
+        assert await limiter.hit("a") == 0
+
+        await limiter.hit("b")
+        await limiter.hit("c")
+        assert list(limiter._buckets) == ["b", "c"]
+
+    asyncio.run(scenario())
+
+
+def test_redis_limiter_shares_sliding_window():
+    redis = FakeRedis()
+    first, second = RedisRateLimiter(redis, 2), RedisRateLimiter(redis, 2)
+
+    async def scenario():
+        assert await first.hit("ip:1") == 0
+        assert await second.hit("ip:1") == 0
+        assert await first.hit("ip:1") > 0
+        assert await second.hit("ip:2") == 0
+
+    asyncio.run(scenario())
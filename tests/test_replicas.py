@@ -0,0 +1,135 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.cache import ItemCache, MemoryCache, set_item_cache
+from app.db import Base, ReadRouter, Replica, set_read_router
+from app.main import app
+from app.models import Item
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+def _replica(tmp_path, name: str) -> Replica:
+    """A SQLite file standing in for a replica, holding one item named after it."""
+    url = f"sqlite:///{tmp_path / name}.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Item), [{"name": name, "status": "draft"}])
+    engine.dispose()
+    return Replica(name, url)
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    replicas = [_replica(tmp_path, "replica0"), _replica(tmp_path, "replica1")]
+    set_read_router(ReadRouter(replicas, sticky_seconds=60))
+    yield replicas
+    set_read_router(None)
+
+
+def _read_name() -> str:
+    response = client.get("/items/1")
+    assert response.status_code == 200
+    return response.json()["name"]
+
+
+def test_reads_rotate_over_replicas(replicas):
+    assert [_read_name() for _ in range(4)] == ["replica0", "replica1"] * 2
+    listed = client.get("/items").json()
+    assert [item["name"] for item in listed] == ["replica0"]
+
+
+def test_writer_reads_primary_until_sticky_window_ends(replicas):
+    created = client.post("/items", json={"name": "mine"}, headers=AUTH_HEADERS)
+    assert created.status_code == 201
+
+    assert _read_name() == "mine"
+    assert client.get("/items/1", headers=AUTH_HEADERS).json()["name"] == "mine"
+
+    db.get_read_router().sticky_seconds = 0
+    client.put("/items/1", json={"status": "done"}, headers=AUTH_HEADERS)
+    assert _read_name().startswith("replica")
+
+
+def test_least_loaded_picks_idle_replica(tmp_path):
+    first, second = Replica("a", "sqlite://"), Replica("b", "sqlite://")
+    router = ReadRouter([first, second], selection="least_loaded")
+
+    with router.using(first):
+        assert {router.pick().name for _ in range(4)} == {"b"}
+    assert {router.pick().name for _ in range(4)} == {"a", "b"}
+
+
+def test_replica_sessions_refuse_writes(replicas):
+    # The second checkout reuses the pooled connection after its reset.
+    for _ in range(2):
+        with replicas[0].sessionmaker()() as session:
+            with pytest.raises(OperationalError, match="readonly"):
+                session.execute(text("DELETE FROM items"))
+
+
+def test_postgres_read_only_is_set_outside_a_transaction():
+    class FakeConnection:
+        def __init__(self) -> None:
+            self.autocommit = False
+            self.executed: list[tuple[str, bool]] = []
+
+        def cursor(self):
+            return self
+
+        def execute(self, statement: str) -> None:
+            self.executed.append((statement, self.autocommit))
+
+        def close(self) -> None:
+            pass
+
+    connection = FakeConnection()
+    db._set_read_only(connection, "postgresql")
+
+    # Autocommit keeps the pool's reset-on-return rollback from undoing it.
+    assert connection.executed == [
+        ("SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY", True)
+    ]
+    assert connection.autocommit is False
+
+
+def test_replica_reads_do_not_fill_item_cache(replicas):
+    backend = MemoryCache()
+    set_item_cache(ItemCache(backend))
+    try:
+        assert _read_name() == "replica0"
+        assert client.get("/items").status_code == 200
+        assert len(backend._entries) == 0
+    finally:
+        set_item_cache(None)
+
+
+def test_router_built_from_environment(monkeypatch):
+    monkeypatch.setenv("DATABASE_READ_URLS", "sqlite:///a.db, sqlite:///b.db")
+    monkeypatch.setenv("DATABASE_READ_SELECTION", "least_loaded")
+    monkeypatch.setenv("DATABASE_READ_STICKY_SECONDS", "2.5")
+    router = db._build_read_router()
+
+    assert [replica.name for replica in router.replicas] == ["replica0", "replica1"]
+    assert (router.selection, router.sticky_seconds) == ("least_loaded", 2.5)
+
+    monkeypatch.setenv("DATABASE_READ_URLS", "")
+    assert db._build_read_router() is None
+    monkeypatch.setenv("DATABASE_READ_URLS", "sqlite:///a.db")
+    monkeypatch.setenv("DATABASE_READ_SELECTION", "random")
+    with pytest.raises(ValueError):
+        db._build_read_router()
+
+
+def test_pool_stats_report_replicas_without_urls(replicas):
+    _read_name()
+    stats = client.get("/internal/pool", headers=AUTH_HEADERS).json()
+
+    assert stats["read_router"]["in_flight"] == {"replica0": 0, "replica1": 0}
+    assert stats["replica0"]["pool"] == "TimedQueuePool"
+    assert "sqlite" not in str(stats)
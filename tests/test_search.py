@@ -0,0 +1,153 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.main import app
+from app.search import FTS_TABLE, ensure_search_index, fts_query
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+PROBLEM_BASE = "https://problems.secdev.local/"
+
+
+def _create(name: str, description: str | None = None) -> int:
+    response = client.post(
+        "/items", json={"name": name, "description": description}, headers=AUTH_HEADERS
+    )
+    return response.json()["id"]
+
+
+def _search_ids(q: str, **params) -> list[int]:
+    response = client.get("/items/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+
+def test_search_matches_name_and_description_ranked():
+    _create("Write docs", "release notes")
+    weak = _create("Plan sprint", "mention release once among many other words here")
+    strong = _create("Release checklist", "release blockers")
+
+    response = client.get("/items/search", params={"q": "release"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body][0] == strong
+    assert body[-1]["id"] == weak
+    assert set(body[0]) == {"id", "name", "description", "status"}
+
+
+def test_search_requires_every_term_and_ignores_case_and_diacritics():
+    both = _create("Café menu", "Dessert list")
+    _create("Café hours")
+
+    assert _search_ids("cafe dessert") == [both]
+    assert sorted(_search_ids("CAFÉ")) == [1, 2]
+
+
+def test_search_follows_create_update_and_delete():
+    item_id = _create("Alpha task")
+    assert _search_ids("alpha") == [item_id]
+
+    client.put(f"/items/{item_id}", json={"name": "Beta task"}, headers=AUTH_HEADERS)
+    assert _search_ids("alpha") == []
+    assert _search_ids("beta") == [item_id]
+
+    client.delete(f"/items/{item_id}", headers=AUTH_HEADERS)
+    assert _search_ids("beta") == []
+
+
+def test_search_follows_batch_writes():
+    client.post(
+        "/items:batch",
+        json={"items": [{"name": "Gamma one"}, {"name": "Gamma two"}]},
+        headers=AUTH_HEADERS,
+    )
+    client.patch(
+        "/items:batch",
+        json={"items": [{"id": 1, "description": "delta"}]},
+        headers=AUTH_HEADERS,
+    )
+    client.request("DELETE", "/items:batch", json={"ids": [2]}, headers=AUTH_HEADERS)
+
+    assert _search_ids("gamma") == [1]
+    assert _search_ids("delta") == [1]
+
+
+def test_search_walks_pages_with_cursor():
+    for index in range(5):
+        _create(f"Report {index}")
+
+    first = client.get("/items/search", params={"q": "report", "limit": 2})
+    seen = [item["id"] for item in first.json()]
+    cursor = first.headers["X-Next-Cursor"]
+    while cursor:
+        page = client.get(
+            "/items/search", params={"q": "report", "limit": 2, "cursor": cursor}
+        )
+        seen += [item["id"] for item in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+
+
+def test_search_treats_query_syntax_literally():
+    _create("Fix OR bug", 'say "hi"')
+    _create("Unrelated")
+
+    assert fts_query('a OR b"') == '"a" "OR" "b"""'
+    assert _search_ids("fix OR") == [1]
+    assert _search_ids('"hi') == [1]
+    # As an operator this would match item 1; as text "near" occurs nowhere.
+    assert _search_ids("NEAR(fix bug)") == []
+    assert _search_ids("name:unrelated") == []
+    assert _search_ids('* " -') == []
+
+
+def test_search_rejects_bad_input():
+    assert client.get("/items/search").status_code == 422
+    assert client.get("/items/search", params={"q": "x" * 201}).status_code == 422
+    response = client.get("/items/search", params={"q": "x", "cursor": "bogus"})
+    assert response.status_code == 422
+    assert response.json()["type"] == f"{PROBLEM_BASE}validation_error"
+
+
+def test_search_index_is_built_for_existing_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL,"
+                " description VARCHAR(300), status VARCHAR(20) NOT NULL)"
+            )
+        )
+        connection.execute(text("INSERT INTO items VALUES (1, 'Old', NULL, 'draft')"))
+
+    ensure_search_index(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO items VALUES (2, 'Old too', NULL, 'draft')")
+        )
+        rows = connection.execute(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'old'")
+        )
+        assert sorted(row[0] for row in rows) == [1, 2]
+
+
+def test_search_ranks_windows_of_candidates_and_pages_past_them(monkeypatch):
+    monkeypatch.setenv("SEARCH_MAX_CANDIDATES", "3")
+    for index in range(7):
+        _create(f"Note {index}", "note" if index in (1, 5) else None)
+
+    first = client.get("/items/search", params={"q": "note", "limit": 4})
+    # The newest window (5-7) is ranked first, then the page fills from 2-4.
+    assert [item["id"] for item in first.json()][:3] == [6, 5, 7]
+    seen = [item["id"] for item in first.json()]
+    cursor = first.headers["X-Next-Cursor"]
+    while cursor:
+        page = client.get(
+            "/items/search", params={"q": "note", "limit": 4, "cursor": cursor}
+        )
+        seen += [item["id"] for item in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+
+    assert sorted(seen) == [1, 2, 3, 4, 5, 6, 7]
@@ -0,0 +1,102 @@
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import maintenance
+from app.db import Base, SessionLocal
+from app.main import app
+from app.stats import check_status_counts
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+def _counts() -> dict:
+    response = client.get("/items/stats")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stats_start_at_zero_for_every_status():
+    assert _counts() == {
+        "counts": {"done": 0, "draft": 0, "in_progress": 0},
+        "total": 0,
+    }
+
+
+def test_stats_follow_single_item_writes():
+    client.post("/items", json={"name": "A"}, headers=AUTH_HEADERS)
+    client.post("/items", json={"name": "B", "status": "done"}, headers=AUTH_HEADERS)
+    client.put("/items/1", json={"status": "in_progress"}, headers=AUTH_HEADERS)
+    client.put("/items/2", json={"name": "B2"}, headers=AUTH_HEADERS)
+    client.delete("/items/2", headers=AUTH_HEADERS)
+
+    assert _counts() == {
+        "counts": {"done": 0, "draft": 0, "in_progress": 1},
+        "total": 1,
+    }
+
+
+def test_stats_follow_batch_writes():
+    items = [{"name": "A"}, {"name": "B"}, {"name": "C", "status": "done"}]
+    client.post("/items:batch", json={"items": items}, headers=AUTH_HEADERS)
+    client.patch(
+        "/items:batch",
+        json={"items": [{"id": 1, "status": "done"}, {"id": 2, "name": "B2"}]},
+        headers=AUTH_HEADERS,
+    )
+    client.request("DELETE", "/items:batch", json={"ids": [3, 9]}, headers=AUTH_HEADERS)
+
+    assert _counts()["counts"] == {"done": 1, "draft": 1, "in_progress": 0}
+
+
+def test_rejected_write_leaves_stats_untouched():
+    client.post("/items", json={"name": "A"}, headers=AUTH_HEADERS)
+    stale = {**AUTH_HEADERS, "If-Match": '"stale"'}
+    client.put("/items/1", json={"status": "done"}, headers=stale)
+
+    assert _counts()["counts"]["draft"] == 1
+    assert _counts()["counts"]["done"] == 0
+
+
+def test_maintenance_check_and_rebuild(capsys):
+    client.post("/items", json={"name": "A"}, headers=AUTH_HEADERS)
+    with SessionLocal() as session:
+        session.execute(text("UPDATE item_status_counts SET count = 5"))
+        session.commit()
+
+    assert maintenance.main(["check"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["mismatches"]["draft"] == {"stored": 5, "actual": 1}
+
+    assert maintenance.main(["rebuild"]) == 0
+    capsys.readouterr()
+    assert maintenance.main(["check"]) == 0
+    assert _counts()["counts"] == {"done": 0, "draft": 1, "in_progress": 0}
+
+
+def test_summary_table_is_filled_for_existing_items(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL,"
+                " description VARCHAR(300), status VARCHAR(20) NOT NULL,"
+                " version INTEGER NOT NULL DEFAULT 1)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO items VALUES (1, 'A', NULL, 'done', 1), (2, 'B', NULL, 'done', 1)"
+            )
+        )
+
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as connection:
+        assert check_status_counts(connection) == {}
+        stored = connection.execute(
+            text("SELECT count FROM item_status_counts WHERE status = 'done'")
+        )
+        assert stored.scalar() == 2
@@ -1,6 +1,15 @@
+import asyncio
+import hashlib
+import io
 from pathlib import Path
 
-from app.upload import secure_save
+from app.upload import (
+    ContentStore,
+    UploadStore,
+    secure_save,
+    secure_save_fileobj,
+    secure_save_stream,
+)
 
 
 def test_rejects_big_file(tmp_path: Path):
@@ -41,3 +50,135 @@ def test_rejects_symlink_parent(tmp_path: Path):
 
     assert not ok
     assert reason == "symlink_parent"
+
+
+def _chunks(data: bytes, size: int):
+    async def iterator():
+        for start in range(0, len(data), size):
+            yield data[start : start + size]
+
+    return iterator()
+
+
+def test_stream_save_writes_jpeg_from_small_chunks(tmp_path: Path):
+    jpeg = b"\xff\xd8" + b"\x01" * 100 + b"\xff\xd9"
+    ok, path_str = asyncio.run(secure_save_stream(tmp_path, "a.jpg", _chunks(jpeg, 3)))
+
+    assert ok
+    saved = Path(path_str)
+    assert saved.suffix == ".jpg"
+    assert saved.read_bytes() == jpeg
+    assert [entry.name for entry in tmp_path.iterdir()] == [saved.name]
+
+
+def test_stream_save_rejects_oversize_without_leftovers(tmp_path: Path):
+    payload = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"0" * 5_000_001)
+    ok, reason = secure_save_fileobj(tmp_path, "x.png", payload)
+
+    assert not ok
+    assert reason == "too_big"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_save_rejects_bad_signature_and_jpeg_trailer(tmp_path: Path):
+    ok, reason = secure_save_fileobj(tmp_path, "x.png", io.BytesIO(b"not_an_image"))
+    assert (ok, reason) == (False, "bad_type")
+
+    truncated_jpeg = io.BytesIO(b"\xff\xd8" + b"\x01" * 100)
+    ok, reason = secure_save_fileobj(tmp_path, "x.jpg", truncated_jpeg, chunk_size=7)
+    assert (ok, reason) == (False, "bad_type")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_save_rejects_symlink_base(tmp_path: Path):
+    target_dir = tmp_path / "real"
+    target_dir.mkdir()
+    link_dir = tmp_path / "link"
+    link_dir.symlink_to(target_dir)
+
+    png = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 10)
+    ok, reason = secure_save_fileobj(link_dir, "photo.png", png)
+
+    assert (ok, reason) == (False, "symlink_parent")
+
+
+def test_content_store_dedups_and_counts_references(tmp_path: Path):
+    store = ContentStore(tmp_path)
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10
+    digest = hashlib.sha256(png).hexdigest()
+
+    first = asyncio.run(store.save_stream(_chunks(png, 4)))
+    second = asyncio.run(store.save_stream(_chunks(png, 5)))
+
+    assert first == second == (True, f"{digest}.png")
+    blob = tmp_path / digest[:2] / digest[2:4] / f"{digest}.png"
+    assert store.path_for(first[1]) == blob
+    assert blob.read_bytes() == png
+    assert not list(tmp_path.glob(".upload-*"))
+
+    assert not store.delete(first[1], owner="someone-else")
+    assert store.delete(first[1])
+    assert blob.exists()
+    assert store.delete(first[1])
+    assert not blob.exists()
+    assert not store.delete(first[1])
+
+
+def test_content_store_rejects_bad_ids_and_symlinked_shards(tmp_path: Path):
+    store = ContentStore(tmp_path)
+    assert not store.delete("../../etc/passwd")
+    assert not store.delete("a" * 64 + ".exe")
+
+    png = b"\x89PNG\r\n\x1a\n" + b"\x01" * 10
+    digest = hashlib.sha256(png).hexdigest()
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (tmp_path / "store").mkdir()
+    (tmp_path / "store" / digest[:2]).symlink_to(outside)
+
+    ok, reason = asyncio.run(
+        ContentStore(tmp_path / "store").save_stream(_chunks(png, 8))
+    )
+
+    assert (ok, reason) == (False, "symlink_parent")
+    assert list(outside.iterdir()) == []
+
+
+def test_upload_store_pins_root_and_writes_relative_to_it(tmp_path: Path):
+    real = tmp_path / "real"
+    real.mkdir()
+    store = UploadStore(real)
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10
+    jpeg = b"\xff\xd8" + b"\x01" * 100 + b"\xff\xd9"
+
+    # Replacing the base with a symlink after pinning must not redirect writes.
+    real.rename(tmp_path / "moved")
+    (tmp_path / "elsewhere").mkdir()
+    real.symlink_to(tmp_path / "elsewhere")
+
+    ok, path_str = store.save("photo.png", png)
+    assert ok
+    ok, stream_path = asyncio.run(store.save_stream(_chunks(jpeg, 7)))
+    assert ok
+    store.close()
+
+    saved = sorted(entry.name for entry in (tmp_path / "moved").iterdir())
+    assert saved == sorted([Path(path_str).name, Path(stream_path).name])
+    modes = {(tmp_path / "moved" / name).stat().st_mode & 0o777 for name in saved}
+    assert modes == {0o600}
+    assert list((tmp_path / "elsewhere").iterdir()) == []
+
+
+def test_upload_store_keeps_secure_save_rejections(tmp_path: Path):
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10
+    link_dir = tmp_path / "link"
+    link_dir.symlink_to(tmp_path)
+    assert UploadStore(link_dir).save("x.png", png) == (False, "symlink_parent")
+    assert UploadStore(tmp_path / "gone").save("x.png", png) == (False, "missing_base")
+
+    store = UploadStore(tmp_path)
+    assert store.save("x.png", b"not_an_image") == (False, "bad_type")
+    ok, reason = asyncio.run(store.save_stream(_chunks(b"\xff\xd8" + b"\x01" * 9, 4)))
+    assert (ok, reason) == (False, "bad_type")
+    assert [entry.name for entry in tmp_path.iterdir()] == ["link"]
+    store.close()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.auth import TokenRegistry, get_token_registry, parse_tokens, set_token_registry
+from app.main import app
+from app.workers import BoundedExecutor
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+PROBLEM_BASE = "https://problems.secdev.local/"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv(main.UPLOAD_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+def test_upload_streams_into_configured_dir(upload_dir: Path):
+    response = client.post("/uploads", content=PNG, headers=AUTH_HEADERS)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["media_type"] == "image/png"
+    assert (upload_dir / body["id"]).read_bytes() == PNG
+    assert str(upload_dir) not in response.text
+
+
+def test_upload_rejections_use_problem_details():
+    bad_type = client.post("/uploads", content=b"plain text", headers=AUTH_HEADERS)
+    assert bad_type.status_code == 415
+    assert bad_type.json()["type"] == f"{PROBLEM_BASE}unsupported_media_type"
+
+    too_big = client.post(
+        "/uploads", content=PNG + b"0" * 5_000_000, headers=AUTH_HEADERS
+    )
+    assert too_big.status_code == 413
+
+    assert client.post("/uploads", content=PNG).status_code == 401
+
+
+def test_upload_returns_503_when_pool_saturated(monkeypatch):
+    saturated = BoundedExecutor(max_workers=1, max_queue=0, name="test-upload")
+    monkeypatch.setattr(main, "upload_executor", saturated)
+
+    with saturated.admit():
+        response = client.post("/uploads", content=PNG, headers=AUTH_HEADERS)
+
+    assert response.status_code == 503
+    assert response.json()["type"] == f"{PROBLEM_BASE}upload_busy"
+    assert response.headers["Retry-After"] == "1"
+    assert saturated.stats()["rejected"] == 1
+    saturated.shutdown()
+
+
+def test_slow_upload_body_holds_no_pool_capacity(monkeypatch):
+    single = BoundedExecutor(max_workers=1, max_queue=0, name="test-upload")
+    monkeypatch.setattr(main, "upload_executor", single)
+
+    async def scenario():
+        resume = asyncio.Event()
+
+        async def slow_body():
+            yield PNG[:8]
+            await resume.wait()
+            yield PNG[8:]
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            slow = asyncio.create_task(
+                ac.post("/uploads", content=slow_body(), headers=AUTH_HEADERS)
+            )
+            await asyncio.sleep(0.05)
+            fast = await ac.post("/uploads", content=PNG, headers=AUTH_HEADERS)
+            resume.set()
+            return fast, await slow
+
+    fast, slow = asyncio.run(scenario())
+
+    assert (fast.status_code, slow.status_code) == (201, 201)
+    assert single.stats()["rejected"] == 0
+    single.shutdown()
+
+
+def test_upload_stats_expose_queue_and_latency():
+    client.post("/uploads", content=PNG, headers=AUTH_HEADERS)
+
+    stats = client.get("/internal/uploads", headers=AUTH_HEADERS).json()
+    assert stats["in_flight"] == 0
+    assert stats["queued"] == 0
+    assert stats["save_seconds"]["count"] >= 1
+    assert stats["save_seconds"]["buckets"]["+Inf"] == stats["save_seconds"]["count"]
+
+
+def test_cas_storage_dedups_uploads_and_deletes_by_reference(monkeypatch, upload_dir):
+    monkeypatch.setenv(main.UPLOAD_STORAGE_ENV, "cas")
+    first = client.post("/uploads", content=PNG, headers=AUTH_HEADERS).json()
+    second = client.post("/uploads", content=PNG, headers=AUTH_HEADERS).json()
+    assert first == second
+
+    assert ("cas", str(upload_dir)) in main._upload_stores
+
+    path = f"/uploads/{first['id']}"
+    assert client.delete(path).status_code == 401
+    assert client.delete(path, headers=AUTH_HEADERS).status_code == 204
+    assert client.delete(path, headers=AUTH_HEADERS).status_code == 204
+    missing = client.delete(path, headers=AUTH_HEADERS)
+    assert missing.status_code == 404
+    assert missing.json()["type"] == f"{PROBLEM_BASE}not_found"
+
+
+def test_cas_delete_only_drops_the_callers_references(monkeypatch, upload_dir):
+    monkeypatch.setenv(main.UPLOAD_STORAGE_ENV, "cas")
+    previous = get_token_registry()
+    entries = [
+        {"name": name, "token": f"{name}-token-0123456789", "scopes": ["uploads:write"]}
+        for name in ("alice", "mallory")
+    ]
+    set_token_registry(TokenRegistry(parse_tokens(json.dumps(entries))))
+    alice = {"X-API-Key": "alice-token-0123456789"}
+    mallory = {"X-API-Key": "mallory-token-0123456789"}
+    try:
+        upload_id = client.post("/uploads", content=PNG, headers=alice).json()["id"]
+        path = f"/uploads/{upload_id}"
+
+        assert client.delete(path, headers=mallory).status_code == 404
+        assert client.post("/uploads", content=PNG, headers=mallory).status_code == 201
+        assert client.delete(path, headers=mallory).status_code == 204
+        assert client.delete(path, headers=mallory).status_code == 404
+        assert list(upload_dir.rglob(upload_id))
+        assert client.delete(path, headers=alice).status_code == 204
+        assert not list(upload_dir.rglob(upload_id))
+    finally:
+        set_token_registry(previous)
+
+
+def test_unknown_upload_storage_fails_startup(monkeypatch):
+    monkeypatch.setenv(main.UPLOAD_STORAGE_ENV, "s3")
+
+    with pytest.raises(ValueError, match="unknown upload storage"):
+        with TestClient(app):
+            pass
@@ -0,0 +1,187 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+
+from app.db import SessionLocal, write_session_runner
+from app.main import app
+from app.metrics import db_queries_per_request
+from app.models import Item as ItemModel
+from app.models import ItemChange
+from app.writequeue import GroupCommitQueue, _build_write_queue, set_write_queue
+
+client = TestClient(app)
+AUTH_HEADERS = {"X-API-Key": "test-token"}
+
+
+@pytest.fixture
+def write_queue():
+    queue = GroupCommitQueue(window_seconds=0.02)
+    set_write_queue(queue)
+    yield queue
+    set_write_queue(None)
+
+
+def _item_names() -> list[str]:
+    with SessionLocal() as session:
+        return list(session.scalars(select(ItemModel.name).order_by(ItemModel.id)))
+
+
+async def _requests(*calls: tuple) -> list[httpx.Response]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(
+            *(
+                client.request(
+                    method, url, json=json, headers={**AUTH_HEADERS, **headers}
+                )
+                for method, url, json, headers in calls
+            )
+        )
+
+
+def test_concurrent_creates_share_a_commit(write_queue):
+    calls = [("POST", "/items", {"name": f"n{n}"}, {}) for n in range(20)]
+    responses = asyncio.run(_requests(*calls))
+
+    assert {response.status_code for response in responses} == {201}
+    assert sorted(r.json()["id"] for r in responses) == list(range(1, 21))
+    assert all(r.headers["ETag"] for r in responses)
+    stats = write_queue.stats()
+    assert (
+        stats["writes"] == 20 and stats["batches"] < 20 and stats["largest_batch"] > 1
+    )
+
+    with SessionLocal() as session:
+        assert session.scalar(select(func.count()).select_from(ItemChange)) == 20
+    assert client.get("/items/stats").json()["counts"]["draft"] == 20
+
+
+def test_queued_writes_count_queries_for_their_own_request(write_queue):
+    histogram = db_queries_per_request.labels("/items")
+
+    def observed(calls: int) -> tuple[float, int, int]:
+        before = histogram.snapshot()
+        calls_made = [("POST", "/items", {"name": f"n{n}"}, {}) for n in range(calls)]
+        responses = asyncio.run(_requests(*calls_made))
+        assert {response.status_code for response in responses} == {201}
+        after = histogram.snapshot()
+        return (
+            after["sum"] - before["sum"],
+            after["count"] - before["count"],
+            after["buckets"]["0"] - before["buckets"]["0"],
+        )
+
+    single, _count, _empty = observed(1)
+    assert single > 0
+    # The writer task outlives the first request; later batches must not be
+    # charged to it, leaving the other requests at zero queries.
+    assert observed(3) == (3 * single, 3, 0)
+
+
+def test_rejected_writes_only_fail_their_caller(write_queue):
+    asyncio.run(_requests(("POST", "/items", {"name": "old"}, {})))
+
+    created, missing, stale, updated = asyncio.run(
+        _requests(
+            ("POST", "/items", {"name": "new"}, {}),
+            ("PUT", "/items/99", {"name": "x"}, {}),
+            ("PUT", "/items/1", {"name": "y"}, {"If-Match": '"stale"'}),
+            ("PUT", "/items/1", {"status": "done"}, {}),
+        )
+    )
+
+    assert (created.status_code, missing.status_code) == (201, 404)
+    assert (stale.status_code, updated.status_code) == (412, 200)
+    assert updated.json() == {
+        "id": 1,
+        "name": "old",
+        "description": None,
+        "status": "done",
+    }
+    assert _item_names() == ["old", "new"]
+
+
+def test_write_failing_midway_is_rolled_back_alone(write_queue):
+    def add(session, name):
+        session.execute(insert(ItemModel).values(name=name))
+        return name
+
+    def add_then_fail(session, name):
+        add(session, name)
+        raise RuntimeError("boom")
+
+    async def scenario():
+        return await asyncio.gather(
+            write_queue.submit(add, "first"),
+            write_queue.submit(add_then_fail, "partial"),
+            write_queue.submit(add, "last"),
+            return_exceptions=True,
+        )
+
+    first, failed, last = asyncio.run(scenario())
+
+    assert (first, last) == ("first", "last")
+    assert isinstance(failed, RuntimeError)
+    assert _item_names() == ["first", "last"]
+
+
+def test_full_queue_makes_writers_wait():
+    release = asyncio.Event()
+
+    @asynccontextmanager
+    async def slow_runner():
+        await release.wait()
+        async with write_session_runner() as runner:
+            yield runner
+
+    queue = GroupCommitQueue(slow_runner, batch_size=1, window_seconds=0, max_depth=1)
+
+    def add(session, name):
+        session.execute(insert(ItemModel).values(name=name))
+        return name
+
+    async def scenario():
+        tasks = [asyncio.create_task(queue.submit(add, f"n{n}")) for n in range(3)]
+        await asyncio.sleep(0.05)
+        # One write is with the writer, one fills the queue, the third waits to enqueue.
+        waiting = (queue.stats()["depth"], sum(task.done() for task in tasks))
+        release.set()
+        results = await asyncio.gather(*tasks)
+        await queue.close()
+        return waiting, results
+
+    waiting, results = asyncio.run(scenario())
+    assert waiting == (1, 0)
+    assert results == ["n0", "n1", "n2"]
+    assert queue.stats()["batches"] == 3
+
+
+def test_close_commits_queued_writes():
+    queue = GroupCommitQueue(window_seconds=0.05)
+
+    def add(session, name):
+        session.execute(insert(ItemModel).values(name=name))
+
+    async def scenario():
+        tasks = [asyncio.create_task(queue.submit(add, name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        await queue.close()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert _item_names() == ["a", "b"]
+
+
+def test_write_queue_built_from_environment(monkeypatch):
+    assert _build_write_queue() is None
+    monkeypatch.setenv("ITEM_WRITE_QUEUE", "1")
+    monkeypatch.setenv("ITEM_WRITE_BATCH_SIZE", "8")
+    monkeypatch.setenv("ITEM_WRITE_BATCH_WINDOW_MS", "5")
+    monkeypatch.setenv("ITEM_WRITE_QUEUE_DEPTH", "32")
+
+    stats = _build_write_queue().stats()
+    assert (stats["batch_size"], stats["window_ms"], stats["max_depth"]) == (8, 5.0, 32)